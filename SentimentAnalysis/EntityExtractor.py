@@ -0,0 +1,354 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from SentimentAnalysis.Sentences import chunk_spans
+
+GLINER_MODEL = "urchade/gliner_medium-v2.1"
+DEFAULT_LABELS = ("person", "organization", "place", "political event")
+# Separator for entity lists in ArticleRecord.metadata, which only holds scalars.
+ENTITY_SEPARATOR = "|"
+
+
+@dataclass
+class EntitySpan:
+    text: str
+    label: str
+    start: int
+    end: int
+    score: float
+
+
+@dataclass
+class ArticleEntities:
+    """
+    Entities found in one article. mentions counts every NER span plus the
+    coreferent mentions (pronouns, short forms) resolved to the entity.
+    """
+
+    spans: List[EntitySpan] = field(default_factory=list)
+    clusters: List[List[Tuple[int, int]]] = field(default_factory=list)
+    labels: Dict[str, str] = field(default_factory=dict)
+    mentions: Dict[str, int] = field(default_factory=dict)
+
+    def ranked(self) -> List[str]:
+        return sorted(self.mentions, key=lambda e: -self.mentions[e])
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ArticleEntities":
+        return cls(
+            spans=[EntitySpan(**s) for s in data["spans"]],
+            clusters=[[tuple(m) for m in c] for c in data["clusters"]],
+            labels=data["labels"],
+            mentions=data["mentions"],
+        )
+
+
+class EntityCache:
+    """Extraction results keyed by content hash; memory LRU, optional SQLite."""
+
+    def __init__(self, max_entries: int = 10_000, path: Optional[str] = None) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ArticleEntities]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS entities (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[ArticleEntities]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+            if self._conn is None:
+                return None
+            row = self._conn.execute("SELECT value FROM entities WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value = ArticleEntities.from_dict(json.loads(row[0]))
+            self._remember(key, value)
+            return value
+
+    def set_many(self, items: Dict[str, ArticleEntities]) -> None:
+        with self._lock:
+            for key, value in items.items():
+                self._remember(key, value)
+            if self._conn is not None and items:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entities (key, value) VALUES (?, ?)",
+                    [(key, json.dumps(value.to_dict())) for key, value in items.items()],
+                )
+                self._conn.commit()
+
+    def _remember(self, key: str, value: ArticleEntities) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+
+
+class EntityExtractor:
+    """
+    GLiNER entities plus fastcoref clusters for whole articles.
+
+    Texts are cut into sentence-aligned chunks that fit each model's context
+    (ner_words for GLiNER, coref_words for FCoref), with one sentence of
+    overlap between neighbouring chunks. Chunks from every article in a call
+    go through each model as one batch. Spans are mapped back to article
+    offsets: NER spans seen in two overlapping chunks are de-duplicated, and
+    coref clusters from neighbouring chunks that share a mention are joined.
+    Each cluster containing an NER span is credited to that entity.
+
+    Models load lazily, once per process. extract_many() spreads articles over
+    a process pool, each worker loading its own copy of the models.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str] = DEFAULT_LABELS,
+        threshold: float = 0.5,
+        ner_words: int = 300,
+        coref_words: int = 1500,
+        batch_size: int = 16,
+        coref: bool = True,
+        cache: Optional[EntityCache] = None,
+        ner_model: str = GLINER_MODEL,
+    ) -> None:
+        self.labels = list(labels)
+        self.threshold = threshold
+        self.ner_words = ner_words
+        self.coref_words = coref_words
+        self.batch_size = batch_size
+        self.coref = coref
+        self.cache = cache if cache is not None else EntityCache()
+        self.ner_model = ner_model
+        self._ner = None
+        self._coref = None
+
+    def _settings(self) -> Tuple:
+        return (self.labels, self.threshold, self.ner_words, self.coref_words, self.batch_size, self.coref, self.ner_model)
+
+    def content_key(self, text: str) -> str:
+        config = json.dumps([self.ner_model, self.labels, self.threshold, self.coref])
+        return hashlib.sha256((config + "\x00" + text).encode("utf-8")).hexdigest()
+
+    def _ensure_models(self) -> None:
+        if self._ner is None:
+            from gliner import GLiNER
+
+            self._ner = GLiNER.from_pretrained(self.ner_model)
+        if self.coref and self._coref is None:
+            from fastcoref import FCoref
+
+            self._coref = FCoref(device="cpu")
+
+    def extract(self, text: str) -> ArticleEntities:
+        return self.extract_many({0: text}, max_workers=1)[0]
+
+    def extract_many(
+        self,
+        texts: Dict[Hashable, str],
+        max_workers: Optional[int] = 1,
+        articles_per_task: int = 32,
+    ) -> Dict[Hashable, ArticleEntities]:
+        """
+        Args:
+            texts: article_id -> article text (e.g. extract_text output).
+            max_workers: Processes to use; 1 runs in this process, None uses every CPU.
+
+        Returns:
+            article_id -> ArticleEntities, from the cache where the text was seen before.
+        """
+        keys = {article_id: self.content_key(text or "") for article_id, text in texts.items()}
+        result: Dict[Hashable, ArticleEntities] = {}
+        todo: Dict[str, str] = {}
+        for article_id, key in keys.items():
+            cached = self.cache.get(key)
+            if cached is not None:
+                result[article_id] = cached
+            elif key not in todo:
+                todo[key] = texts[article_id] or ""
+        if todo:
+            items = list(todo.items())
+            groups = [items[lo : lo + articles_per_task] for lo in range(0, len(items), articles_per_task)]
+            max_workers = max_workers or os.cpu_count() or 1
+            fresh: Dict[str, ArticleEntities] = {}
+            if max_workers == 1 or len(groups) == 1:
+                for group in groups:
+                    fresh.update(zip([k for k, _ in group], self._extract_batch([t for _, t in group])))
+            else:
+                with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=self._settings()) as pool:
+                    for group, found in zip(groups, pool.map(_extract_job, [[t for _, t in g] for g in groups])):
+                        fresh.update(zip([k for k, _ in group], found))
+            self.cache.set_many(fresh)
+            for article_id, key in keys.items():
+                if article_id not in result:
+                    result[article_id] = fresh[key]
+        return result
+
+    def _extract_batch(self, texts: List[str]) -> List[ArticleEntities]:
+        self._ensure_models()
+        ner_chunks = [(i, lo, hi) for i, text in enumerate(texts) for lo, hi in chunk_spans(text, self.ner_words)]
+        spans: List[List[EntitySpan]] = [[] for _ in texts]
+        found = self._predict_entities([texts[i][lo:hi] for i, lo, hi in ner_chunks])
+        for (i, lo, _), entities in zip(ner_chunks, found):
+            for e in entities:
+                spans[i].append(EntitySpan(e["text"], e["label"], lo + e["start"], lo + e["end"], float(e["score"])))
+
+        clusters: List[List[List[Tuple[int, int]]]] = [[] for _ in texts]
+        if self.coref:
+            coref_chunks = [(i, lo, hi) for i, text in enumerate(texts) for lo, hi in chunk_spans(text, self.coref_words)]
+            preds = self._coref.predict(texts=[texts[i][lo:hi] for i, lo, hi in coref_chunks]) if coref_chunks else []
+            for (i, lo, _), pred in zip(coref_chunks, preds):
+                clusters[i].extend(
+                    [(lo + s, lo + e) for s, e in cluster] for cluster in pred.get_clusters(as_strings=False)
+                )
+        return [_merge(s, c) for s, c in zip(spans, clusters)]
+
+    def _predict_entities(self, chunks: List[str]) -> List[List[Dict]]:
+        if not chunks:
+            return []
+        if hasattr(self._ner, "inference"):
+            return self._ner.inference(
+                chunks, self.labels, threshold=self.threshold, flat_ner=True, batch_size=self.batch_size
+            )
+        if hasattr(self._ner, "batch_predict_entities"):
+            out: List[List[Dict]] = []
+            for lo in range(0, len(chunks), self.batch_size):
+                out.extend(self._ner.batch_predict_entities(chunks[lo : lo + self.batch_size], self.labels, threshold=self.threshold))
+            return out
+        return [self._ner.predict_entities(chunk, self.labels, threshold=self.threshold) for chunk in chunks]
+
+    def annotate(
+        self,
+        index,
+        texts: Dict[str, str],
+        max_workers: Optional[int] = 1,
+        max_event_entities: int = 20,
+    ) -> Dict[str, ArticleEntities]:
+        """
+        Extracts entities for the articles in texts and records them on an
+        EventArticleIndex: each ArticleRecord.metadata gets the entity names,
+        labels and mention counts (ENTITY_SEPARATOR-joined, most mentioned
+        first), and each linked event's entities gain the ones mentioned most
+        across its annotated articles.
+        """
+        found = self.extract_many(texts, max_workers=max_workers)
+        touched: Dict[str, None] = {}
+        for article_id, entities in found.items():
+            article = index.articles.get(article_id)
+            if article is None:
+                continue
+            ranked = entities.ranked()
+            index.update_metadata(
+                article_id,
+                {
+                    "entities": ENTITY_SEPARATOR.join(ranked),
+                    "entity_labels": ENTITY_SEPARATOR.join(entities.labels[e] for e in ranked),
+                    "entity_mentions": ENTITY_SEPARATOR.join(str(entities.mentions[e]) for e in ranked),
+                },
+            )
+            for event_id in index.article_events.get(article_id, ()):
+                touched[event_id] = None
+
+        for event_id in touched:
+            totals: Dict[str, int] = {}
+            for article_id in index.event_articles.get(event_id, ()):
+                entities = found.get(article_id)
+                if entities is None:
+                    continue
+                for name, count in entities.mentions.items():
+                    totals[name] = totals.get(name, 0) + count
+            event = index.events[event_id]
+            merged = dict.fromkeys(event.entities)
+            for name in sorted(totals, key=lambda e: -totals[e]):
+                if len(merged) >= max(max_event_entities, len(event.entities)):
+                    break
+                merged[name] = None
+            if list(merged) != event.entities:
+                # add_event re-indexes events_by_entity for the new list.
+                index.add_event(replace(event, entities=list(merged)))
+        return found
+
+
+def _merge(spans: List[EntitySpan], clusters: List[List[Tuple[int, int]]]) -> ArticleEntities:
+    # NER: a span seen in two overlapping chunks is kept once; among spans
+    # that overlap, the higher-scoring one wins (flat NER).
+    kept: List[EntitySpan] = []
+    taken: List[Tuple[int, int]] = []
+    for span in sorted(spans, key=lambda s: (-s.score, s.start)):
+        if any(span.start < hi and lo < span.end for lo, hi in taken):
+            continue
+        kept.append(span)
+        taken.append((span.start, span.end))
+    kept.sort(key=lambda s: s.start)
+
+    # Coref: clusters from neighbouring chunks that share a mention are one cluster.
+    parent = list(range(len(clusters)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: Dict[Tuple[int, int], int] = {}
+    for c, cluster in enumerate(clusters):
+        for mention in cluster:
+            other = owner.setdefault(tuple(mention), c)
+            if other != c:
+                parent[find(c)] = find(other)
+    joined: Dict[int, Dict[Tuple[int, int], None]] = {}
+    for c, cluster in enumerate(clusters):
+        group = joined.setdefault(find(c), {})
+        for mention in cluster:
+            group[tuple(mention)] = None
+    merged_clusters = [sorted(group) for group in joined.values()]
+
+    labels: Dict[str, str] = {}
+    mentions: Dict[str, int] = {}
+    best: Dict[str, float] = {}
+    for span in kept:
+        name = " ".join(span.text.split())
+        mentions[name] = mentions.get(name, 0) + 1
+        if span.score > best.get(name, -1.0):
+            best[name] = span.score
+            labels[name] = span.label
+    for cluster in merged_clusters:
+        inside = [s for s in kept if any(lo <= s.start and s.end <= hi for lo, hi in cluster)]
+        if not inside:
+            continue
+        # The longest named mention names the cluster; other mentions count toward it.
+        name = " ".join(max(inside, key=lambda s: (s.end - s.start, s.score)).text.split())
+        extra = sum(1 for lo, hi in cluster if not any(lo <= s.start and s.end <= hi for s in inside))
+        mentions[name] += extra
+    return ArticleEntities(spans=kept, clusters=[list(c) for c in merged_clusters], labels=labels, mentions=mentions)
+
+
+_worker: Optional[EntityExtractor] = None
+
+
+def _init_worker(labels, threshold, ner_words, coref_words, batch_size, coref, ner_model):
+    global _worker
+    _worker = EntityExtractor(labels, threshold, ner_words, coref_words, batch_size, coref, ner_model=ner_model)
+
+
+def _extract_job(texts: List[str]) -> List[ArticleEntities]:
+    return _worker._extract_batch(texts)
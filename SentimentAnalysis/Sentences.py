@@ -0,0 +1,74 @@
+import re
+from typing import List, Tuple
+
+# Sentence end: . ! or ? (optionally followed by closing quotes/brackets), then
+# whitespace and an upper-case letter, digit or opening quote. Common
+# abbreviations ("U.S.", "Mr.", "Jan.") are not treated as boundaries.
+_BOUNDARY = re.compile(r"(?<=[.!?])[\"'”’)\]]*\s+(?=[\"'“‘(\[]?[A-Z0-9])")
+_ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "gen", "gov", "sen", "rep", "lt", "col",
+    "inc", "ltd", "co", "corp", "vs", "no", "jan", "feb", "mar", "apr", "jun", "jul", "aug",
+    "sep", "sept", "oct", "nov", "dec", "u.s", "u.k", "u.n", "e.g", "i.e", "a.m", "p.m",
+}
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """(start, end) character offsets of each sentence, whitespace trimmed; line breaks always end one."""
+    spans = []
+    for line in re.finditer(r"[^\n]+", text):
+        spans.extend((line.start() + lo, line.start() + hi) for lo, hi in _line_spans(line.group()))
+    return spans
+
+
+def _line_spans(text: str) -> List[Tuple[int, int]]:
+    spans = []
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        head = text[start : match.start()]
+        word = head.rsplit(None, 1)[-1].rstrip(".!?").lower() if head.strip() else ""
+        if word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha()):
+            continue
+        spans.append((start, match.start()))
+        start = match.end()
+    spans.append((start, len(text)))
+    trimmed = []
+    for lo, hi in spans:
+        while lo < hi and text[lo].isspace():
+            lo += 1
+        while hi > lo and text[hi - 1].isspace():
+            hi -= 1
+        if hi > lo:
+            trimmed.append((lo, hi))
+    return trimmed
+
+
+def split_sentences(text: str) -> List[str]:
+    """Splits on line breaks and sentence-ending punctuation."""
+    return [text[lo:hi] for lo, hi in sentence_spans(text)]
+
+
+def chunk_spans(text: str, max_words: int, overlap: int = 1) -> List[Tuple[int, int]]:
+    """
+    (start, end) offsets of sentence-aligned chunks of at most max_words
+    words. Consecutive chunks share their last / first `overlap` sentences so
+    spans near a boundary are seen with context on both sides. A sentence
+    longer than max_words is cut at word boundaries.
+    """
+    pieces: List[Tuple[int, int, int]] = []
+    for lo, hi in sentence_spans(text):
+        words = [m.span() for m in re.finditer(r"\S+", text[lo:hi])]
+        for i in range(0, len(words), max_words):
+            part = words[i : i + max_words]
+            pieces.append((lo + part[0][0], lo + part[-1][1], len(part)))
+    chunks = []
+    start = 0
+    while start < len(pieces):
+        end, words = start, 0
+        while end < len(pieces) and (end == start or words + pieces[end][2] <= max_words):
+            words += pieces[end][2]
+            end += 1
+        chunks.append((pieces[start][0], pieces[end - 1][1]))
+        if end >= len(pieces):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
@@ -0,0 +1,327 @@
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from SentimentAnalysis.Sentences import split_sentences
+from packageUtils.CacheDir import cache_file
+
+DEFAULT_MODEL_PATH = "models/setfit_stance_v1"
+LABELS = ("Against", "Neutral", "For")
+BACKENDS = ("torch", "int8", "onnx")
+# Training template of models/setfit_stance_v1 (stance_detection.ipynb, "Training with new dataset").
+PROMPT_TEMPLATE = "Text: {sentence} \n Question: Is this text expressing support for {target}?"
+
+# Against / Neutral / For probabilities, stored as three little-endian floats.
+_PROBS = struct.Struct("<fff")
+
+Article = Union[str, Sequence[str]]
+
+
+def format_prompt(target: str, sentence: str) -> str:
+    """Model input for one (target, sentence) pair, in the PROMPT_TEMPLATE the stance model was trained on."""
+    return PROMPT_TEMPLATE.format(target=target, sentence=sentence)
+
+
+def pair_key(target: str, sentence: str, model: str = "") -> bytes:
+    """Cache key of a pair; model identifies the model, backend and prompt that produced the probabilities."""
+    return hashlib.blake2b(f"{model}\x1f{target}\x1f{sentence}".encode("utf-8"), digest_size=16).digest()
+
+
+@dataclass
+class ScorerStats:
+    hits: int = 0
+    misses: int = 0
+    batches: int = 0
+    model_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class StanceCache:
+    """
+    Stance probabilities keyed by hash of (model, target, sentence): an
+    in-memory LRU, optionally backed by a SQLite file so results survive
+    restarts. The key includes the model, so scorers with different models
+    or backends can share one file.
+    """
+
+    def __init__(self, max_entries: int = 200_000, path: Optional[str] = None) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS stances (key BLOB PRIMARY KEY, probs BLOB NOT NULL)")
+            self._conn.commit()
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, np.ndarray]:
+        found: Dict[bytes, np.ndarray] = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                probs = self._entries.get(key)
+                if probs is None:
+                    missing.append(key)
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = probs
+            if self._conn is not None and missing:
+                for lo in range(0, len(missing), 500):
+                    chunk = missing[lo : lo + 500]
+                    marks = ",".join("?" * len(chunk))
+                    for key, blob in self._conn.execute(f"SELECT key, probs FROM stances WHERE key IN ({marks})", chunk):
+                        probs = np.array(_PROBS.unpack(blob))
+                        found[key] = probs
+                        self._remember(key, probs)
+        return found
+
+    def set_many(self, items: Dict[bytes, np.ndarray]) -> None:
+        with self._lock:
+            for key, probs in items.items():
+                self._remember(key, probs)
+            if self._conn is not None and items:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO stances (key, probs) VALUES (?, ?)",
+                    [(key, _PROBS.pack(*map(float, probs))) for key, probs in items.items()],
+                )
+                self._conn.commit()
+
+    def _remember(self, key: bytes, probs: np.ndarray) -> None:
+        self._entries[key] = probs
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+
+
+class StanceScorer:
+    """
+    Per-entity stances for articles from the SetFit stance model.
+
+    The model is loaded once (lazily, on first use). Every (target, sentence)
+    pair that mentions a target is collected across all articles of a call,
+    de-duplicated, looked up in the cache, and the misses are run through the
+    model in micro-batches: prompts are sorted by length and each batch is
+    filled up to a token budget, so short sentences go through in large
+    batches and long ones do not pad out the rest. The budget adapts to
+    measured throughput between min_batch and max_batch.
+
+    A sentence's stance on a target is P(For) - P(Against), in [-1, 1]; an
+    article's stance is the mean over the sentences that mention the target.
+
+    Backends (all CPU):
+        "torch": the SetFit model as saved.
+        "int8":  Linear layers of the sentence encoder dynamically quantized to int8.
+        "onnx":  the encoder run through ONNX Runtime via sentence-transformers
+                 (exported on first load; pass onnx_file to use a quantized export).
+    """
+
+    def __init__(
+        self,
+        model_path: str = DEFAULT_MODEL_PATH,
+        backend: str = "torch",
+        cache: Optional[StanceCache] = None,
+        max_tokens: int = 8192,
+        min_batch: int = 8,
+        max_batch: int = 256,
+        onnx_file: Optional[str] = None,
+        model=None,
+    ) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        self.model_path = model_path
+        self.backend = backend
+        self.cache = cache if cache is not None else StanceCache()
+        self.max_tokens = max_tokens
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.onnx_file = onnx_file
+        self.stats = ScorerStats()
+        self._model = model
+        self._columns: Optional[List[int]] = None
+        self._load_lock = threading.Lock()
+        self._best_rate = 0.0
+
+    @property
+    def model_key(self) -> str:
+        """Identifies everything besides the pair that the cached probabilities depend on."""
+        model_path = os.path.realpath(self.model_path) if os.path.isdir(self.model_path) else self.model_path
+        return json.dumps([model_path, self.backend, self.onnx_file, PROMPT_TEMPLATE])
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    self._model = self._load()
+        return self._model
+
+    def _load(self):
+        from setfit import SetFitModel
+
+        model = SetFitModel.from_pretrained(self.model_path, device="cpu")
+        if self.backend == "int8":
+            import torch
+
+            model.model_body = torch.quantization.quantize_dynamic(
+                model.model_body, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        elif self.backend == "onnx":
+            from sentence_transformers import SentenceTransformer
+
+            kwargs = {"file_name": self.onnx_file} if self.onnx_file else {}
+            model.model_body = SentenceTransformer(
+                self.model_path, device="cpu", backend="onnx", model_kwargs=kwargs
+            )
+        return model
+
+    def _label_columns(self) -> List[int]:
+        """Column of Against / Neutral / For in predict_proba output."""
+        if self._columns is None:
+            labels = list(getattr(self.model, "labels", None) or LABELS)
+            self._columns = [labels.index(label) for label in LABELS]
+        return self._columns
+
+    def predict_proba(self, pairs: Sequence[Tuple[str, str]]) -> np.ndarray:
+        """(n, 3) Against / Neutral / For probabilities for (target, sentence) pairs."""
+        model = self.model_key
+        keys = [pair_key(t, s, model) for t, s in pairs]
+        unique: Dict[bytes, Tuple[str, str]] = {}
+        for key, pair in zip(keys, pairs):
+            unique.setdefault(key, pair)
+        known = self.cache.get_many(unique)
+        self.stats.hits += len(known)
+        todo = [(key, pair) for key, pair in unique.items() if key not in known]
+        self.stats.misses += len(todo)
+        if todo:
+            probs = self._run([format_prompt(t, s) for _, (t, s) in todo])
+            fresh = {key: p for (key, _), p in zip(todo, probs)}
+            self.cache.set_many(fresh)
+            known.update(fresh)
+        return np.array([known[key] for key in keys]).reshape(len(keys), len(LABELS))
+
+    def score_pairs(self, pairs: Sequence[Tuple[str, str]]) -> np.ndarray:
+        """Stance in [-1, 1] (P(For) - P(Against)) for each (target, sentence) pair."""
+        probs = self.predict_proba(pairs)
+        return probs[:, 2] - probs[:, 0]
+
+    def score_article(self, article: Article, targets: Iterable[str]) -> Dict[str, float]:
+        return self.score_articles({0: article}, {0: list(targets)})[0]
+
+    def score_articles(
+        self,
+        articles: Dict[Hashable, Article],
+        targets: Union[Iterable[str], Dict[Hashable, Iterable[str]]],
+    ) -> Dict[Hashable, Dict[str, float]]:
+        """
+        Args:
+            articles: article_id -> text (or already split sentences).
+            targets: Entities to score, shared by every article or per article_id.
+
+        Returns:
+            article_id -> {target: stance}. Targets no sentence mentions are left out.
+        """
+        shared = None if isinstance(targets, dict) else list(targets)
+        pairs: List[Tuple[str, str]] = []
+        owners: List[Tuple[Hashable, str]] = []
+        for article_id, article in articles.items():
+            sentences = split_sentences(article) if isinstance(article, str) else list(article)
+            lowered = [s.lower() for s in sentences]
+            for target in shared if shared is not None else targets.get(article_id, ()):
+                needle = target.lower()
+                for sentence, low in zip(sentences, lowered):
+                    if needle in low:
+                        pairs.append((target, sentence))
+                        owners.append((article_id, target))
+
+        result: Dict[Hashable, Dict[str, float]] = {article_id: {} for article_id in articles}
+        if not pairs:
+            return result
+        scores = self.score_pairs(pairs)
+        totals: Dict[Tuple[Hashable, str], List[float]] = {}
+        for owner, score in zip(owners, scores.tolist()):
+            entry = totals.setdefault(owner, [0.0, 0])
+            entry[0] += score
+            entry[1] += 1
+        for (article_id, target), (total, count) in totals.items():
+            result[article_id][target] = total / count
+        return result
+
+    def score_index(self, index, texts: Dict[str, Article], store: bool = True) -> Dict[str, Dict[str, float]]:
+        """
+        Scores each article in texts against the entities of the events it is
+        linked to in an EventArticleIndex; with store, the stances become the
+        article's feature_vector.
+        """
+        targets = {}
+        for article_id in texts:
+            entities: Dict[str, None] = {}
+            for event_id in index.article_events.get(article_id, ()):
+                for entity in index.events[event_id].entities:
+                    entities[entity] = None
+            targets[article_id] = list(entities)
+        stances = self.score_articles(texts, targets)
+        if store:
+            for article_id, vector in stances.items():
+                if article_id in index.articles:
+                    index.update_feature_vector(article_id, vector)
+        return stances
+
+    def _run(self, prompts: List[str]) -> np.ndarray:
+        # Whitespace tokens x 1.3 approximates subword tokens well enough to size batches.
+        lengths = np.array([len(p.split()) * 1.3 + 2 for p in prompts])
+        order = np.argsort(lengths, kind="stable")
+        out = np.empty((len(prompts), len(LABELS)))
+        columns = self._label_columns()
+        lo = 0
+        while lo < len(order):
+            hi = lo + self.min_batch
+            # Sorted ascending, so the last prompt of a batch sets its padded width.
+            while hi < len(order) and hi - lo < self.max_batch and lengths[order[hi]] * (hi - lo + 1) <= self.max_tokens:
+                hi += 1
+            rows = order[lo:hi]
+            started = time.perf_counter()
+            probs = self.model.predict_proba([prompts[i] for i in rows.tolist()], batch_size=len(rows), as_numpy=True)
+            elapsed = time.perf_counter() - started
+            out[rows] = np.asarray(probs, dtype=np.float64)[:, columns]
+            self.stats.batches += 1
+            self.stats.model_seconds += elapsed
+            self._adapt(lengths[rows].sum(), elapsed)
+            lo = hi
+        return out
+
+    def _adapt(self, tokens: float, elapsed: float) -> None:
+        """Grows the token budget while throughput improves, backs off when it drops."""
+        if elapsed <= 0:
+            return
+        rate = tokens / elapsed
+        if rate >= self._best_rate:
+            self._best_rate = rate
+            self.max_tokens = min(int(self.max_tokens * 1.25), 1 << 16)
+        elif rate < 0.8 * self._best_rate:
+            self.max_tokens = max(int(self.max_tokens * 0.8), 512)
+
+
+def default_scorer(model_path: str = DEFAULT_MODEL_PATH, cache_path: Optional[str] = None, **kwargs) -> StanceScorer:
+    """Scorer persisting its cache to cache_path, stance_cache.sqlite in the shared cache directory by default."""
+    return StanceScorer(model_path, cache=StanceCache(path=cache_path or cache_file("stance_cache.sqlite")), **kwargs)
@@ -0,0 +1,20 @@
+# Submodules are imported on first use; see packageUtils.LazyPackage.
+from typing import TYPE_CHECKING
+
+from packageUtils.LazyPackage import lazy_package
+
+if TYPE_CHECKING:
+    from .StanceScorer import StanceScorer, StanceCache
+    from .EntityExtractor import EntityExtractor, EntityCache, ArticleEntities
+
+_LAZY = {
+    "StanceScorer": "StanceScorer",
+    "StanceCache": "StanceScorer",
+    "EntityExtractor": "EntityExtractor",
+    "EntityCache": "EntityExtractor",
+    "ArticleEntities": "EntityExtractor",
+}
+
+__all__ = ["StanceScorer", "StanceCache", "EntityExtractor", "EntityCache", "ArticleEntities"]
+
+lazy_package(__name__, _LAZY)
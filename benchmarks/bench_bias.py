@@ -0,0 +1,62 @@
+"""
+Benchmarks BiasAnalyzer.deviations_for_event against the pure-Python reference.
+
+Run from the repo root:
+    python -m benchmarks.bench_bias --articles 10000 --dims 768
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from biasAnalysis.BiasAnalyzer import BiasAnalyzer, _average_vectors, _euclidean_distance
+from eventMapping.EventArticleIndex import ArticleRecord, EventArticleIndex
+
+
+def reference_deviations(index: EventArticleIndex, event_id: str):
+    articles = [a for a in index.get_articles_for_event(event_id) if a.feature_vector is not None]
+    centroid = _average_vectors([a.feature_vector for a in articles])
+    return {a.article_id: _euclidean_distance(a.feature_vector, centroid) for a in articles}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=10_000)
+    parser.add_argument("--dims", type=int, default=768)
+    parser.add_argument("--dict-keys", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    index = EventArticleIndex()
+    dense = rng.standard_normal((args.articles, args.dims)).tolist()
+    py_rng = random.Random(11)
+    for i in range(args.articles):
+        index.add_article(ArticleRecord(f"d{i}", f"s{i % 50}", event_ids=["dense"], feature_vector=dense[i]))
+        keys = py_rng.sample(range(args.dict_keys), 20)
+        index.add_article(
+            ArticleRecord(
+                f"x{i}",
+                f"s{i % 50}",
+                event_ids=["dict"],
+                feature_vector={f"entity{k}": py_rng.uniform(-1, 1) for k in keys},
+            )
+        )
+
+    bias = BiasAnalyzer()
+    for event_id in ("dense", "dict"):
+        began = time.perf_counter()
+        expected = reference_deviations(index, event_id)
+        legacy = time.perf_counter() - began
+
+        began = time.perf_counter()
+        got = bias.deviations_for_event(index, event_id)
+        vectorized = time.perf_counter() - began
+
+        worst = max(abs(got[k] - v) / max(v, 1e-12) for k, v in expected.items())
+        print(f"{event_id:>5}: reference {legacy:.3f}s  vectorized {vectorized:.3f}s  "
+              f"speedup {legacy / vectorized:.1f}x  max rel diff {worst:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmarks burst window detection on a long series where most points are bursts.
+
+Run from the repo root:
+    python -m benchmarks.bench_bursts --points 5000000 --burst-share 0.9
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import numpy as np
+
+from timeSeries.BurstWindows import BurstWindowDetector, burst_window_bounds
+from timeSeries.TemporalAnalyzer import TemporalAnalyzer, TimePoint
+
+
+def _legacy_windows(points: List[TimePoint], threshold: float, window: timedelta, min_bursts: int) -> int:
+    # The nested scan repetitive_burst_windows used before; returns the window count.
+    bursts = [p for p in sorted(points, key=lambda p: p.timestamp) if p.value > threshold]
+    found = 0
+    for i, start in enumerate(bursts):
+        size = 1
+        for candidate in bursts[i + 1 :]:
+            if candidate.timestamp - start.timestamp <= window:
+                size += 1
+            else:
+                break
+        if size >= min_bursts:
+            found += 1
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=5_000_000)
+    parser.add_argument("--burst-share", type=float, default=0.9)
+    parser.add_argument("--window-minutes", type=float, default=30.0)
+    parser.add_argument("--min-bursts", type=int, default=5)
+    parser.add_argument("--legacy-points", type=int, default=20_000)
+    parser.add_argument("--stream-points", type=int, default=500_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    # One article a minute on average, so a 30 min window holds ~30 points.
+    timestamps = np.cumsum(rng.integers(1, 120, size=args.points)).astype(np.int64) * 1_000_000
+    values = np.where(rng.random(args.points) < args.burst_share, 2.0, 0.0)
+    window = timedelta(minutes=args.window_minutes)
+
+    began = time.perf_counter()
+    _, starts, _ = burst_window_bounds(timestamps, values, 1.0, window, args.min_bursts)
+    bounds = time.perf_counter() - began
+    began = time.perf_counter()
+    _, merged, _ = burst_window_bounds(timestamps, values, 1.0, window, args.min_bursts, merge=True)
+    merging = time.perf_counter() - began
+
+    start = datetime(2026, 1, 1)
+    points = [
+        TimePoint(start + timedelta(microseconds=int(ts)), float(v), "s", "e", f"a{i}")
+        for i, (ts, v) in enumerate(zip(timestamps[: args.legacy_points].tolist(), values[: args.legacy_points].tolist()))
+    ]
+    began = time.perf_counter()
+    legacy_count = _legacy_windows(points, 1.0, window, args.min_bursts)
+    legacy = time.perf_counter() - began
+    began = time.perf_counter()
+    current = TemporalAnalyzer().repetitive_burst_windows(points, 1.0, window, args.min_bursts)
+    current_time = time.perf_counter() - began
+    assert len(current) == legacy_count
+
+    stream_points = [
+        TimePoint(start + timedelta(microseconds=int(ts)), float(v), "s", "e", "")
+        for ts, v in zip(timestamps[: args.stream_points].tolist(), values[: args.stream_points].tolist())
+    ]
+    detector = BurstWindowDetector(1.0, window, args.min_bursts)
+    began = time.perf_counter()
+    emitted = sum(1 for p in stream_points if detector.add(p) is not None)
+    streaming = time.perf_counter() - began
+
+    print(f"bounds ({args.points} points):        {bounds:.2f}s ({starts.size} windows)")
+    print(f"merged ({args.points} points):        {merging:.2f}s ({merged.size} windows)")
+    print(f"legacy nested scan ({len(points)}):     {legacy:.2f}s")
+    print(f"repetitive_burst_windows ({len(points)}): {current_time:.2f}s")
+    print(f"streaming ({len(stream_points)} points):     {streaming:.2f}s "
+          f"({streaming / len(stream_points) * 1e6:.2f} us/point, {emitted} windows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmarks MinHash near-duplicate detection on a synthetic syndicated corpus.
+
+Run from the repo root:
+    python -m benchmarks.bench_dedup --stories 500 --copies 8
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from eventMapping.Deduplicator import MinHashDeduplicator, deduplicate_articles, duplicate_ids
+from eventMapping.EventArticleIndex import ArticleRecord
+
+_VOCAB = [f"w{i}" for i in range(5000)]
+_BOILERPLATE = [
+    "Sign up for our newsletter to get the latest headlines.",
+    "Copyright {source}. All rights reserved.",
+    "Read more on {source}.",
+    "This story was published via a wire service.",
+]
+
+
+def make_corpus(stories: int, copies: int, unique: int, words: int, seed: int = 7):
+    """
+    Wire stories republished under several domains with their own boilerplate
+    and light edits, plus unrelated unique articles.
+    Returns (articles, texts, truth) where truth maps article_id -> story id.
+    """
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    articles, texts, truth = [], {}, {}
+    n = 0
+    for story in range(stories + unique):
+        base = [rng.choice(_VOCAB) for _ in range(words)]
+        n_copies = rng.randint(1, copies) if story < stories else 1
+        for copy in range(n_copies):
+            source = f"site{rng.randrange(400)}.com"
+            body = list(base)
+            for _ in range(max(1, words // 100)):  # headline tweaks, typo fixes
+                body[rng.randrange(words)] = rng.choice(_VOCAB)
+            text = " ".join(body) + " " + rng.choice(_BOILERPLATE).format(source=source)
+            article_id = f"a{n}"
+            n += 1
+            articles.append(
+                ArticleRecord(
+                    article_id=article_id,
+                    source=source,
+                    published_at=start + timedelta(minutes=story * 7 + copy),
+                )
+            )
+            texts[article_id] = text
+            truth[article_id] = story
+    rng.shuffle(articles)
+    return articles, texts, truth
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stories", type=int, default=500)
+    parser.add_argument("--copies", type=int, default=8)
+    parser.add_argument("--unique", type=int, default=500)
+    parser.add_argument("--words", type=int, default=600)
+    args = parser.parse_args()
+
+    articles, texts, truth = make_corpus(args.stories, args.copies, args.unique, args.words)
+    total = len(articles)
+
+    began = time.perf_counter()
+    canonical = deduplicate_articles(articles, texts, MinHashDeduplicator())
+    elapsed = time.perf_counter() - began
+
+    expected = len(set(truth.values()))
+    merged_wrongly = sum(
+        1
+        for record in canonical
+        for dup in duplicate_ids(record)
+        if truth[dup] != truth[record.article_id]
+    )
+    skipped = total - len(canonical)
+    print(f"articles:               {total}")
+    print(f"distinct stories:       {expected}")
+    print(f"canonical kept:         {len(canonical)}")
+    print(f"copies skipped:         {skipped} ({skipped / total:.1%} of downstream work saved)")
+    print(f"wrong merges:           {merged_wrongly}")
+    print(f"dedupe time:            {elapsed:.2f}s ({elapsed / total * 1e3:.2f} ms/article)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmarks EventArticleIndex linking and secondary-index queries.
+
+Run from the repo root:
+    python -m benchmarks.bench_index --links 1000000 --events 100
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from eventMapping.EventArticleIndex import ArticleRecord, EventArticleIndex
+
+
+def _legacy_link(event_articles: Dict[str, List[str]], article_events: Dict[str, List[str]], article_id: str, event_id: str) -> None:
+    # The list-backed membership checks EventArticleIndex used before.
+    event_articles.setdefault(event_id, [])
+    article_events.setdefault(article_id, [])
+    if article_id not in event_articles[event_id]:
+        event_articles[event_id].append(article_id)
+    if event_id not in article_events[article_id]:
+        article_events[article_id].append(event_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--links", type=int, default=1_000_000)
+    parser.add_argument("--events", type=int, default=100)
+    parser.add_argument("--sources", type=int, default=500)
+    parser.add_argument("--legacy-links", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    start = datetime(2026, 1, 1)
+    n_articles = args.links // 2
+    articles = [
+        ArticleRecord(
+            article_id=f"a{i}",
+            source=f"s{rng.randrange(args.sources)}",
+            published_at=start + timedelta(seconds=rng.randrange(90 * 86400)),
+        )
+        for i in range(n_articles)
+    ]
+    pairs = [(f"a{rng.randrange(n_articles)}", f"e{rng.randrange(args.events)}") for _ in range(args.links)]
+
+    index = EventArticleIndex()
+    began = time.perf_counter()
+    index.add_articles(articles)
+    added = time.perf_counter() - began
+
+    began = time.perf_counter()
+    index.link_many(pairs)
+    linked = time.perf_counter() - began
+
+    legacy_pairs = pairs[: args.legacy_links]
+    event_articles: Dict[str, List[str]] = {}
+    article_events: Dict[str, List[str]] = {}
+    began = time.perf_counter()
+    for article_id, event_id in legacy_pairs:
+        _legacy_link(event_articles, article_events, article_id, event_id)
+    legacy = time.perf_counter() - began
+
+    began = time.perf_counter()
+    scratch = EventArticleIndex()
+    scratch.link_many(legacy_pairs)
+    current = time.perf_counter() - began
+
+    # Anchor the 6h window on a real link so the query has hits to find.
+    anchor = index.articles[pairs[0][0]]
+    event_id, source = pairs[0][1], anchor.source
+    until = anchor.published_at + timedelta(hours=1)
+    since = until - timedelta(hours=6)
+    began = time.perf_counter()
+    index.get_articles_between(since, since)  # merges the buffered time index
+    merge = time.perf_counter() - began
+
+    began = time.perf_counter()
+    hits = index.query_articles(event_id=event_id, source=source, since=since, until=until)
+    indexed_query = time.perf_counter() - began
+    began = time.perf_counter()
+    scanned = [
+        a for a in index.get_articles_for_event(event_id)
+        if a.source == source and since <= a.published_at <= until
+    ]
+    scan_query = time.perf_counter() - began
+    assert {a.article_id for a in hits} == {a.article_id for a in scanned}
+
+    print(f"add_articles ({n_articles}):         {added:.2f}s")
+    print(f"link_many ({args.links}):          {linked:.2f}s ({linked / args.links * 1e6:.2f} us/link)")
+    print(f"legacy lists ({len(legacy_pairs)} links):     {legacy:.2f}s")
+    print(f"current ({len(legacy_pairs)} links):          {current:.3f}s")
+    print(f"time index merge (first read):    {merge:.2f}s")
+    print(f"event+source+6h query:            {indexed_query * 1e3:.3f} ms ({len(hits)} hits)")
+    print(f"same query by scanning the event: {scan_query * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Benchmark suite for the index, bias, temporal and user-ranking hot paths.
+
+Each case generates seeded synthetic data at the requested scale (untimed),
+then times its operation over several repeats and measures the peak memory
+of one extra run with tracemalloc. Results are written as JSON so a later
+run can be compared against a saved baseline:
+
+Run from the repo root:
+    python -m benchmarks run --scale 100k --out baseline.json
+    python -m benchmarks run --scale 100k --out current.json --baseline baseline.json
+    python -m benchmarks compare baseline.json current.json --threshold 0.1
+    python -m benchmarks list
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks import synthetic
+
+# A trial is (run, reset): run is timed, reset (if any) restores state before each repeat.
+Trial = Tuple[Callable[[], object], Optional[Callable[[], None]]]
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[int, int], Trial]
+    unit: str
+    # Largest scale that fits comfortably in memory; bigger runs need --force.
+    max_n: Optional[int] = None
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, unit: str, max_n: Optional[int] = None):
+    def register(setup: Callable[[int, int], Trial]) -> Callable[[int, int], Trial]:
+        CASES[name] = Case(name, setup, unit, max_n)
+        return setup
+
+    return register
+
+
+@case("index.link_article_to_event", "links", max_n=10_000_000)
+def _link(n: int, seed: int) -> Trial:
+    from eventMapping.EventArticleIndex import EventArticleIndex
+
+    n_articles, n_events = max(n // 2, 1), max(n // 1_000, 10)
+    articles = synthetic.make_articles(n_articles, n_events, seed, dims=1, linked=False)
+    links = synthetic.make_links(n, n_articles, n_events, seed)
+    state = {}
+
+    def reset() -> None:
+        # link_article_to_event appends to event_ids; start each repeat unlinked.
+        for article in articles:
+            article.event_ids = []
+        state["index"] = EventArticleIndex()
+        state["index"].add_articles(articles)
+
+    def run() -> None:
+        link = state["index"].link_article_to_event
+        for article_id, event_id in links:
+            link(article_id, event_id)
+
+    return run, reset
+
+
+@case("bias.deviations_for_event.dense", "articles", max_n=2_000_000)
+def _deviations_dense(n: int, seed: int) -> Trial:
+    from biasAnalysis.BiasAnalyzer import BiasAnalyzer
+
+    index = synthetic.make_index(n, 1, seed, dims=64)
+    bias = BiasAnalyzer()
+    return (lambda: bias.deviations_for_event(index, "e0")), None
+
+
+@case("bias.deviations_for_event.dict", "articles", max_n=2_000_000)
+def _deviations_dict(n: int, seed: int) -> Trial:
+    from biasAnalysis.BiasAnalyzer import BiasAnalyzer
+
+    index = synthetic.make_index(n, 1, seed, dict_keys=2_000)
+    bias = BiasAnalyzer()
+    return (lambda: bias.deviations_for_event(index, "e0")), None
+
+
+@case("temporal.build_source_series", "articles", max_n=2_000_000)
+def _build_source_series(n: int, seed: int) -> Trial:
+    from biasAnalysis.BiasAnalyzer import BiasAnalyzer
+    from timeSeries.TemporalAnalyzer import TemporalAnalyzer
+
+    index = synthetic.make_index(n, max(n // 1_000, 1), seed, dims=16)
+    bias, analyzer = BiasAnalyzer(), TemporalAnalyzer()
+    return (lambda: analyzer.build_source_series(index, bias)), None
+
+
+@case("temporal.rolling_average", "points", max_n=5_000_000)
+def _rolling_average(n: int, seed: int) -> Trial:
+    from timeSeries.TemporalAnalyzer import TemporalAnalyzer
+
+    points = synthetic.make_time_points(n, seed)
+    analyzer = TemporalAnalyzer()
+    return (lambda: analyzer.rolling_average(points, 50)), None
+
+
+@case("temporal.repetitive_burst_windows", "points", max_n=5_000_000)
+def _burst_windows(n: int, seed: int) -> Trial:
+    from timeSeries.TemporalAnalyzer import TemporalAnalyzer
+
+    points = synthetic.make_time_points(n, seed, burst_share=0.05)
+    analyzer = TemporalAnalyzer()
+    return (lambda: analyzer.repetitive_burst_windows(points, 3.0, timedelta(hours=1), min_bursts=3)), None
+
+
+@case("user.top_k.dict", "articles", max_n=2_000_000)
+def _top_k_dict(n: int, seed: int) -> Trial:
+    articles = synthetic.make_article_stances(n, seed)
+    user = synthetic.make_users(1, seed)[0]
+    return (lambda: user.top_k(articles, 10)), None
+
+
+@case("user.top_k.matrix", "articles", max_n=10_000_000)
+def _top_k_matrix(n: int, seed: int) -> Trial:
+    from userModeling.ArticleStanceMatrix import ArticleStanceMatrix
+
+    matrix = ArticleStanceMatrix.from_articles(synthetic.make_article_stances(n, seed))
+    user = synthetic.make_users(1, seed)[0]
+    return (lambda: user.top_k(matrix, 10)), None
+
+
+def measure(case: Case, n: int, seed: int, repeat: int, memory: bool = True) -> Dict:
+    began = time.perf_counter()
+    run, reset = case.setup(n, seed)
+    setup_seconds = time.perf_counter() - began
+    times: List[float] = []
+    for _ in range(repeat):
+        if reset is not None:
+            reset()
+        gc.collect()
+        began = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - began)
+    result = {
+        "n": n,
+        "unit": case.unit,
+        "repeat": repeat,
+        "setup_s": setup_seconds,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times),
+        "per_item_us": statistics.median(times) / max(n, 1) * 1e6,
+    }
+    if memory:
+        # A separate run: tracemalloc slows allocation-heavy code down too much to time under it.
+        if reset is not None:
+            reset()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run()
+            result["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(
+    scale: int,
+    seed: int = 0,
+    repeat: int = 3,
+    only: Optional[List[str]] = None,
+    memory: bool = True,
+    force: bool = False,
+) -> Dict:
+    results: Dict[str, Dict] = {}
+    skipped: Dict[str, str] = {}
+    for name, bench in CASES.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        if bench.max_n is not None and scale > bench.max_n and not force:
+            skipped[name] = f"scale {scale} above max_n {bench.max_n} (use --force)"
+            print(f"{name:<40} skipped: {skipped[name]}")
+            continue
+        results[name] = measure(bench, scale, seed, repeat, memory)
+        r = results[name]
+        peak = f"  peak {r['peak_mb']:.1f} MB" if "peak_mb" in r else ""
+        print(f"{name:<40} median {r['median_s'] * 1e3:10.2f} ms  {r['per_item_us']:8.3f} us/{bench.unit[:-1]}{peak}")
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "scale": scale,
+            "seed": seed,
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare(
+    baseline: Dict,
+    current: Dict,
+    threshold: float = 0.10,
+    memory_threshold: float = 0.20,
+    min_seconds: float = 0.001,
+) -> List[str]:
+    """
+    Prints a side-by-side table and returns the names of cases that regressed:
+    median time up by more than threshold (and by at least min_seconds, to
+    ignore timer noise on tiny runs) or peak memory up by more than
+    memory_threshold. Cases run at different n are not compared.
+    """
+    regressions = []
+    print(f"{'case':<40} {'baseline':>12} {'current':>12} {'change':>8}  {'memory':>8}")
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None or old["n"] != new["n"]:
+            print(f"{name:<40} {'-':>12} {new['median_s'] * 1e3:10.2f}ms {'new':>8}")
+            continue
+        change = new["median_s"] / old["median_s"] - 1 if old["median_s"] else 0.0
+        slower = change > threshold and new["median_s"] - old["median_s"] >= min_seconds
+        mem_change = None
+        if old.get("peak_mb") and "peak_mb" in new:
+            mem_change = new["peak_mb"] / old["peak_mb"] - 1
+        bigger = mem_change is not None and mem_change > memory_threshold
+        flag = "  REGRESSION" if slower or bigger else ""
+        mem = f"{mem_change:+8.1%}" if mem_change is not None else f"{'-':>8}"
+        print(
+            f"{name:<40} {old['median_s'] * 1e3:10.2f}ms {new['median_s'] * 1e3:10.2f}ms {change:+8.1%}  {mem}{flag}"
+        )
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Synthetic-data benchmark suite.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = commands.add_parser("run", help="run the suite and write JSON results")
+    run_cmd.add_argument("--scale", default="10k", help="items per case: 1k, 100k, 1m, 10m, ...")
+    run_cmd.add_argument("--seed", type=int, default=0)
+    run_cmd.add_argument("--repeat", type=int, default=3)
+    run_cmd.add_argument("--cases", nargs="*", default=None, help="case name prefixes, e.g. bias temporal.rolling")
+    run_cmd.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory run")
+    run_cmd.add_argument("--force", action="store_true", help="run cases above their max_n")
+    run_cmd.add_argument("--out", default=None, help="write results JSON here")
+    run_cmd.add_argument("--baseline", default=None, help="compare against this results JSON afterwards")
+    run_cmd.add_argument("--threshold", type=float, default=0.10)
+
+    compare_cmd = commands.add_parser("compare", help="flag regressions between two result files")
+    compare_cmd.add_argument("baseline")
+    compare_cmd.add_argument("current")
+    compare_cmd.add_argument("--threshold", type=float, default=0.10, help="allowed median slowdown (0.1 = 10%%)")
+    compare_cmd.add_argument("--memory-threshold", type=float, default=0.20)
+
+    commands.add_parser("list", help="list the benchmark cases")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name, bench in CASES.items():
+            cap = f" (max {bench.max_n:,})" if bench.max_n else ""
+            print(f"{name:<40} per {bench.unit[:-1]}{cap}")
+        return 0
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold, args.memory_threshold)
+        print(f"{len(regressions)} regression(s)" + (": " + ", ".join(regressions) if regressions else ""))
+        return 1 if regressions else 0
+
+    report = run_suite(
+        synthetic.parse_scale(args.scale), args.seed, args.repeat, args.cases, not args.no_memory, args.force
+    )
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return 1 if compare(baseline, report, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Seeded synthetic data for the benchmark suite. Every generator takes a seed,
+so the same scale and seed always produce the same events, articles, time
+series and users.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from eventMapping.EventArticleIndex import ArticleRecord, EventArticleIndex, EventRecord
+from timeSeries.TemporalAnalyzer import TimePoint
+from userModeling.UserVector import UserVector
+
+EPOCH = datetime(2026, 1, 1)
+SPAN_SECONDS = 90 * 86400
+
+
+def parse_scale(text: str) -> int:
+    """'1k', '250k', '1m', '10M' or a plain integer."""
+    text = text.strip().lower().replace("_", "")
+    for suffix, factor in (("k", 1_000), ("m", 1_000_000)):
+        if text.endswith(suffix):
+            return int(float(text[: -len(suffix)]) * factor)
+    return int(text)
+
+
+def make_events(n: int, seed: int = 0, entities: int = 1_000) -> List[EventRecord]:
+    rng = random.Random(seed)
+    return [
+        EventRecord(
+            event_id=f"e{i}",
+            title=f"Event {i}",
+            start_time=EPOCH + timedelta(seconds=rng.randrange(SPAN_SECONDS)),
+            entities=[f"entity{rng.randrange(entities)}" for _ in range(3)],
+        )
+        for i in range(n)
+    ]
+
+
+def make_articles(
+    n: int,
+    n_events: int,
+    seed: int = 0,
+    dims: int = 64,
+    dict_keys: int = 0,
+    keys_per_article: int = 20,
+    sources: int = 200,
+    linked: bool = True,
+) -> List[ArticleRecord]:
+    """
+    Articles spread uniformly over n_events events and 90 days. Feature
+    vectors are dense lists of length dims, or, with dict_keys > 0, dicts of
+    keys_per_article entries drawn from dict_keys entity names. linked=False
+    leaves event_ids empty.
+    """
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    events = np_rng.integers(0, max(n_events, 1), n).tolist()
+    seconds = np_rng.integers(0, SPAN_SECONDS, n).tolist()
+    if dict_keys:
+        names = [f"entity{k}" for k in range(dict_keys)]
+        vectors = [
+            {names[k]: rng.uniform(-1, 1) for k in rng.sample(range(dict_keys), keys_per_article)}
+            for _ in range(n)
+        ]
+    else:
+        vectors = np_rng.standard_normal((n, dims)).tolist()
+    return [
+        ArticleRecord(
+            article_id=f"a{i}",
+            source=f"s{rng.randrange(sources)}",
+            published_at=EPOCH + timedelta(seconds=seconds[i]),
+            event_ids=[f"e{events[i]}"] if linked else [],
+            feature_vector=vectors[i],
+        )
+        for i in range(n)
+    ]
+
+
+def make_index(n_articles: int, n_events: int, seed: int = 0, **article_options) -> EventArticleIndex:
+    index = EventArticleIndex()
+    for event in make_events(n_events, seed):
+        index.add_event(event)
+    index.add_articles(make_articles(n_articles, n_events, seed, **article_options))
+    return index
+
+
+def make_links(n: int, n_articles: int, n_events: int, seed: int = 0) -> List[Tuple[str, str]]:
+    np_rng = np.random.default_rng(seed)
+    articles = np_rng.integers(0, n_articles, n).tolist()
+    events = np_rng.integers(0, n_events, n).tolist()
+    return [(f"a{a}", f"e{e}") for a, e in zip(articles, events)]
+
+
+def make_time_points(n: int, seed: int = 0, burst_share: float = 0.05, sources: int = 50) -> List[TimePoint]:
+    """Deviation points over 90 days; burst_share of them lie above 3.0."""
+    np_rng = np.random.default_rng(seed)
+    seconds = np_rng.integers(0, SPAN_SECONDS, n).tolist()
+    values = np.abs(np_rng.normal(1.0, 0.5, n))
+    bursts = np_rng.random(n) < burst_share
+    values[bursts] = np_rng.uniform(3.0, 6.0, int(bursts.sum()))
+    source_ids = np_rng.integers(0, sources, n).tolist()
+    return [
+        TimePoint(
+            timestamp=EPOCH + timedelta(seconds=s),
+            value=v,
+            source=f"s{src}",
+            event_id=f"e{i % 1000}",
+            article_id=f"a{i}",
+        )
+        for i, (s, v, src) in enumerate(zip(seconds, values.tolist(), source_ids))
+    ]
+
+
+def make_article_stances(n: int, seed: int = 0, entities: int = 2_000, per_article: int = 8) -> Dict[str, Dict[str, float]]:
+    np_rng = np.random.default_rng(seed)
+    keys = np_rng.integers(0, entities, (n, per_article)).tolist()
+    values = np_rng.uniform(-1, 1, (n, per_article)).tolist()
+    return {
+        f"a{i}": {f"entity{k}": v for k, v in zip(row_keys, row_values)}
+        for i, (row_keys, row_values) in enumerate(zip(keys, values))
+    }
+
+
+def make_users(n: int, seed: int = 0, entities: int = 2_000, per_user: int = 40) -> List[UserVector]:
+    np_rng = np.random.default_rng(seed)
+    users = []
+    for i in range(n):
+        user = UserVector(f"u{i}")
+        for k, v in zip(np_rng.integers(0, entities, per_user).tolist(), np_rng.uniform(-1, 1, per_user).tolist()):
+            user.set_stance(f"entity{k}", v)
+        users.append(user)
+    return users
@@ -1,6 +1,11 @@
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
+from biasAnalysis.BiasReport import BiasReport, bias_report
+from biasAnalysis.CentroidTracker import CentroidTracker, EventStats
+from biasAnalysis.RumorDetector import RumorAlert, RumorDetector
+from biasAnalysis.VectorEngine import pack_event
 from eventMapping.EventArticleIndex import EventArticleIndex, ArticleRecord
+from instrumentation.Metrics import instrument
 
 FeatureVector = Union[Dict[str, float], List[float]]
 
@@ -8,18 +13,39 @@ FeatureVector = Union[Dict[str, float], List[float]]
 class BiasAnalyzer:
     """
     Computes event centroids, article deviations, and source-level bias metrics.
+    Event-wide computations run on packed NumPy matrices (see VectorEngine).
+
+    After attach(index), centroids come from running per-event sums kept up to
+    date by a CentroidTracker (O(d) per read), and deviations are cached per
+    event until that event changes.
     """
 
+    def __init__(self) -> None:
+        self.tracker: Optional[CentroidTracker] = None
+        self._deviation_cache: Dict[str, Tuple[EventStats, int, Dict[str, float]]] = {}
+
+    def attach(self, index: EventArticleIndex) -> CentroidTracker:
+        if self.tracker is not None:
+            self.tracker.detach()
+        self.tracker = CentroidTracker(index)
+        self._deviation_cache = {}
+        return self.tracker
+
+    def _tracks(self, index: EventArticleIndex) -> bool:
+        return self.tracker is not None and self.tracker.index is index
+
+    @instrument()
     def compute_event_centroid(
         self,
         index: EventArticleIndex,
         event_id: str,
     ) -> Optional[FeatureVector]:
-        articles = index.get_articles_for_event(event_id)
-        vectors = [a.feature_vector for a in articles if a.feature_vector is not None]
-        if not vectors:
+        if self._tracks(index):
+            return self.tracker.get(event_id).centroid()
+        matrix = pack_event(index, event_id)
+        if matrix is None:
             return None
-        return _average_vectors(vectors)
+        return matrix.centroid_vector()
 
     def compute_article_deviation(
         self,
@@ -30,36 +56,64 @@ class BiasAnalyzer:
             return None
         return _euclidean_distance(article.feature_vector, centroid)
 
-    def deviations_for_event(
+    @instrument()
+    def score_article(
         self,
         index: EventArticleIndex,
+        article_id: str,
         event_id: str,
-    ) -> Dict[str, float]:
+    ) -> Optional[float]:
+        """Deviation of one article from its event centroid; O(d) when attached."""
+        article = index.articles.get(article_id)
+        if article is None:
+            return None
         centroid = self.compute_event_centroid(index, event_id)
         if centroid is None:
+            return None
+        return self.compute_article_deviation(article, centroid)
+
+    @instrument()
+    def deviations_for_event(
+        self,
+        index: EventArticleIndex,
+        event_id: str,
+    ) -> Dict[str, float]:
+        if self._tracks(index):
+            return dict(self._tracked_deviations(index, event_id))
+        matrix = pack_event(index, event_id)
+        if matrix is None:
             return {}
+        return dict(zip(matrix.article_ids, matrix.deviations().tolist()))
+
+    def _tracked_deviations(self, index: EventArticleIndex, event_id: str) -> Dict[str, float]:
+        stats = self.tracker.get(event_id)
+        cached = self._deviation_cache.get(event_id)
+        if cached is not None and cached[0] is stats and cached[1] == stats.version:
+            return cached[2]
         deviations: Dict[str, float] = {}
-        for article in index.get_articles_for_event(event_id):
-            deviation = self.compute_article_deviation(article, centroid)
-            if deviation is not None:
-                deviations[article.article_id] = deviation
+        matrix = pack_event(index, event_id)
+        if matrix is not None and stats.count:
+            centroid = matrix.align(stats.centroid())
+            deviations = dict(zip(matrix.article_ids, matrix.deviations(centroid).tolist()))
+        self._deviation_cache[event_id] = (stats, stats.version, deviations)
         return deviations
 
+    @instrument()
     def source_bias_fingerprint(
         self,
         index: EventArticleIndex,
         event_id: str,
     ) -> Dict[str, float]:
-        deviations = self.deviations_for_event(index, event_id)
-        if not deviations:
+        if self._tracks(index):
+            deviations = self._tracked_deviations(index, event_id)
+            sources = [index.articles[a_id].source for a_id in deviations]
+            return _mean_by_source(sources, list(deviations.values()))
+        matrix = pack_event(index, event_id)
+        if matrix is None:
             return {}
-        by_source: Dict[str, List[float]] = {}
-        for article in index.get_articles_for_event(event_id):
-            if article.article_id not in deviations:
-                continue
-            by_source.setdefault(article.source, []).append(deviations[article.article_id])
-        return {source: sum(vals) / len(vals) for source, vals in by_source.items()}
+        return _mean_by_source(matrix.sources, matrix.deviations().tolist())
 
+    @instrument()
     def flag_rumors(
         self,
         index: EventArticleIndex,
@@ -69,6 +123,36 @@ class BiasAnalyzer:
         deviations = self.deviations_for_event(index, event_id)
         return [article_id for article_id, d in deviations.items() if d > threshold]
 
+    def stream_rumors(
+        self,
+        index: EventArticleIndex,
+        callback: Optional[Callable[[RumorAlert], None]] = None,
+        queue=None,
+        z_threshold: float = 3.5,
+    ) -> RumorDetector:
+        """Streaming counterpart of flag_rumors with a per-event adaptive threshold."""
+        if not self._tracks(index):
+            self.attach(index)
+        return RumorDetector(index, self.tracker, z_threshold=z_threshold, callback=callback, queue=queue)
+
+    @instrument()
+    def bias_report(
+        self,
+        index: EventArticleIndex,
+        event_ids: Optional[Iterable[str]] = None,
+        threshold: Optional[float] = None,
+        max_workers: Optional[int] = None,
+    ) -> BiasReport:
+        """Fingerprints, deviations and rumor flags for many events in one parallel pass."""
+        return bias_report(index, event_ids, threshold=threshold, max_workers=max_workers)
+
+
+def _mean_by_source(sources: List[str], deviations: List[float]) -> Dict[str, float]:
+    by_source: Dict[str, List[float]] = {}
+    for source, deviation in zip(sources, deviations):
+        by_source.setdefault(source, []).append(deviation)
+    return {source: sum(vals) / len(vals) for source, vals in by_source.items()}
+
 
 def _average_vectors(vectors: List[FeatureVector]) -> FeatureVector:
     if isinstance(vectors[0], dict):
@@ -0,0 +1,154 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from biasAnalysis.VectorEngine import EventMatrix, pack_event
+from eventMapping.EventArticleIndex import EventArticleIndex
+
+# Below this many linked articles a pool costs more than it saves.
+MIN_PARALLEL_ARTICLES = 200_000
+
+# The index being reported on; forked workers inherit it instead of receiving it.
+_index: Optional[EventArticleIndex] = None
+
+
+@dataclass
+class BiasReport:
+    """
+    Columnar results of a corpus-wide bias pass. sources has one row per
+    (event_id, source); articles has one row per scored article.
+    """
+
+    sources: Dict[str, np.ndarray] = field(default_factory=dict)
+    articles: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.sources.get("event_id", ()))
+
+    def fingerprint(self, event_id: str) -> Dict[str, float]:
+        """Same shape as BiasAnalyzer.source_bias_fingerprint for one event."""
+        mask = self.sources["event_id"] == event_id
+        return dict(zip(self.sources["source"][mask].tolist(), self.sources["mean_deviation"][mask].tolist()))
+
+    def flagged(self, event_id: str) -> List[str]:
+        mask = (self.articles["event_id"] == event_id) & self.articles["flagged"]
+        return self.articles["article_id"][mask].tolist()
+
+    def to_pandas(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.sources).set_index(["event_id", "source"])
+
+
+def bias_report(
+    index: EventArticleIndex,
+    event_ids: Optional[Iterable[str]] = None,
+    threshold: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    events_per_task: int = 64,
+    min_parallel_articles: int = MIN_PARALLEL_ARTICLES,
+) -> BiasReport:
+    """
+    Scores every event (or the given subset) in one call. Packing the feature
+    matrices is most of the work, so each task packs and scores its own
+    events: worker processes are forked and read the index they inherit, and
+    only event ids go out and per-event columns come back. Small corpora, one
+    worker, or platforms without fork run serially in this process.
+    """
+    event_ids = list(index.event_articles if event_ids is None else event_ids)
+    sizes = [len(index.event_articles.get(e_id, ())) for e_id in event_ids]
+    # Big events first so the pool does not end on a straggler.
+    order = sorted(range(len(event_ids)), key=lambda slot: -sizes[slot])
+    tasks = [(slot, event_ids[slot]) for slot in order]
+    chunks = [tasks[i : i + events_per_task] for i in range(0, len(tasks), events_per_task)]
+    max_workers = max_workers or os.cpu_count() or 1
+
+    global _index
+    _index = index
+    try:
+        if (
+            max_workers == 1
+            or len(chunks) <= 1
+            or sum(sizes) < min_parallel_articles
+            or "fork" not in multiprocessing.get_all_start_methods()
+        ):
+            results = [_score_chunk(chunk, threshold) for chunk in chunks]
+        else:
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(max_workers, mp_context=context) as pool:
+                results = list(pool.map(_score_chunk, chunks, [threshold] * len(chunks)))
+    finally:
+        _index = None
+    scored = [r for chunk in results for r in chunk]
+    if not scored:
+        return _empty_report()
+    return _assemble(scored)
+
+
+def _score_chunk(chunk: List[Tuple[int, str]], threshold: Optional[float]):
+    results = []
+    for slot, event_id in chunk:
+        matrix = pack_event(_index, event_id)
+        if matrix is not None:
+            results.append(_score_event(slot, event_id, matrix, threshold))
+    return results
+
+
+def _score_event(slot: int, event_id: str, matrix: EventMatrix, threshold: Optional[float]):
+    deviations = matrix.deviations()
+    flagged = deviations > threshold if threshold is not None else np.zeros(len(matrix), dtype=bool)
+    sources = np.array(matrix.sources, dtype=object)
+    uniq, inverse = np.unique(sources, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(uniq))
+    means = np.bincount(inverse, weights=deviations, minlength=len(uniq)) / counts
+    peaks = np.zeros(len(uniq))
+    np.maximum.at(peaks, inverse, deviations)
+    n_flagged = np.bincount(inverse, weights=flagged, minlength=len(uniq)).astype(np.int64)
+    article_ids = np.array(matrix.article_ids, dtype=object)
+    return (slot, event_id, article_ids, sources, deviations, flagged, uniq, means, peaks, counts, n_flagged)
+
+
+def _assemble(results) -> BiasReport:
+    results.sort(key=lambda r: r[0])
+    src_cols: Dict[str, List[np.ndarray]] = {k: [] for k in ("event_id", "source", "mean_deviation", "max_deviation", "n_articles", "n_flagged")}
+    art_cols: Dict[str, List[np.ndarray]] = {k: [] for k in ("event_id", "article_id", "source", "deviation", "flagged")}
+    for _, event_id, article_ids, sources, deviations, flagged, uniq, means, peaks, counts, n_flagged in results:
+        src_cols["event_id"].append(np.full(len(uniq), event_id, dtype=object))
+        src_cols["source"].append(uniq)
+        src_cols["mean_deviation"].append(means)
+        src_cols["max_deviation"].append(peaks)
+        src_cols["n_articles"].append(counts)
+        src_cols["n_flagged"].append(n_flagged)
+        art_cols["event_id"].append(np.full(len(article_ids), event_id, dtype=object))
+        art_cols["article_id"].append(article_ids)
+        art_cols["source"].append(sources)
+        art_cols["deviation"].append(deviations)
+        art_cols["flagged"].append(flagged)
+    return BiasReport(
+        sources={k: np.concatenate(v) for k, v in src_cols.items()},
+        articles={k: np.concatenate(v) for k, v in art_cols.items()},
+    )
+
+
+def _empty_report() -> BiasReport:
+    return BiasReport(
+        sources={
+            "event_id": np.array([], dtype=object),
+            "source": np.array([], dtype=object),
+            "mean_deviation": np.array([]),
+            "max_deviation": np.array([]),
+            "n_articles": np.array([], dtype=np.int64),
+            "n_flagged": np.array([], dtype=np.int64),
+        },
+        articles={
+            "event_id": np.array([], dtype=object),
+            "article_id": np.array([], dtype=object),
+            "source": np.array([], dtype=object),
+            "deviation": np.array([]),
+            "flagged": np.array([], dtype=bool),
+        },
+    )
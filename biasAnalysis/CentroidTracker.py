@@ -0,0 +1,171 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Union
+
+import numpy as np
+
+from biasAnalysis.VectorEngine import pack_event
+from eventMapping.EventArticleIndex import ArticleRecord, EventArticleIndex
+
+FeatureVector = Union[Dict[str, float], List[float]]
+
+
+@dataclass
+class EventStats:
+    """
+    Running per-event sums over member feature vectors. Dense stats use arrays;
+    dict stats use per-key sums plus a key refcount so the centroid keeps exactly
+    the keys still present in some member vector.
+    """
+
+    count: int = 0
+    is_sparse: bool = False
+    total: Optional[np.ndarray] = None
+    total_sq: Optional[np.ndarray] = None
+    key_total: Dict[str, float] = field(default_factory=dict)
+    key_total_sq: Dict[str, float] = field(default_factory=dict)
+    key_refs: Dict[str, int] = field(default_factory=dict)
+    # Sum of key_total[k] ** 2, kept current so |centroid|^2 is O(1) for dicts.
+    key_norm_sq: float = 0.0
+    version: int = 0
+
+    def centroid(self) -> Optional[FeatureVector]:
+        if self.count == 0:
+            return None
+        if self.is_sparse:
+            return {k: v / float(self.count) for k, v in self.key_total.items()}
+        return (self.total / float(self.count)).tolist()
+
+    def mean_squared_deviation(self) -> float:
+        """Mean of |x - centroid|^2 over members, from the running sums."""
+        if self.count == 0:
+            return 0.0
+        n = float(self.count)
+        if self.is_sparse:
+            sq = sum(self.key_total_sq.values())
+            mean_sq = self.key_norm_sq / (n * n)
+        else:
+            sq = float(self.total_sq.sum())
+            mean_sq = float(np.dot(self.total, self.total)) / (n * n)
+        return max(sq / n - mean_sq, 0.0)
+
+    def add(self, vector: FeatureVector, sign: int = 1) -> None:
+        if self.count == 0:
+            self.is_sparse = isinstance(vector, dict)
+        elif self.is_sparse != isinstance(vector, dict):
+            raise TypeError("Vector types must match (both dict or both list).")
+        if self.is_sparse:
+            for key, value in vector.items():
+                refs = self.key_refs.get(key, 0) + sign
+                old = self.key_total.get(key, 0.0)
+                if refs <= 0:
+                    self.key_refs.pop(key, None)
+                    self.key_total.pop(key, None)
+                    self.key_total_sq.pop(key, None)
+                    self.key_norm_sq -= old * old
+                    continue
+                self.key_refs[key] = refs
+                self.key_total[key] = old + sign * value
+                self.key_norm_sq += self.key_total[key] ** 2 - old * old
+                self.key_total_sq[key] = self.key_total_sq.get(key, 0.0) + sign * value * value
+        else:
+            arr = np.asarray(vector, dtype=np.float64)
+            if self.total is None or self.count == 0:
+                self.total = np.zeros_like(arr)
+                self.total_sq = np.zeros_like(arr)
+            elif arr.shape != self.total.shape:
+                raise ValueError("All vectors must have the same length.")
+            if sign > 0:
+                self.total += arr
+                self.total_sq += arr * arr
+            else:
+                self.total -= arr
+                self.total_sq -= arr * arr
+        self.count += sign
+        self.version += 1
+
+
+class CentroidTracker:
+    """
+    Keeps EventStats current as an EventArticleIndex changes, by listening to
+    its link / unlink / add / vector-change notifications. Stats for an event
+    are built with one full pass the first time it is read and maintained
+    incrementally afterwards; dirty_events records which events changed.
+    """
+
+    def __init__(self, index: EventArticleIndex) -> None:
+        self.index = index
+        self.stats: Dict[str, EventStats] = {}
+        self.dirty_events: Set[str] = set()
+        index.add_listener(self)
+
+    def detach(self) -> None:
+        self.index.remove_listener(self)
+
+    def get(self, event_id: str) -> EventStats:
+        stats = self.stats.get(event_id)
+        if stats is None:
+            stats = self._build(event_id)
+            self.stats[event_id] = stats
+        return stats
+
+    def take_dirty(self) -> Set[str]:
+        """Returns the events changed since the last call and clears the set."""
+        dirty, self.dirty_events = self.dirty_events, set()
+        return dirty
+
+    def _build(self, event_id: str) -> EventStats:
+        stats = EventStats()
+        matrix = pack_event(self.index, event_id)
+        if matrix is None:
+            return stats
+        stats.count = len(matrix)
+        if matrix.is_sparse:
+            stats.is_sparse = True
+            rows = matrix.indices.tolist()
+            for key_idx, value in zip(rows, matrix.data.tolist()):
+                key = matrix.vocab[key_idx]
+                stats.key_refs[key] = stats.key_refs.get(key, 0) + 1
+                stats.key_total[key] = stats.key_total.get(key, 0.0) + value
+                stats.key_total_sq[key] = stats.key_total_sq.get(key, 0.0) + value * value
+            stats.key_norm_sq = sum(v * v for v in stats.key_total.values())
+        else:
+            stats.total = matrix.dense.sum(axis=0)
+            stats.total_sq = (matrix.dense * matrix.dense).sum(axis=0)
+        return stats
+
+    def _apply(self, event_id: str, vector: Optional[FeatureVector], sign: int) -> None:
+        if vector is None:
+            return
+        self.dirty_events.add(event_id)
+        stats = self.stats.get(event_id)
+        if stats is None:
+            return  # built on first read
+        try:
+            stats.add(vector, sign)
+        except (TypeError, ValueError):
+            # Rebuild on next read, which raises like the batch path does.
+            del self.stats[event_id]
+
+    def _apply_all(self, article: ArticleRecord, vector: Optional[FeatureVector], sign: int) -> None:
+        for event_id in self.index.article_events.get(article.article_id, ()):
+            self._apply(event_id, vector, sign)
+
+    def on_article_removed(self, article: ArticleRecord) -> None:
+        self._apply_all(article, article.feature_vector, -1)
+
+    def on_article_added(self, article: ArticleRecord) -> None:
+        self._apply_all(article, article.feature_vector, 1)
+
+    def on_linked(self, article_id: str, event_id: str) -> None:
+        article = self.index.articles.get(article_id)
+        if article is not None:
+            self._apply(event_id, article.feature_vector, 1)
+
+    def on_unlinked(self, article_id: str, event_id: str) -> None:
+        article = self.index.articles.get(article_id)
+        if article is not None:
+            self._apply(event_id, article.feature_vector, -1)
+
+    def on_vector_changed(self, article: ArticleRecord, old_vector: Optional[FeatureVector]) -> None:
+        self._apply_all(article, old_vector, -1)
+        self._apply_all(article, article.feature_vector, 1)
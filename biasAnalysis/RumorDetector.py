@@ -0,0 +1,197 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from biasAnalysis.CentroidTracker import CentroidTracker
+from eventMapping.EventArticleIndex import ArticleRecord, EventArticleIndex
+
+FeatureVector = Union[Dict[str, float], List[float]]
+
+# Scales MAD to the standard deviation of a normal distribution.
+_MAD_SCALE = 0.6745
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate in O(1) memory (Jain & Chlamtac's P² algorithm).
+    Exact until five observations have been seen.
+    """
+
+    def __init__(self, q: float = 0.5) -> None:
+        self.q = q
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self._desired = [1.0, 1.0 + 2 * q, 1.0 + 4 * q, 3.0 + 2 * q, 5.0]
+        self._steps = [0.0, q / 2, q, (1 + q) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        h = self._heights
+        if self.count <= 5:
+            h.append(x)
+            h.sort()
+            return
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+        n = self._positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._steps[i]
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                candidate = self._parabolic(i, s)
+                if not h[i - 1] < candidate < h[i + 1]:
+                    candidate = h[i] + s * (h[i + s] - h[i]) / (n[i + s] - n[i])
+                h[i] = candidate
+                n[i] += s
+
+    def _parabolic(self, i: int, s: int) -> float:
+        h, n = self._heights, self._positions
+        return h[i] + s / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + s) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - s) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            h = self._heights
+            return h[min(int(round(self.q * (len(h) - 1))), len(h) - 1)]
+        return self._heights[2]
+
+
+class RobustScale:
+    """Streaming median and MAD of an event's deviations."""
+
+    def __init__(self) -> None:
+        self.median = P2Quantile(0.5)
+        self.mad = P2Quantile(0.5)
+
+    @property
+    def count(self) -> int:
+        return self.median.count
+
+    def z_score(self, x: float) -> Optional[float]:
+        median = self.median.value()
+        mad = self.mad.value()
+        if median is None or not mad:
+            return None
+        return _MAD_SCALE * (x - median) / mad
+
+    def add(self, x: float) -> None:
+        self.median.add(x)
+        self.mad.add(abs(x - self.median.value()))
+
+
+@dataclass
+class RumorAlert:
+    article_id: str
+    event_id: str
+    deviation: float
+    z_score: float
+    detected_at: float
+
+
+class RumorDetector:
+    """
+    Scores each article as it is linked to an event and emits a RumorAlert when
+    its deviation from the event centroid is an outlier for that event. The
+    centroid comes from a CentroidTracker (O(d) per article); the threshold
+    adapts per event through a robust z-score over a streaming median / MAD.
+    """
+
+    def __init__(
+        self,
+        index: EventArticleIndex,
+        tracker: Optional[CentroidTracker] = None,
+        z_threshold: float = 3.5,
+        min_samples: int = 8,
+        callback: Optional[Callable[[RumorAlert], None]] = None,
+        queue=None,
+    ) -> None:
+        self.index = index
+        # The tracker must see each change before we do, so it is registered first.
+        self.tracker = tracker or CentroidTracker(index)
+        self.z_threshold = z_threshold
+        self.min_samples = min_samples
+        self.callback = callback
+        self.queue = queue
+        self.scales: Dict[str, RobustScale] = {}
+        index.add_listener(self)
+
+    def detach(self) -> None:
+        self.index.remove_listener(self)
+
+    def on_linked(self, article_id: str, event_id: str) -> None:
+        article = self.index.articles.get(article_id)
+        if article is not None:
+            self.observe(article, event_id)
+
+    def on_article_added(self, article: ArticleRecord) -> None:
+        for event_id in self.index.article_events.get(article.article_id, ()):
+            self.observe(article, event_id)
+
+    def observe(self, article: ArticleRecord, event_id: str) -> Optional[RumorAlert]:
+        """Scores one (article, event) pair, then folds it into the event's scale."""
+        deviation = self.deviation(article, event_id)
+        if deviation is None:
+            return None
+        scale = self.scales.setdefault(event_id, RobustScale())
+        alert = None
+        if scale.count >= self.min_samples:
+            z = scale.z_score(deviation)
+            if z is not None and z > self.z_threshold:
+                alert = RumorAlert(article.article_id, event_id, deviation, z, time.time())
+        scale.add(deviation)
+        if alert is not None:
+            self._emit(alert)
+        return alert
+
+    def deviation(self, article: ArticleRecord, event_id: str) -> Optional[float]:
+        vector = article.feature_vector
+        if vector is None:
+            return None
+        stats = self.tracker.get(event_id)
+        if stats.count == 0 or stats.is_sparse != isinstance(vector, dict):
+            return None
+        n = float(stats.count)
+        if not stats.is_sparse:
+            arr = np.asarray(vector, dtype=np.float64)
+            if arr.shape != stats.total.shape:
+                return None
+            diff = arr - stats.total / n
+            return float(np.sqrt(np.dot(diff, diff)))
+        # |x - c|^2 = sum over x's keys of (x_k - c_k)^2 + centroid mass on the
+        # other keys; see VectorEngine.sparse_squared_distances.
+        total = stats.key_norm_sq / (n * n)
+        own = covered = 0.0
+        for key, value in vector.items():
+            c = stats.key_total.get(key, 0.0) / n
+            own += (value - c) ** 2
+            covered += c * c
+        if covered > 0.5 * total:
+            missing = sum((t / n) ** 2 for key, t in stats.key_total.items() if key not in vector)
+        else:
+            missing = max(total - covered, 0.0)
+        return (own + missing) ** 0.5
+
+    def _emit(self, alert: RumorAlert) -> None:
+        if self.callback is not None:
+            self.callback(alert)
+        if self.queue is not None:
+            self.queue.put(alert)
@@ -0,0 +1,148 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from eventMapping.EventArticleIndex import ArticleRecord, EventArticleIndex
+
+FeatureVector = Union[Dict[str, float], List[float]]
+
+# Cells per block when summing a centroid over the keys rows lack.
+_MASK_CELLS = 1 << 22
+
+
+@dataclass
+class EventMatrix:
+    """
+    Feature vectors of one event packed for vectorized math. List vectors form a
+    dense (n, d) matrix; dict vectors form a CSR matrix over a shared vocabulary.
+    """
+
+    article_ids: List[str]
+    sources: List[str]
+    dense: Optional[np.ndarray] = None
+    indptr: Optional[np.ndarray] = None
+    indices: Optional[np.ndarray] = None
+    data: Optional[np.ndarray] = None
+    vocab: List[str] = field(default_factory=list)
+
+    @property
+    def is_sparse(self) -> bool:
+        return self.dense is None
+
+    def __len__(self) -> int:
+        return len(self.article_ids)
+
+    def centroid(self) -> np.ndarray:
+        # Rows are accumulated in order, as the pure-Python reference does.
+        if self.is_sparse:
+            return np.bincount(self.indices, weights=self.data, minlength=len(self.vocab)) / float(len(self))
+        return self.dense.sum(axis=0) / float(len(self))
+
+    def deviations(self, centroid: Optional[np.ndarray] = None) -> np.ndarray:
+        """Euclidean distance of every row to centroid, in article_ids order."""
+        if centroid is None:
+            centroid = self.centroid()
+        if self.is_sparse:
+            squared = sparse_squared_distances(self.indptr, self.indices, self.data, centroid)
+        else:
+            diff = self.dense - centroid
+            squared = np.einsum("ij,ij->i", diff, diff)
+        return np.sqrt(squared)
+
+    def align(self, centroid: FeatureVector) -> np.ndarray:
+        """Converts a dict or list centroid to this matrix's column layout."""
+        if self.is_sparse:
+            return np.array([centroid.get(key, 0.0) for key in self.vocab], dtype=np.float64)
+        return np.asarray(centroid, dtype=np.float64)
+
+    def centroid_vector(self, centroid: Optional[np.ndarray] = None) -> FeatureVector:
+        """Centroid in the BiasAnalyzer representation (dict or list)."""
+        if centroid is None:
+            centroid = self.centroid()
+        if self.is_sparse:
+            return dict(zip(self.vocab, centroid.tolist()))
+        return centroid.tolist()
+
+
+def sparse_squared_distances(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    data: np.ndarray,
+    centroid: np.ndarray,
+) -> np.ndarray:
+    """
+    Squared distance of every CSR row to a dense centroid: the sum of
+    (x_k - c_k)^2 over the row's keys plus the centroid mass c_k^2 on the keys
+    it lacks. That mass is |c|^2 minus the mass on the row's keys, which is
+    accurate while the row holds at most half of |c|^2; for heavier rows the
+    subtraction would cancel, so their missing keys are summed directly.
+    """
+    n = len(indptr) - 1
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    c = centroid[indices]
+    c_sq = centroid * centroid
+    total = float(c_sq.sum())
+    own = np.bincount(rows, weights=(data - c) ** 2, minlength=n)
+    covered = np.bincount(rows, weights=c * c, minlength=n)
+    missing = total - covered
+    heavy = np.flatnonzero(covered > 0.5 * total)
+    step = max(1, _MASK_CELLS // max(len(centroid), 1))
+    for lo in range(0, len(heavy), step):
+        block = heavy[lo : lo + step]
+        lengths = indptr[block + 1] - indptr[block]
+        starts = np.repeat(indptr[block] - np.cumsum(lengths) + lengths, lengths)
+        cols = indices[starts + np.arange(int(lengths.sum()))]
+        mask = np.ones((len(block), len(centroid)), dtype=bool)
+        mask[np.repeat(np.arange(len(block)), lengths), cols] = False
+        missing[block] = np.where(mask, c_sq, 0.0).sum(axis=1)
+    return own + np.maximum(missing, 0.0)
+
+
+def pack_articles(articles: Sequence[ArticleRecord]) -> Optional[EventMatrix]:
+    """Packs the articles that have a feature vector; None if none do."""
+    with_vectors = [a for a in articles if a.feature_vector is not None]
+    if not with_vectors:
+        return None
+    ids = [a.article_id for a in with_vectors]
+    sources = [a.source for a in with_vectors]
+    vectors = [a.feature_vector for a in with_vectors]
+    if isinstance(vectors[0], dict):
+        return _pack_sparse(ids, sources, vectors)
+    return _pack_dense(ids, sources, vectors)
+
+
+def pack_event(index: EventArticleIndex, event_id: str) -> Optional[EventMatrix]:
+    return pack_articles(index.get_articles_for_event(event_id))
+
+
+def _pack_dense(ids: List[str], sources: List[str], vectors: List[List[float]]) -> EventMatrix:
+    length = len(vectors[0])
+    for vec in vectors:
+        if isinstance(vec, dict):
+            raise TypeError("Vector types must match (both dict or both list).")
+        if len(vec) != length:
+            raise ValueError("All vectors must have the same length.")
+    return EventMatrix(ids, sources, dense=np.asarray(vectors, dtype=np.float64).reshape(len(vectors), length))
+
+
+def _pack_sparse(ids: List[str], sources: List[str], vectors: List[Dict[str, float]]) -> EventMatrix:
+    vocab: Dict[str, int] = {}
+    indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+    indices: List[int] = []
+    data: List[float] = []
+    for row, vec in enumerate(vectors):
+        if not isinstance(vec, dict):
+            raise TypeError("Vector types must match (both dict or both list).")
+        for key, value in vec.items():
+            indices.append(vocab.setdefault(key, len(vocab)))
+            data.append(value)
+        indptr[row + 1] = len(indices)
+    return EventMatrix(
+        ids,
+        sources,
+        indptr=indptr,
+        indices=np.asarray(indices, dtype=np.int64),
+        data=np.asarray(data, dtype=np.float64),
+        vocab=list(vocab),
+    )
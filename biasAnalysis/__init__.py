@@ -1,3 +1,20 @@
-from .BiasAnalyzer import BiasAnalyzer
+# Submodules are imported on first use; see packageUtils.LazyPackage.
+from typing import TYPE_CHECKING
 
-__all__ = ["BiasAnalyzer"]
+from packageUtils.LazyPackage import lazy_package
+
+if TYPE_CHECKING:
+    from .BiasAnalyzer import BiasAnalyzer
+    from .BiasReport import BiasReport
+    from .RumorDetector import RumorAlert, RumorDetector
+
+_LAZY = {
+    "BiasAnalyzer": "BiasAnalyzer",
+    "BiasReport": "BiasReport",
+    "RumorAlert": "RumorDetector",
+    "RumorDetector": "RumorDetector",
+}
+
+__all__ = ["BiasAnalyzer", "BiasReport", "RumorAlert", "RumorDetector"]
+
+lazy_package(__name__, _LAZY)
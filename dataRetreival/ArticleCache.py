@@ -0,0 +1,270 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from RepoRoot import add_repo_root
+
+add_repo_root()
+
+from packageUtils.CacheDir import cache_file
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+DEFAULT_TTL = 30 * 86400
+DEFAULT_MAX_BYTES = 512 * 2**20
+_TRACKING_PREFIXES = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a url so trivially different links share a cache entry."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def text_key(url: str) -> str:
+    return "text:" + normalize_url(url)
+
+
+def summary_key(text: str, sentences_count: int) -> str:
+    return f"summary:{sentences_count}:" + content_hash(text)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class Cache:
+    """
+    Key/value store for article texts and summaries.
+    """
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[str]:
+        pass
+
+    def set(self, key: str, value: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class LRUCache(Cache):
+    """
+    Bounded in-memory tier; least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.time() - entry[1] > self.ttl:
+                del self._entries[key]
+                self.stats.evictions += 1
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(Cache):
+    """
+    On-disk tier. Values are zlib-compressed; entries older than ttl are dropped
+    on read, and the least recently accessed entries are evicted once the
+    compressed payload exceeds max_bytes. Access times are buffered in memory
+    and written in one batch every flush_every hits (and before eviction or
+    close), so a hit does not cost a write transaction.
+    """
+
+    def __init__(
+        self,
+        path: str = "article_cache.sqlite",
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        flush_every: int = 256,
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.flush_every = flush_every
+        self._accessed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, size, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and now - row[2] > self.ttl:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self._accessed.pop(key, None)
+                self._total_bytes -= row[1]
+                self.stats.evictions += 1
+                row = None
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= self.flush_every:
+                self._flush_accessed()
+                self._conn.commit()
+            self.stats.hits += 1
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def set(self, key: str, value: str) -> None:
+        blob = zlib.compress(value.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+            self._accessed.pop(key, None)
+            self._total_bytes += len(blob) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _flush_accessed(self) -> None:
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE entries SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        if self.max_bytes is None or self._total_bytes <= self.max_bytes:
+            return
+        self._flush_accessed()
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed ASC")
+        doomed = []
+        for key, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            doomed.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self.stats.evictions += len(doomed)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
+
+
+class TieredCache(Cache):
+    """
+    Memory tier in front of a persistent tier. Disk hits are promoted to memory.
+    """
+
+    def __init__(self, memory: Cache, disk: Cache) -> None:
+        super().__init__()
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self.memory.set(key, value)
+        self.disk.set(key, value)
+
+    def close(self) -> None:
+        self.memory.close()
+        self.disk.close()
+
+
+def default_cache_path() -> str:
+    """article_cache.sqlite in the shared cache directory (see packageUtils.CacheDir)."""
+    return cache_file("article_cache.sqlite")
+
+
+def default_cache(
+    path: Optional[str] = None,
+    ttl: Optional[float] = DEFAULT_TTL,
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+) -> TieredCache:
+    return TieredCache(
+        LRUCache(max_entries=1024, ttl=ttl),
+        SQLiteCache(path or default_cache_path(), ttl=ttl, max_bytes=max_bytes),
+    )
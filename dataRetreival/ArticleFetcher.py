@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from RepoRoot import add_repo_root
+
+add_repo_root()
+
+from instrumentation.Metrics import METRICS
+
+# Status codes worth retrying: throttling and transient server errors.
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _extract(html: str) -> Optional[str]:
+    # Module level so it can be shipped to the extraction process pool.
+    import trafilatura
+    return trafilatura.extract(html, include_comments=False, include_tables=True)
+
+
+class ArticleFetcher:
+    """
+    Downloads articles over a shared pool of keep-alive connections and extracts
+    their text on a separate worker pool, so parsing never blocks downloads.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        per_host: int = 4,
+        timeout: float = 10.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+        extract_workers: Optional[int] = None,
+    ) -> None:
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._download_pool = ThreadPoolExecutor(max_workers, thread_name_prefix="fetch")
+        self._extract_pool = ProcessPoolExecutor(extract_workers)
+        self._host_slots: Dict[str, threading.Semaphore] = {}
+        self._host_lock = threading.Lock()
+
+    def _slot(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.Semaphore(self.per_host)
+            return self._host_slots[host]
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Download a single page, retrying transient failures with backoff."""
+        with self._slot(url):
+            for attempt in range(self.retries + 1):
+                try:
+                    response = self.session.get(url, timeout=self.timeout)
+                except requests.RequestException:
+                    response = None
+                if response is not None:
+                    if response.status_code == 200:
+                        METRICS.add("bytes_fetched_total", len(response.content), source="article")
+                        return response.text
+                    if response.status_code not in _RETRY_STATUSES:
+                        break
+                if attempt < self.retries:
+                    time.sleep(self.backoff * (2 ** attempt))
+        logging.error("Error-fetch: %s", url)
+        METRICS.error("ArticleFetcher.fetch")
+        return None
+
+    def extract(self, html: Optional[str]) -> Optional[str]:
+        """Extract article text on the extraction pool, blocking until it is done."""
+        if html is None:
+            return None
+        return self._extract_pool.submit(_extract, html).result()
+
+    def iter_texts(self, urls: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Yields (url, text) pairs in completion order. text is None when the
+        download or the extraction failed.
+        """
+        downloads = {self._download_pool.submit(self.fetch, url): url for url in dict.fromkeys(urls)}
+        extractions = {}
+        while downloads or extractions:
+            done, _ = wait(list(downloads) + list(extractions), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in downloads:
+                    url = downloads.pop(future)
+                    html = future.result()
+                    if html is None:
+                        yield url, None
+                    else:
+                        extractions[self._extract_pool.submit(_extract, html)] = url
+                else:
+                    url = extractions.pop(future)
+                    try:
+                        yield url, future.result()
+                    except Exception:
+                        logging.error("Error-text-extraction: %s", url)
+                        yield url, None
+
+    def close(self) -> None:
+        self._download_pool.shutdown(wait=True)
+        self._extract_pool.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self) -> "ArticleFetcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -2,25 +2,35 @@
 # - create an agent to crawl and retrieve articles from GDELT without needing a specific query
 
 import requests
-import pandas as pd
-import trafilatura
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer
 import logging
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import Summariser
-logging.basicConfig(
-    level=logging.ERROR,  # Set the logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename='crawler_errors.log',  # Log file name
-    filemode='a'  # Append mode, so logs aren't overwritten
-)
-pd.set_option('display.max_colwidth', None)
+from ArticleFetcher import ArticleFetcher
+from ArticleCache import Cache, default_cache, summary_key, text_key
+from WindowedRetriever import WindowedRetriever, parse_timespan
+from RepoRoot import add_repo_root
+
+add_repo_root()
+
+from instrumentation.Metrics import METRICS, instrument
+# pandas and trafilatura are imported where they are used, so importing this
+# module (e.g. from the daemon) stays fast.
+
+
+def configure_logging(filename='crawler_errors.log'):
+    """Error log for scripts; call once at startup rather than at import."""
+    logging.basicConfig(
+        level=logging.ERROR,  # Set the logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        filename=filename,  # Log file name
+        filemode='a'  # Append mode, so logs aren't overwritten
+    )
 
 class Crawler:
     def __init__(self, summariser: Summariser):
         self.summariser = summariser
-        pass
+        self.pipeline = None  # set by Pipeline(crawler)
 
     def push_to_queue(self, **kwargs):
         """
@@ -30,7 +40,9 @@ class Crawler:
         - list of events        [Events] | Event 
          
         """
-        pass
+        if self.pipeline is None:
+            raise RuntimeError("No pipeline attached; create one with Pipeline(crawler).")
+        self.pipeline.submit(**kwargs)
 
     def retrieve(self,**kwargs):
         pass
@@ -39,10 +51,12 @@ class Crawler:
 
 
 class GdeltsCrawler(Crawler):
-    def __init__(self,summariser):
+    def __init__(self,summariser, fetcher: Optional[ArticleFetcher] = None, cache: Optional[Cache] = None):
         super().__init__(summariser)
-        self.article_hash = {}
+        self.cache = cache if cache is not None else default_cache()
+        self.fetcher = fetcher if fetcher is not None else ArticleFetcher()
 
+    @instrument("GdeltsCrawler.retrieve")
     def retrieve(self, **kwargs):
         """
         kwargs should include:
@@ -51,58 +65,132 @@ class GdeltsCrawler(Crawler):
         - list of events        [Events] | Event 
          
         """
-        self.mode = kwargs.get('mode', 'artlist')
-        self.maxrecords = kwargs.get('maxrecords', 250)
-        self.format = kwargs.get('format', 'json')
-        self.timespan = kwargs.get('timespan', '72h')
-        self.eng = kwargs.get('sourcelang', 'eng')
-        self.sort = kwargs.get('sort', 'datedesc')
-
+        # Options go straight into params, not onto self: the daemon runs retrieves concurrently on one crawler.
         BASE_URL = "https://api.gdeltproject.org/api/v2/doc/doc"
 
         params = {
             "query":          kwargs['query'],
-            "mode":           self.mode,          # list of articles
-            "maxrecords":     self.maxrecords,                # 250 is the absolute max
-            "format":         self.format,
-            'timespan':       self.timespan,           # Last 30 days
-            "sourcelang":     self.eng,              # remove for multilingual
-            "sort":           self.sort          # newest first
+            "mode":           kwargs.get('mode', 'artlist'),          # list of articles
+            "maxrecords":     kwargs.get('maxrecords', 250),                # 250 is the absolute max
+            "format":         kwargs.get('format', 'json'),
+            'timespan':       kwargs.get('timespan', '72h'),           # Last 30 days
+            "sourcelang":     kwargs.get('sourcelang', 'eng'),              # remove for multilingual
+            "sort":           kwargs.get('sort', 'datedesc')          # newest first
         }
 
         response = requests.get(BASE_URL, params=params)
+        METRICS.add("bytes_fetched_total", len(response.content), source="gdelt")
         if response.status_code == 200:
+            import pandas as pd
             data =  pd.DataFrame(response.json()['articles'])
             return data[data['language']=="English"]
         else:
             logging.error("Error-retrieval: ",kwargs['query'] )
+            METRICS.error("GdeltsCrawler.retrieve")
 
             return None
+
+    def retrieve_windows(self, retriever: Optional[WindowedRetriever] = None, **kwargs) -> Iterator[List[Dict]]:
+        """
+        Streaming variant of retrieve that is not truncated at maxrecords.
+        kwargs take the same query options as retrieve, plus either
+        - start and end date    start, end (datetime)
+        - or time span          timespan (default 72h, ending now)
+        Yields batches of article dicts deduplicated by url.
+        """
+        retriever = retriever or WindowedRetriever()
+        end = kwargs.get('end') or datetime.utcnow()
+        start = kwargs.get('start') or end - parse_timespan(kwargs.get('timespan', '72h'))
+        params = {
+            "query":          kwargs['query'],
+            "mode":           kwargs.get('mode', 'artlist'),
+            "format":         "json",
+            "sourcelang":     kwargs.get('sourcelang', 'eng'),
+            "sort":           kwargs.get('sort', 'datedesc'),
+        }
+        return retriever.iter_batches(params, start, end)
         
+    @instrument("GdeltsCrawler.extract_text")
     def extract_text(self, url):
-        if url in self.article_hash:
-            return self.article_hash[url]
+        cached = self.cache.get(text_key(url))
+        METRICS.cache("article_text", cached is not None)
+        if cached is not None:
+            return cached # avoids re-downloading the same article
 
+        import trafilatura
         downloaded = trafilatura.fetch_url(url)
+        if downloaded is not None:
+            METRICS.add("bytes_fetched_total", len(downloaded), source="article")
         try:
-            self.article_hash[url] = trafilatura.extract(downloaded, include_comments=False, include_tables=True)
-            return self.article_hash[url] # avoids re-downloading the same article
+            text = trafilatura.extract(downloaded, include_comments=False, include_tables=True)
+            if text is not None:
+                self.cache.set(text_key(url), text)
+            return text
         except:
             logging.error("Error-text-extraction: ", url)
+            METRICS.error("GdeltsCrawler.extract_text")
             return None
-    
 
-    def summarize_text(self,  text):
-        return self.summariser.summarize(text)
+    def extract_texts(self, urls: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Bulk version of extract_text: yields (url, text) pairs as they finish,
+        downloading concurrently through the shared ArticleFetcher.
+        """
+        pending = []
+        for url in urls:
+            cached = self.cache.get(text_key(url))
+            METRICS.cache("article_text", cached is not None)
+            if cached is not None:
+                yield url, cached
+            else:
+                pending.append(url)
+        for url, text in self.fetcher.iter_texts(pending):
+            if text is not None:
+                self.cache.set(text_key(url), text)
+            yield url, text
+
+
+    def summarize_text(self,  text, sentences_count=3, pool=None):
+        """pool (from SumySummariser.process_pool) runs the summariser in a worker process."""
+        if not text:
+            return self.summariser.summarize(text, sentences_count)
+        key = summary_key(text, sentences_count)
+        cached = self.cache.get(key)
+        METRICS.cache("summary", cached is not None)
+        if cached is not None:
+            return cached
+        if pool is not None:
+            # The worker skips SumySummariser.summarize, so time and count failures here.
+            with METRICS.timer("SumySummariser.summarize"):
+                result = self.summariser.summarize_many([text], sentences_count, pool=pool)[0]
+            summary = result.summary
+            if summary is None:
+                logging.error("Error-summarization: %s", result.error)
+                METRICS.error("SumySummariser.summarize")
+        else:
+            summary = self.summariser.summarize(text, sentences_count)
+        if summary is not None:
+            self.cache.set(key, summary)
+        return summary
 
     def push_to_queue(self, **kwargs):
-        pass
+        """
+        kwargs should include:
+        - query                 query
+        - time span or          timespan
+        - start and end date    start, end
+        - list of events        events | event
+        """
+        super().push_to_queue(**kwargs)
 
     
         
 
 if __name__ == "__main__":
+    import pandas as pd
     from Summariser import SumySummariser
+    configure_logging()
+    pd.set_option('display.max_colwidth', None)
     summariser = SumySummariser()
     crawler = GdeltsCrawler(summariser)
     print("Crawler initialized")
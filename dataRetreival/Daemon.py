@@ -0,0 +1,346 @@
+"""
+Long-lived local daemon that keeps the crawler, summariser, stance / entity
+models and an EventArticleIndex loaded between requests.
+
+Requests are newline-delimited JSON objects {"op": name, "args": {...}} sent
+over a Unix socket (default) or localhost TCP; each gets one JSON line back,
+{"ok": true, "result": ...} or {"ok": false, "error": "..."}. A connection can
+carry any number of requests. Components are created on first use (or at
+startup with --warm) and stay resident, so a request only pays for its own work.
+
+    python dataRetreival/Daemon.py --socket /tmp/echolas.sock --index index_store --warm crawler,index
+    python dataRetreival/DaemonClient.py --socket /tmp/echolas.sock ping
+"""
+import argparse
+import json
+import logging
+import os
+import socketserver
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+
+from RepoRoot import add_repo_root
+
+add_repo_root()
+
+DEFAULT_SOCKET = "/tmp/echolas.sock"
+
+
+class PipelineDaemon:
+    """
+    Holds the warm components and dispatches ops to them. Ops that read or
+    write the EventArticleIndex run under one lock, since the index is not
+    thread safe; model ops run concurrently.
+    """
+
+    def __init__(
+        self,
+        index_path: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        stance_model: str = "models/setfit_stance_v1",
+        stance_backend: str = "torch",
+    ) -> None:
+        self.index_path = index_path
+        self.cache_path = cache_path
+        self.stance_model = stance_model
+        self.stance_backend = stance_backend
+        self.started_at = time.time()
+        self.index_lock = threading.RLock()
+        self._components: Dict[str, object] = {}
+        self._component_lock = threading.RLock()
+        self._factories: Dict[str, Callable[[], object]] = {
+            "crawler": self._make_crawler,
+            "store": self._make_store,
+            "index": self._make_index,
+            "bias": self._make_bias,
+            "stance": self._make_stance,
+            "entities": self._make_entities,
+        }
+        self.ops: Dict[str, Callable[..., object]] = {
+            name[3:]: getattr(self, name) for name in dir(self) if name.startswith("op_")
+        }
+        self._timings: Dict[str, list] = {}
+        self._stats_lock = threading.Lock()
+        self.server: Optional[socketserver.BaseServer] = None
+
+    # Components
+
+    def component(self, name: str):
+        value = self._components.get(name)
+        if value is None:
+            with self._component_lock:
+                value = self._components.get(name)
+                if value is None:
+                    value = self._components[name] = self._factories[name]()
+        return value
+
+    def warm(self, names: Iterable[str]) -> None:
+        for name in names:
+            self.component(name)
+
+    def _make_crawler(self):
+        from ArticleCache import default_cache
+        from Crawler import GdeltsCrawler
+        from Summariser import SumySummariser
+
+        return GdeltsCrawler(SumySummariser(), cache=default_cache(self.cache_path))
+
+    def _make_store(self):
+        from eventMapping.IndexStore import IndexStore
+
+        return IndexStore(self.index_path) if self.index_path else None
+
+    def _make_index(self):
+        from eventMapping.EventArticleIndex import EventArticleIndex
+
+        store = self.component("store")
+        return store.load() if store is not None else EventArticleIndex()
+
+    def _make_bias(self):
+        from biasAnalysis.BiasAnalyzer import BiasAnalyzer
+
+        analyzer = BiasAnalyzer()
+        with self.index_lock:
+            analyzer.attach(self.component("index"))
+        return analyzer
+
+    def _make_stance(self):
+        from SentimentAnalysis.StanceScorer import default_scorer
+
+        return default_scorer(self.stance_model, backend=self.stance_backend)
+
+    def _make_entities(self):
+        from SentimentAnalysis.EntityExtractor import EntityCache, EntityExtractor
+        from packageUtils.CacheDir import cache_file
+
+        return EntityExtractor(cache=EntityCache(path=cache_file("entity_cache.sqlite")))
+
+    # Dispatch
+
+    def handle(self, request: Dict) -> Dict:
+        op = request.get("op")
+        fn = self.ops.get(op)
+        if fn is None:
+            return {"ok": False, "error": f"Unknown op: {op!r}"}
+        began = time.perf_counter()
+        try:
+            result = fn(**(request.get("args") or {}))
+            response = {"ok": True, "result": result}
+        except Exception as exc:
+            logging.exception("Error-daemon-%s", op)
+            response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        elapsed = time.perf_counter() - began
+        with self._stats_lock:
+            stats = self._timings.setdefault(op, [0, 0, 0.0])
+            stats[0] += 1
+            stats[1] += not response["ok"]
+            stats[2] += elapsed
+        return response
+
+    # Ops
+
+    def op_ping(self) -> Dict:
+        return {"pid": os.getpid(), "uptime": time.time() - self.started_at, "warm": sorted(self._components)}
+
+    def op_stats(self) -> Dict:
+        with self._stats_lock:
+            ops = {
+                op: {"calls": calls, "errors": errors, "mean_ms": 1000 * seconds / calls}
+                for op, (calls, errors, seconds) in self._timings.items()
+            }
+        summary = {"ops": ops, "warm": sorted(self._components)}
+        if "index" in self._components:
+            index = self._components["index"]
+            with self.index_lock:
+                summary["index"] = {"events": len(index.events), "articles": len(index.articles)}
+        return summary
+
+    def op_metrics(self, format: str = "json"):
+        """Stage metrics from instrumentation.Metrics; empty unless the daemon runs with --metrics."""
+        from instrumentation.Metrics import METRICS
+
+        return METRICS.to_prometheus() if format == "prometheus" else METRICS.snapshot()
+
+    def op_profile(self, seconds: float = 5.0, interval: float = 0.005, top: int = 25, folded: bool = False) -> Dict:
+        """
+        Samples all daemon threads for seconds; hot functions by self samples,
+        plus the collapsed stacks with folded. The stacks are returned rather
+        than written, so clients cannot make the daemon write to a path.
+        """
+        from instrumentation.Profiler import profile_for
+
+        profiler = profile_for(seconds, interval)
+        result = {"samples": profiler.samples, "top": profiler.top(top)}
+        if folded:
+            result["folded"] = profiler.folded()
+        return result
+
+    def op_warm(self, components: Iterable[str]) -> list:
+        self.warm(components)
+        return sorted(self._components)
+
+    def op_retrieve(self, **query) -> list:
+        data = self.component("crawler").retrieve(**query)
+        return [] if data is None else json.loads(data.to_json(orient="records", date_format="iso"))
+
+    def op_extract_text(self, url: str) -> Optional[str]:
+        return self.component("crawler").extract_text(url)
+
+    def op_summarize(self, text: str, sentences_count: int = 3) -> Optional[str]:
+        return self.component("crawler").summarize_text(text, sentences_count)
+
+    def op_stances(self, articles: Dict[str, str], targets) -> Dict:
+        return self.component("stance").score_articles(articles, targets)
+
+    def op_entities(self, texts: Dict[str, str], annotate: bool = False) -> Dict:
+        extractor = self.component("entities")
+        if annotate:
+            with self.index_lock:
+                found = extractor.annotate(self.component("index"), texts)
+        else:
+            found = extractor.extract_many(texts)
+        return {
+            article_id: {"entities": e.ranked(), "labels": e.labels, "mentions": e.mentions}
+            for article_id, e in found.items()
+        }
+
+    def op_add_event(self, event: Dict) -> str:
+        from eventMapping.EventArticleIndex import EventRecord
+
+        record = EventRecord(**event)
+        for name in ("start_time", "end_time"):
+            value = getattr(record, name)
+            if isinstance(value, str):
+                setattr(record, name, datetime.fromisoformat(value))
+        with self.index_lock:
+            self.component("index").add_event(record)
+        return record.event_id
+
+    def op_add_article(self, article: Dict) -> str:
+        from eventMapping.EventArticleIndex import ArticleRecord
+
+        record = ArticleRecord(**article)
+        if isinstance(record.published_at, str):
+            record.published_at = datetime.fromisoformat(record.published_at)
+        with self.index_lock:
+            self.component("index").add_article(record)
+        return record.article_id
+
+    def op_link(self, article_id: str, event_id: str) -> None:
+        with self.index_lock:
+            self.component("index").link_article_to_event(article_id, event_id)
+
+    def op_articles_for_event(self, event_id: str) -> list:
+        with self.index_lock:
+            return [a.to_dict() for a in self.component("index").get_articles_for_event(event_id)]
+
+    def op_deviations(self, event_id: str) -> Dict[str, float]:
+        bias = self.component("bias")
+        with self.index_lock:
+            return bias.deviations_for_event(self.component("index"), event_id)
+
+    def op_fingerprint(self, event_id: str) -> Dict[str, float]:
+        bias = self.component("bias")
+        with self.index_lock:
+            return bias.source_bias_fingerprint(self.component("index"), event_id)
+
+    def op_compact(self) -> bool:
+        store = self.component("store")
+        if store is None:
+            return False
+        with self.index_lock:
+            self.component("index")
+            store.compact()
+        return True
+
+    def op_shutdown(self) -> bool:
+        if self.server is not None:
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        return True
+
+    def close(self) -> None:
+        store = self._components.get("store")
+        if store is not None:
+            with self.index_lock:
+                store.close()
+        crawler = self._components.get("crawler")
+        if crawler is not None:
+            crawler.cache.close()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        daemon: PipelineDaemon = self.server.daemon_state
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as exc:
+                response = {"ok": False, "error": f"Bad request: {exc}"}
+            else:
+                response = daemon.handle(request)
+            self.wfile.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve(daemon: PipelineDaemon, socket_path: Optional[str] = DEFAULT_SOCKET, port: Optional[int] = None) -> None:
+    """Serves until a shutdown op or KeyboardInterrupt. port selects localhost TCP instead of the socket."""
+    if port is not None:
+        server = _TCPServer(("127.0.0.1", port), _Handler)
+    else:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = _UnixServer(socket_path, _Handler)
+        os.chmod(socket_path, 0o600)
+    server.daemon_state = daemon
+    daemon.server = server
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.close()
+        if port is None and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument("--port", type=int, default=None, help="serve on 127.0.0.1:PORT instead of a socket")
+    parser.add_argument("--index", default=None, help="IndexStore directory to load and log to")
+    parser.add_argument("--cache", default=None, help="article cache file (default: ~/.cache/echolas/article_cache.sqlite)")
+    parser.add_argument("--stance-model", default="models/setfit_stance_v1")
+    parser.add_argument("--stance-backend", default="torch", choices=("torch", "int8", "onnx"))
+    parser.add_argument("--warm", default="", help="comma-separated components to load at startup")
+    parser.add_argument("--metrics", default=None, help="record stage metrics and export them to this .prom / .json file")
+    parser.add_argument("--metrics-interval", type=float, default=15.0)
+    args = parser.parse_args()
+
+    from Crawler import configure_logging
+
+    configure_logging("daemon_errors.log")
+    if args.metrics:
+        from instrumentation.Metrics import METRICS
+
+        METRICS.export_every(args.metrics, args.metrics_interval)
+    daemon = PipelineDaemon(args.index, args.cache, args.stance_model, args.stance_backend)
+    daemon.warm(name for name in args.warm.split(",") if name)
+    serve(daemon, args.socket, args.port)
+
+
+if __name__ == "__main__":
+    main()
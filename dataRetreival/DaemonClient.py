@@ -0,0 +1,87 @@
+"""
+Thin client for Daemon.py. Imports only the standard library so a call costs
+a connection and a JSON round trip, not a model load.
+
+    python dataRetreival/DaemonClient.py ping
+    python dataRetreival/DaemonClient.py extract_text url=https://example.com/story
+    python dataRetreival/DaemonClient.py deviations event_id=climate-summit
+    python dataRetreival/DaemonClient.py stances --json '{"articles": {"a": "..."}, "targets": ["Trump"]}'
+"""
+import argparse
+import json
+import socket
+import sys
+from typing import Optional
+
+DEFAULT_SOCKET = "/tmp/echolas.sock"
+
+
+class DaemonError(RuntimeError):
+    pass
+
+
+class DaemonClient:
+    """One persistent connection; call() may be used any number of times."""
+
+    def __init__(self, socket_path: Optional[str] = DEFAULT_SOCKET, port: Optional[int] = None, timeout: Optional[float] = None) -> None:
+        if port is not None:
+            self._sock = socket.create_connection(("127.0.0.1", port), timeout=timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(socket_path)
+        self._reader = self._sock.makefile("rb")
+
+    def call(self, op: str, **args):
+        self._sock.sendall(json.dumps({"op": op, "args": args}).encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise DaemonError("Daemon closed the connection")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise DaemonError(response["error"])
+        return response["result"]
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _parse_value(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Send one request to the pipeline daemon.")
+    parser.add_argument("op")
+    parser.add_argument("params", nargs="*", help="key=value arguments; values are parsed as JSON when possible")
+    parser.add_argument("--json", default=None, help="arguments as one JSON object")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args()
+
+    params = json.loads(args.json) if args.json else {}
+    for item in args.params:
+        key, _, value = item.partition("=")
+        params[key] = _parse_value(value)
+    try:
+        with DaemonClient(args.socket, args.port) as client:
+            result = client.call(args.op, **params)
+    except (OSError, DaemonError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        sys.exit(1)
+    print(result if isinstance(result, str) else json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from ArticleCache import text_key
+from RepoRoot import add_repo_root
+
+add_repo_root()
+
+from eventMapping.Deduplicator import MinHashDeduplicator, attach_duplicate
+from eventMapping.EventArticleIndex import ArticleRecord, EventArticleIndex
+
+_STOP = object()
+
+
+@dataclass
+class PipelineItem:
+    job: Dict
+    record: Dict
+    html: Optional[str] = None
+    text: Optional[str] = None
+    summary: Optional[str] = None
+    duplicate_of: Optional[str] = None
+
+
+@dataclass
+class StageStats:
+    processed: int = 0
+    emitted: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    max_latency: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def mean_latency(self) -> float:
+        return self.busy_seconds / self.processed if self.processed else 0.0
+
+    @property
+    def throughput(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "processed": self.processed,
+            "emitted": self.emitted,
+            "errors": self.errors,
+            "mean_latency": self.mean_latency,
+            "max_latency": self.max_latency,
+            "throughput": self.throughput,
+        }
+
+
+class Stage:
+    """
+    A pool of worker threads reading from a bounded inbox. fn maps one item to
+    zero or more output items, which are put on the next stage's inbox.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[object], Iterable],
+        workers: int,
+        queue_size: int,
+    ) -> None:
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.inbox: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.next: Optional["Stage"] = None
+        self.stats = StageStats()
+        self._lock = threading.Lock()
+        self._alive = 0
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        self.stats = StageStats()
+        self._alive = self.workers
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _run(self) -> None:
+        while True:
+            item = self.inbox.get()
+            if item is _STOP:
+                break
+            began = time.monotonic()
+            try:
+                outputs = list(self.fn(item))
+            except Exception:
+                logging.exception("Error-pipeline-%s", self.name)
+                outputs = []
+                error = True
+            else:
+                error = False
+            elapsed = time.monotonic() - began
+            with self._lock:
+                self.stats.processed += 1
+                self.stats.emitted += len(outputs)
+                self.stats.errors += error
+                self.stats.busy_seconds += elapsed
+                self.stats.max_latency = max(self.stats.max_latency, elapsed)
+            if self.next is not None:
+                for output in outputs:
+                    self.next.inbox.put(output)
+        with self._lock:
+            self._alive -= 1
+            last = self._alive == 0
+        # The last worker out forwards the shutdown so downstream drains first.
+        if last and self.next is not None:
+            for _ in range(self.next.workers):
+                self.next.inbox.put(_STOP)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        for thread in self._threads:
+            thread.join(timeout)
+        # After a timeout some workers may still be running; a later join waits for them.
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+
+    @property
+    def finished(self) -> bool:
+        return not self._threads
+
+
+class Pipeline:
+    """
+    Streams query jobs through retrieve -> fetch -> extract -> dedupe -> summarize
+    -> index, each stage with its own worker pool and a bounded queue in front of
+    it so a slow stage applies backpressure instead of buffering without limit.
+    Syndicated copies found by the dedupe stage skip summarisation and are
+    attached to their canonical article's metadata instead of being indexed.
+    sumy is CPU bound, so when the summariser offers a process_pool the
+    summarize workers only hand texts to that pool and wait on the result.
+    """
+
+    def __init__(
+        self,
+        crawler,
+        index: Optional[EventArticleIndex] = None,
+        deduplicator: Optional[MinHashDeduplicator] = None,
+        retrieve_workers: int = 2,
+        fetch_workers: int = 16,
+        extract_workers: Optional[int] = None,
+        summarize_workers: Optional[int] = None,
+        queue_size: int = 256,
+    ) -> None:
+        cpus = os.cpu_count() or 1
+        self.crawler = crawler
+        self.index = index if index is not None else EventArticleIndex()
+        self.deduplicator = deduplicator if deduplicator is not None else MinHashDeduplicator()
+        self._pending_duplicates: Dict[str, List[ArticleRecord]] = {}
+        self.stages = [
+            Stage("retrieve", self._retrieve, retrieve_workers, queue_size),
+            Stage("fetch", self._fetch, fetch_workers, queue_size),
+            Stage("extract", self._extract, extract_workers or cpus, queue_size),
+            # The LSH buckets are shared state, so a single worker.
+            Stage("dedupe", self._dedupe, 1, queue_size),
+            Stage("summarize", self._summarize, summarize_workers or cpus, queue_size),
+            # EventArticleIndex is not thread safe, so a single writer.
+            Stage("index", self._index, 1, queue_size),
+        ]
+        for stage, nxt in zip(self.stages, self.stages[1:]):
+            stage.next = nxt
+        self._summarize_pool = None
+        self._started = False
+        self._closed = False
+        crawler.pipeline = self
+
+    def start(self) -> "Pipeline":
+        if not self._started:
+            process_pool = getattr(self.crawler.summariser, "process_pool", None)
+            if process_pool is not None:
+                self._summarize_pool = process_pool(self.stages[4].workers)
+            for stage in self.stages:
+                stage.start()
+            self._started = True
+        return self
+
+    def submit(self, **job) -> None:
+        """
+        job should include:
+        - query                 query
+        - time span or          timespan
+        - start and end date    start, end
+        - list of events        events | event
+        Blocks when the retrieve queue is full.
+        """
+        if self._closed:
+            raise RuntimeError("Pipeline is closed.")
+        self.start()
+        self.stages[0].inbox.put(job)
+
+    def close(self, wait: bool = True) -> None:
+        """Stops accepting jobs; in-flight items drain through every stage."""
+        if self._closed:
+            return
+        self._closed = True
+        self.start()
+        for _ in range(self.stages[0].workers):
+            self.stages[0].inbox.put(_STOP)
+        if wait:
+            self.join()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        for stage in self.stages:
+            stage.join(timeout)
+        if self._closed and all(stage.finished for stage in self.stages):
+            # The index worker has exited, so this thread is the only index writer now.
+            self._flush_pending_duplicates()
+            if self._summarize_pool is not None:
+                self._summarize_pool.shutdown()
+                self._summarize_pool = None
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            stage.name: dict(stage.stats.to_dict(), queued=stage.inbox.qsize())
+            for stage in self.stages
+        }
+
+    def __enter__(self) -> "Pipeline":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _retrieve(self, job: Dict) -> Iterable[PipelineItem]:
+        for batch in self.crawler.retrieve_windows(**job):
+            for record in batch:
+                yield PipelineItem(job=job, record=record)
+
+    def _fetch(self, item: PipelineItem) -> Iterable[PipelineItem]:
+        url = item.record["url"]
+        item.text = self.crawler.cache.get(text_key(url))
+        if item.text is None:
+            item.html = self.crawler.fetcher.fetch(url)
+            if item.html is None:
+                return []
+        return [item]
+
+    def _extract(self, item: PipelineItem) -> Iterable[PipelineItem]:
+        if item.text is None:
+            item.text = self.crawler.fetcher.extract(item.html)
+            item.html = None
+            if item.text is None:
+                return []
+            self.crawler.cache.set(text_key(item.record["url"]), item.text)
+        return [item]
+
+    def _dedupe(self, item: PipelineItem) -> Iterable[PipelineItem]:
+        item.duplicate_of = self.deduplicator.observe(item.record["url"], item.text)
+        return [item]
+
+    def _summarize(self, item: PipelineItem) -> Iterable[PipelineItem]:
+        if item.duplicate_of is None:
+            item.summary = self.crawler.summarize_text(item.text, pool=self._summarize_pool)
+        return [item]
+
+    def _index(self, item: PipelineItem) -> Iterable[PipelineItem]:
+        record = item.record
+        events = item.job.get("events") or item.job.get("event") or item.job["query"]
+        if isinstance(events, str):
+            events = [events]
+        metadata = {"title": record.get("title", "")}
+        if item.summary is not None:
+            metadata["summary"] = item.summary
+        article = ArticleRecord(
+            article_id=record["url"],
+            source=record.get("domain") or urlsplit(record["url"]).netloc,
+            published_at=_parse_seendate(record.get("seendate")),
+            url=record["url"],
+            event_ids=list(events),
+            metadata=metadata,
+        )
+        if item.duplicate_of is not None:
+            canonical = self.index.articles.get(item.duplicate_of)
+            if canonical is None:
+                # Summarisation can reorder items; wait for the canonical copy.
+                self._pending_duplicates.setdefault(item.duplicate_of, []).append(article)
+            else:
+                attach_duplicate(canonical, article, self.index)
+                # The copy is dropped, so its events link to the canonical article.
+                for event_id in article.event_ids:
+                    self.index.link_article_to_event(canonical.article_id, event_id)
+            return []
+        self._add_with_copies(article, self._pending_duplicates.pop(article.article_id, []))
+        return []
+
+    def _add_with_copies(self, article: ArticleRecord, copies: List[ArticleRecord]) -> None:
+        existing = self.index.articles.get(article.article_id)
+        for duplicate in copies:
+            if existing is not None:
+                attach_duplicate(existing, duplicate, self.index)
+            else:
+                attach_duplicate(article, duplicate)
+            article.event_ids.extend(duplicate.event_ids)
+        if existing is not None:
+            # The same url submitted under another event: add the links, keep the record.
+            for event_id in article.event_ids:
+                self.index.link_article_to_event(existing.article_id, event_id)
+            return
+        self.index.add_article(article)
+
+    def _flush_pending_duplicates(self) -> None:
+        """
+        Indexes copies whose canonical article never reached the index stage
+        (its fetch, extraction or summary failed): the first copy stands in
+        for the canonical article and the others attach to it.
+        """
+        pending, self._pending_duplicates = self._pending_duplicates, {}
+        for canonical_id, copies in pending.items():
+            logging.warning(
+                "Warning-pipeline-duplicates: %s was never indexed; indexing %d copies without it",
+                canonical_id,
+                len(copies),
+            )
+            self._add_with_copies(copies[0], copies[1:])
+
+
+def _parse_seendate(value: Optional[str]) -> Optional[datetime]:
+    # GDELT seendate looks like 20260118T143000Z.
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y%m%dT%H%M%SZ")
+    except ValueError:
+        return None
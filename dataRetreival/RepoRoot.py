@@ -0,0 +1,16 @@
+"""
+dataRetreival modules import each other flat (`from ArticleCache import ...`)
+and are run from this directory, so the packages at the repo root
+(eventMapping, biasAnalysis, ...) are not importable by default. Modules that
+need them call add_repo_root() before importing them.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def add_repo_root() -> str:
+    if ROOT not in sys.path:
+        sys.path.append(ROOT)
+    return ROOT
@@ -1,13 +1,24 @@
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
 import logging 
-logging.basicConfig(
-    level=logging.ERROR,  # Set the logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename='summariser_errors.log',  # Log file name
-    filemode='a'  # Append mode, so logs aren't overwritten
-)
+
+from RepoRoot import add_repo_root
+
+add_repo_root()
+
+from instrumentation.Metrics import METRICS, instrument
+
+
+def configure_logging(filename='summariser_errors.log'):
+    """Error log for scripts; call once at startup rather than at import."""
+    logging.basicConfig(
+        level=logging.ERROR,  # Set the logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        filename=filename,  # Log file name
+        filemode='a'  # Append mode, so logs aren't overwritten
+    )
 
 class Summariser():
     def __init__(self):
@@ -16,16 +27,102 @@ class Summariser():
     def summarize(self, text, sentences_count=3):
         pass
 
+@dataclass
+class SummaryResult:
+    summary: Optional[str] = None
+    error: Optional[str] = None
+
+
 class SumySummariser(Summariser):
-    def __init__(self):
-        pass
-    
+    """
+    LSA summariser. sumy is imported, and the tokenizer and summarizer built,
+    on first use, once per instance; long documents are summarised in chunks
+    of at most chunk_sentences sentences so the SVD stays bounded, then the
+    chunk picks are summarised once more.
+    """
+
+    def __init__(self, language="english", chunk_sentences=200):
+        self.language = language
+        self.chunk_sentences = chunk_sentences
+        self._tokenizer = None
+        self._summarizer = None
+
+    def _ensure_models(self):
+        if self._tokenizer is None:
+            from sumy.nlp.tokenizers import Tokenizer
+            from sumy.summarizers.lsa import LsaSummarizer
+            self._tokenizer = Tokenizer(self.language)
+            self._summarizer = LsaSummarizer()
+
+    def _summarize(self, text, sentences_count):
+        from sumy.models.dom import ObjectDocumentModel, Paragraph
+        from sumy.parsers.plaintext import PlaintextParser
+        self._ensure_models()
+        document = PlaintextParser.from_string(text, self._tokenizer).document
+        sentences = document.sentences
+        if len(sentences) > self.chunk_sentences:
+            picked = []
+            for start in range(0, len(sentences), self.chunk_sentences):
+                chunk = ObjectDocumentModel([Paragraph(sentences[start:start + self.chunk_sentences])])
+                picked.extend(self._summarizer(chunk, sentences_count))
+            document = ObjectDocumentModel([Paragraph(picked)])
+        summary = self._summarizer(document, sentences_count)
+        return " ".join([str(sentence) for sentence in summary])
+
+    @instrument("SumySummariser.summarize")
     def summarize(self, text, sentences_count=3):
         try:
-            parser = PlaintextParser.from_string(text, Tokenizer("english"))
-            summarizer = LsaSummarizer()
-            summary = summarizer(parser.document, sentences_count)
-            return " ".join([str(sentence) for sentence in summary])
+            return self._summarize(text, sentences_count)
         except:
-            logging.error("Error-summarization: ", text)
-            return None
\ No newline at end of file
+            logging.error("Error-summarization: %s", text)
+            METRICS.error("SumySummariser.summarize")
+            return None
+
+    def process_pool(self, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+        """A pool of worker processes each holding its own summariser; reusable across summarize_many calls."""
+        return ProcessPoolExecutor(
+            max_workers or os.cpu_count() or 1,
+            initializer=_init_worker,
+            initargs=(self.language, self.chunk_sentences),
+        )
+
+    def summarize_many(
+        self,
+        texts: Sequence[str],
+        sentences_count: int = 3,
+        max_workers: Optional[int] = None,
+        pool: Optional[ProcessPoolExecutor] = None,
+    ) -> List[SummaryResult]:
+        """
+        Summarises texts across a process pool. Results keep the input order;
+        failures carry the error message instead of a summary. pool reuses a
+        pool from process_pool() instead of starting one per call.
+        """
+        if not texts:
+            return []
+        max_workers = max_workers or os.cpu_count() or 1
+        jobs = [(text, sentences_count) for text in texts]
+        # A few chunks per worker balances uneven article lengths.
+        chunksize = max(1, len(jobs) // (max_workers * 4))
+        if pool is not None:
+            return list(pool.map(_summarize_job, jobs, chunksize=chunksize))
+        with self.process_pool(max_workers) as pool:
+            return list(pool.map(_summarize_job, jobs, chunksize=chunksize))
+
+
+_worker: Optional[SumySummariser] = None
+
+
+def _init_worker(language, chunk_sentences):
+    global _worker
+    _worker = SumySummariser(language, chunk_sentences)
+
+
+def _summarize_job(job) -> SummaryResult:
+    text, sentences_count = job
+    if not text:
+        return SummaryResult(error="Empty text")
+    try:
+        return SummaryResult(summary=_worker._summarize(text, sentences_count))
+    except Exception as exc:
+        return SummaryResult(error=f"{type(exc).__name__}: {exc}")
\ No newline at end of file
@@ -0,0 +1,150 @@
+import logging
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from RepoRoot import add_repo_root
+
+add_repo_root()
+
+from instrumentation.Metrics import METRICS
+
+GDELT_DOC_URL = "https://api.gdeltproject.org/api/v2/doc/doc"
+_GDELT_TIME_FORMAT = "%Y%m%d%H%M%S"
+_TIMESPAN_UNITS = {"min": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+Window = Tuple[datetime, datetime]
+
+
+def parse_timespan(timespan: str) -> timedelta:
+    """Parses GDELT style timespans such as '15min', '72h', '7d' or '2w'."""
+    match = re.fullmatch(r"\s*(\d+)\s*(min|h|d|w)\s*", timespan.lower())
+    if match is None:
+        raise ValueError(f"Unsupported timespan: {timespan}")
+    return timedelta(**{_TIMESPAN_UNITS[match.group(2)]: int(match.group(1))})
+
+
+class RateLimiter:
+    """
+    Spaces calls at least 1 / rate seconds apart across all threads.
+    """
+
+    def __init__(self, rate: Optional[float]) -> None:
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class WindowedRetriever:
+    """
+    Retrieves GDELT DOC API results past the per-call maxrecords cap by splitting
+    the requested span into sub-windows (STARTDATETIME/ENDDATETIME). Windows that
+    come back saturated are halved again until min_window is reached.
+    """
+
+    def __init__(
+        self,
+        base_url: str = GDELT_DOC_URL,
+        maxrecords: int = 250,
+        initial_window: timedelta = timedelta(hours=6),
+        min_window: timedelta = timedelta(minutes=15),
+        max_workers: int = 4,
+        rate_limit: Optional[float] = None,
+        retries: int = 3,
+        backoff: float = 1.0,
+        timeout: float = 30.0,
+    ) -> None:
+        self.base_url = base_url
+        self.maxrecords = maxrecords
+        self.initial_window = initial_window
+        self.min_window = min_window
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.limiter = RateLimiter(rate_limit)
+        self.session = requests.Session()
+
+    def split(self, start: datetime, end: datetime) -> List[Window]:
+        windows: List[Window] = []
+        while start < end:
+            stop = min(start + self.initial_window, end)
+            windows.append((start, stop))
+            start = stop
+        return windows
+
+    def fetch_window(self, params: Dict, window: Window) -> Optional[List[Dict]]:
+        params = dict(params)
+        params["startdatetime"] = window[0].strftime(_GDELT_TIME_FORMAT)
+        params["enddatetime"] = window[1].strftime(_GDELT_TIME_FORMAT)
+        params["maxrecords"] = self.maxrecords
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            try:
+                response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+                METRICS.add("bytes_fetched_total", len(response.content), source="gdelt")
+                if response.status_code == 200:
+                    # GDELT answers an empty window with an empty object.
+                    return response.json().get("articles", [])
+            except (requests.RequestException, ValueError):
+                pass
+            if attempt < self.retries:
+                time.sleep(self.backoff * (2 ** attempt))
+        logging.error("Error-retrieval: %s %s-%s", params.get("query"), params["startdatetime"], params["enddatetime"])
+        METRICS.error("WindowedRetriever.fetch_window")
+        return None
+
+    def iter_batches(
+        self,
+        params: Dict,
+        start: datetime,
+        end: datetime,
+        language: Optional[str] = "English",
+    ) -> Iterator[List[Dict]]:
+        """
+        Yields batches of article records, one per settled window, in completion
+        order. Records are deduplicated by url across the whole span.
+        """
+        seen = set()
+        with ThreadPoolExecutor(self.max_workers, thread_name_prefix="gdelt") as pool:
+            pending = {pool.submit(self.fetch_window, params, w): w for w in self.split(start, end)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    w_start, w_end = pending.pop(future)
+                    articles = future.result()
+                    if articles is None:
+                        continue
+                    if len(articles) >= self.maxrecords:
+                        if w_end - w_start >= 2 * self.min_window:
+                            mid = w_start + (w_end - w_start) / 2
+                            for half in ((w_start, mid), (mid, w_end)):
+                                pending[pool.submit(self.fetch_window, params, half)] = half
+                            continue
+                        logging.warning("Window still saturated at minimum size: %s-%s", w_start, w_end)
+                    batch = []
+                    for article in articles:
+                        url = article.get("url")
+                        if url in seen:
+                            continue
+                        if language is not None and article.get("language") != language:
+                            continue
+                        seen.add(url)
+                        batch.append(article)
+                    if batch:
+                        yield batch
@@ -0,0 +1,160 @@
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from eventMapping.EventArticleIndex import ArticleRecord, EventArticleIndex
+
+_WORD = re.compile(r"\w+")
+# Joins ids in string metadata; whitespace never occurs in a url (unlike ",").
+ID_SEPARATOR = " "
+
+
+class MinHashDeduplicator:
+    """
+    Detects near-duplicate (syndicated) article texts with MinHash signatures over
+    word shingles and LSH banding, so each new text is only compared against the
+    handful of candidates that share a band rather than the whole corpus.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 32,
+        shingle_size: int = 5,
+        threshold: float = 0.7,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: odd 64-bit multipliers, high 32 bits kept.
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._buckets: Dict[Tuple[int, bytes], List[str]] = {}
+        self._signatures: Dict[str, np.ndarray] = {}
+
+    def shingles(self, text: str) -> np.ndarray:
+        words = _WORD.findall(text.lower())
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+        k = min(self.shingle_size, len(words))
+        grams = {" ".join(words[i : i + k]) for i in range(len(words) - k + 1)}
+        return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        shingles = self.shingles(text)
+        if shingles.size == 0:
+            return None
+        hashed = (np.outer(self._a, shingles) + self._b[:, None]) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def similarity(self, a: np.ndarray, b: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.count_nonzero(a == b)) / self.num_perm
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows : (band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def observe(self, article_id: str, text: Optional[str]) -> Optional[str]:
+        """
+        Streams one text through the detector. Returns the canonical article_id
+        it duplicates, or None if it is new (and now canonical itself).
+        """
+        signature = self.signature(text) if text else None
+        if signature is None:
+            return None
+        keys = self._band_keys(signature)
+        seen = {article_id}
+        for key in keys:
+            for candidate in self._buckets.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                if self.similarity(signature, self._signatures[candidate]) >= self.threshold:
+                    return candidate
+        # The same article seen again (e.g. under another event) is not its own duplicate.
+        if article_id not in self._signatures:
+            self._signatures[article_id] = signature
+            for key in keys:
+                self._buckets.setdefault(key, []).append(article_id)
+        return None
+
+    def group(self, texts: Iterable[Tuple[str, Optional[str]]]) -> Dict[str, List[str]]:
+        """Maps each canonical article_id to the ids of its near-duplicates."""
+        groups: Dict[str, List[str]] = {}
+        for article_id, text in texts:
+            canonical = self.observe(article_id, text)
+            if canonical is None:
+                groups[article_id] = []
+            else:
+                groups[canonical].append(article_id)
+        return groups
+
+
+def attach_duplicate(
+    canonical: ArticleRecord,
+    duplicate: ArticleRecord,
+    index: Optional[EventArticleIndex] = None,
+) -> None:
+    """
+    Records a syndicated copy on the canonical article's metadata. Pass the
+    index the canonical article lives in so the change reaches its observers
+    (an attached IndexStore logs it).
+    """
+    ids = _split(canonical.metadata.get("duplicate_ids"))
+    if duplicate.article_id in ids or duplicate.article_id == canonical.article_id:
+        return
+    ids.append(duplicate.article_id)
+    sources = _split(canonical.metadata.get("syndicated_sources"))
+    if duplicate.source != canonical.source and duplicate.source not in sources:
+        sources.append(duplicate.source)
+    updates = {
+        "duplicate_ids": ID_SEPARATOR.join(ids),
+        "syndicated_sources": ID_SEPARATOR.join(sources),
+        "syndication_count": len(ids),
+    }
+    if index is not None:
+        index.update_metadata(canonical.article_id, updates)
+    else:
+        canonical.metadata.update(updates)
+
+
+def deduplicate_articles(
+    articles: List[ArticleRecord],
+    texts: Dict[str, str],
+    deduplicator: Optional[MinHashDeduplicator] = None,
+) -> List[ArticleRecord]:
+    """
+    Returns only the canonical copies, earliest published first wins, with the
+    other sources attached to each canonical record's metadata.
+    """
+    deduplicator = deduplicator or MinHashDeduplicator()
+    by_id = {a.article_id: a for a in articles}
+    ordered = sorted(articles, key=lambda a: (a.published_at is None, str(a.published_at or "")))
+    groups = deduplicator.group((a.article_id, texts.get(a.article_id)) for a in ordered)
+    canonical: List[ArticleRecord] = []
+    for article_id, duplicate_ids in groups.items():
+        record = by_id[article_id]
+        for duplicate_id in duplicate_ids:
+            attach_duplicate(record, by_id[duplicate_id])
+        canonical.append(record)
+    return canonical
+
+
+def duplicate_ids(article: ArticleRecord) -> List[str]:
+    """Ids of the syndicated copies attached to a canonical article."""
+    return _split(article.metadata.get("duplicate_ids"))
+
+
+def _split(value) -> List[str]:
+    return str(value).split() if value else []
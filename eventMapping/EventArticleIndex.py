@@ -1,6 +1,10 @@
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field, asdict
-from datetime import datetime
-from typing import Dict, List, Optional, Union
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+# Insertion-ordered set: dict keys with None values.
+OrderedIds = Dict[str, None]
 
 
 @dataclass
@@ -44,50 +48,253 @@ class ArticleRecord:
 
 class EventArticleIndex:
     """
-    Maintains a bidirectional map between events and articles.
+    Maintains a bidirectional map between events and articles, plus secondary
+    indexes by source, publication time and event entity/topic.
     """
 
     def __init__(self) -> None:
         self.events: Dict[str, EventRecord] = {}
         self.articles: Dict[str, ArticleRecord] = {}
-        self.event_articles: Dict[str, List[str]] = {}
-        self.article_events: Dict[str, List[str]] = {}
+        self.event_articles: Dict[str, OrderedIds] = {}
+        self.article_events: Dict[str, OrderedIds] = {}
+        self.articles_by_source: Dict[str, OrderedIds] = {}
+        self.events_by_entity: Dict[str, OrderedIds] = {}
+        self.events_by_topic: Dict[str, OrderedIds] = {}
+        # Sorted (timestamp, article_id) range index over published_at. New
+        # entries are buffered and merged in one sort on the next range read.
+        self._published: List[Tuple[float, str]] = []
+        self._published_pending: List[Tuple[float, str]] = []
+        self._published_key: Dict[str, float] = {}
+        # Deferred builder for _published, set when restored from a snapshot.
+        self._published_loader: Optional[Callable[[], List[Tuple[float, str]]]] = None
+        self._listeners: List[object] = []
+
+    def add_listener(self, listener: object) -> None:
+        """
+        Registers an observer. Any of on_event_added(event),
+        on_article_added(article), on_linked(article_id, event_id),
+        on_unlinked(article_id, event_id) and on_vector_changed(article,
+        old_vector) defined on it are called after the corresponding change;
+        on_article_removed(article) is called before an article is replaced.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: object) -> None:
+        self._listeners.remove(listener)
+
+    def _notify(self, hook: str, *args) -> None:
+        for listener in self._listeners:
+            method = getattr(listener, hook, None)
+            if method is not None:
+                method(*args)
 
     def add_event(self, event: EventRecord) -> None:
+        old = self.events.get(event.event_id)
+        if old is not None:
+            for entity in old.entities:
+                self.events_by_entity.get(entity, {}).pop(old.event_id, None)
+            for topic in old.topics:
+                self.events_by_topic.get(topic, {}).pop(old.event_id, None)
         self.events[event.event_id] = event
-        self.event_articles.setdefault(event.event_id, [])
+        self.event_articles.setdefault(event.event_id, {})
+        for entity in event.entities:
+            self.events_by_entity.setdefault(entity, {})[event.event_id] = None
+        for topic in event.topics:
+            self.events_by_topic.setdefault(topic, {})[event.event_id] = None
+        self._notify("on_event_added", event)
 
     def add_article(self, article: ArticleRecord) -> None:
+        old = self.articles.get(article.article_id)
+        if old is not None:
+            self._notify("on_article_removed", old)
+            self._unindex_article(old)
         self.articles[article.article_id] = article
-        self.article_events.setdefault(article.article_id, [])
+        self.article_events.setdefault(article.article_id, {})
+        self._index_article(article)
+        article.event_ids = list(dict.fromkeys(article.event_ids))
         for event_id in article.event_ids:
-            self.link_article_to_event(article.article_id, event_id)
+            self._link(article.article_id, event_id)
+        self._notify("on_article_added", article)
+
+    def add_articles(self, articles: Iterable[ArticleRecord]) -> None:
+        for article in articles:
+            self.add_article(article)
 
     def link_article_to_event(self, article_id: str, event_id: str) -> None:
+        if self._link(article_id, event_id):
+            if article_id in self.articles:
+                self.articles[article_id].event_ids.append(event_id)
+            self._notify("on_linked", article_id, event_id)
+
+    def unlink_article_from_event(self, article_id: str, event_id: str) -> None:
+        events = self.article_events.get(article_id)
+        if events is None or event_id not in events:
+            return
+        del events[event_id]
+        self.event_articles[event_id].pop(article_id, None)
+        article = self.articles.get(article_id)
+        if article is not None and event_id in article.event_ids:
+            article.event_ids.remove(event_id)
+        self._notify("on_unlinked", article_id, event_id)
+
+    def update_feature_vector(
+        self,
+        article_id: str,
+        feature_vector: Optional[Union[Dict[str, float], List[float]]],
+    ) -> None:
+        """Replaces an article's feature vector so observers can track it."""
+        article = self.articles[article_id]
+        old = article.feature_vector
+        article.feature_vector = feature_vector
+        self._notify("on_vector_changed", article, old)
+
+    def update_metadata(self, article_id: str, updates: Dict[str, Union[str, float, int, bool]]) -> None:
+        """Merges updates into an article's metadata so observers (e.g. IndexStore) see the change."""
+        article = self.articles[article_id]
+        article.metadata.update(updates)
+        self._notify("on_metadata_changed", article, updates)
+
+    def link_many(self, pairs: Iterable[Tuple[str, str]]) -> None:
+        """Bulk link of (article_id, event_id) pairs."""
+        for article_id, event_id in pairs:
+            self.link_article_to_event(article_id, event_id)
+
+    def _link(self, article_id: str, event_id: str) -> bool:
+        """Adds both adjacency entries; returns False if already linked."""
         if event_id not in self.events:
             self.add_event(EventRecord(event_id=event_id, title=event_id))
-        self.event_articles.setdefault(event_id, [])
-        self.article_events.setdefault(article_id, [])
-        if article_id not in self.event_articles[event_id]:
-            self.event_articles[event_id].append(article_id)
-        if event_id not in self.article_events[article_id]:
-            self.article_events[article_id].append(event_id)
-        if article_id in self.articles:
-            if event_id not in self.articles[article_id].event_ids:
-                self.articles[article_id].event_ids.append(event_id)
+        events = self.article_events.setdefault(article_id, {})
+        if event_id in events:
+            return False
+        events[event_id] = None
+        self.event_articles[event_id][article_id] = None
+        return True
+
+    def _index_article(self, article: ArticleRecord) -> None:
+        self.articles_by_source.setdefault(article.source, {})[article.article_id] = None
+        key = _timestamp_key(article.published_at)
+        if key is not None:
+            self._published_pending.append((key, article.article_id))
+            self._published_key[article.article_id] = key
+
+    def _unindex_article(self, article: ArticleRecord) -> None:
+        self.articles_by_source.get(article.source, {}).pop(article.article_id, None)
+        key = self._published_key.pop(article.article_id, None)
+        if key is not None:
+            entry = (key, article.article_id)
+            self._merge_published()
+            pos = bisect_left(self._published, entry)
+            if pos < len(self._published) and self._published[pos] == entry:
+                del self._published[pos]
 
     def get_articles_for_event(self, event_id: str) -> List[ArticleRecord]:
-        ids = self.event_articles.get(event_id, [])
+        ids = self.event_articles.get(event_id, {})
         return [self.articles[a_id] for a_id in ids if a_id in self.articles]
 
     def get_events_for_article(self, article_id: str) -> List[EventRecord]:
-        ids = self.article_events.get(article_id, [])
+        ids = self.article_events.get(article_id, {})
         return [self.events[e_id] for e_id in ids if e_id in self.events]
 
+    def get_events_for_entity(self, entity: str) -> List[EventRecord]:
+        return [self.events[e_id] for e_id in self.events_by_entity.get(entity, {})]
+
+    def get_events_for_topic(self, topic: str) -> List[EventRecord]:
+        return [self.events[e_id] for e_id in self.events_by_topic.get(topic, {})]
+
+    def get_articles_between(
+        self,
+        since: Optional[Union[datetime, str]] = None,
+        until: Optional[Union[datetime, str]] = None,
+    ) -> List[ArticleRecord]:
+        """Articles with since <= published_at <= until, oldest first."""
+        return [self.articles[a_id] for a_id in self._range_ids(since, until)]
+
+    def query_articles(
+        self,
+        event_id: Optional[str] = None,
+        source: Optional[str] = None,
+        since: Optional[Union[datetime, str]] = None,
+        until: Optional[Union[datetime, str]] = None,
+    ) -> List[ArticleRecord]:
+        """
+        Articles matching every given filter, e.g. event X from source Y in the
+        last 6h. Starts from the smallest matching index and probes the others.
+        """
+        candidates: List[Union[OrderedIds, List[str]]] = []
+        if event_id is not None:
+            candidates.append(self.event_articles.get(event_id, {}))
+        if source is not None:
+            candidates.append(self.articles_by_source.get(source, {}))
+        timed = since is not None or until is not None
+        if timed and (not candidates or self._range_size(since, until) < min(map(len, candidates))):
+            candidates.insert(0, self._range_ids(since, until))
+            timed = False
+        if not candidates:
+            return list(self.articles.values())
+        candidates.sort(key=len)
+        lower = _timestamp_key(since) if since is not None else None
+        upper = _timestamp_key(until) if until is not None else None
+        result: List[ArticleRecord] = []
+        for a_id in candidates[0]:
+            if a_id not in self.articles or any(a_id not in other for other in candidates[1:]):
+                continue
+            if timed:
+                key = self._published_key.get(a_id)
+                if key is None or (lower is not None and key < lower) or (upper is not None and key > upper):
+                    continue
+            result.append(self.articles[a_id])
+        return result
+
+    def _merge_published(self) -> None:
+        if self._published_loader is not None:
+            self._published = self._published_loader()
+            self._published_loader = None
+        if self._published_pending:
+            self._published_pending.sort()
+            if self._published and self._published[-1] > self._published_pending[0]:
+                # Two sorted runs: timsort merges them in linear time.
+                self._published.extend(self._published_pending)
+                self._published.sort()
+            else:
+                self._published.extend(self._published_pending)
+            self._published_pending = []
+
+    def _range_bounds(self, since, until) -> Tuple[int, int]:
+        self._merge_published()
+        lo = 0 if since is None else bisect_left(self._published, (_timestamp_key(since), ""))
+        if until is None:
+            hi = len(self._published)
+        else:
+            # The id "\uffff" sorts after every real id with the same timestamp.
+            hi = bisect_right(self._published, (_timestamp_key(until), "\uffff"))
+        return lo, hi
+
+    def _range_size(self, since, until) -> int:
+        lo, hi = self._range_bounds(since, until)
+        return max(0, hi - lo)
+
+    def _range_ids(self, since, until) -> List[str]:
+        lo, hi = self._range_bounds(since, until)
+        return [a_id for _, a_id in self._published[lo:hi]]
+
     def to_dict(self) -> Dict:
         return {
             "events": {k: v.to_dict() for k, v in self.events.items()},
             "articles": {k: v.to_dict() for k, v in self.articles.items()},
-            "event_articles": self.event_articles,
-            "article_events": self.article_events,
+            "event_articles": {k: list(v) for k, v in self.event_articles.items()},
+            "article_events": {k: list(v) for k, v in self.article_events.items()},
         }
+
+
+def _timestamp_key(value: Optional[Union[datetime, str]]) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        # Naive timestamps are taken as UTC so mixed inputs still order sensibly.
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
@@ -0,0 +1,417 @@
+import os
+import pickle
+import shutil
+import struct
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from eventMapping.EventArticleIndex import (
+    ArticleRecord,
+    EventArticleIndex,
+    EventRecord,
+    _timestamp_key,
+)
+
+_SNAPSHOT = "snapshot.pkl"
+# Names the snapshot-<n> directory holding the current generation.
+_CURRENT = "CURRENT"
+_GENERATION = "snapshot-"
+_LOG = "ops.log"
+_ARRAYS = ("dense_values", "dense_offsets", "sparse_keys", "sparse_values", "sparse_offsets")
+_VERSION = 1
+_HEADER = struct.Struct("<I")
+
+_NO_VECTOR, _DENSE, _SPARSE = 0, 1, 2
+
+
+class _LazyMap(MutableMapping):
+    """
+    Dict-like view over snapshot rows. Values are built by loader(row) on first
+    access and kept; keys never touched are never materialized.
+    """
+
+    def __init__(self, keys: Sequence[str], loader: Callable[[int], object]) -> None:
+        self._order: Dict[str, None] = dict.fromkeys(keys)
+        self._rows: Dict[str, int] = {key: row for row, key in enumerate(keys)}
+        self._values: Dict[str, object] = {}
+        self._loader = loader
+
+    def __getitem__(self, key: str):
+        if key in self._values:
+            return self._values[key]
+        row = self._rows.pop(key)
+        value = self._values[key] = self._loader(row)
+        return value
+
+    def __setitem__(self, key: str, value) -> None:
+        self._rows.pop(key, None)
+        self._order[key] = None
+        self._values[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._order[key]
+        self._rows.pop(key, None)
+        self._values.pop(key, None)
+
+    def __contains__(self, key) -> bool:
+        return key in self._order
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+class IndexStore:
+    """
+    Persists an EventArticleIndex as a compact snapshot plus an append-only log
+    of add_event / add_article / link / unlink / feature-vector / metadata
+    operations.
+
+    The snapshot keeps records columnar, adjacency as CSR integer arrays and
+    feature vectors as flat float arrays that are memory-mapped on load, so a
+    restored index only materializes the records and adjacency lists that are
+    actually read. compact() folds the log back into a fresh snapshot.
+    """
+
+    def __init__(self, path: str, sync: bool = False, vector_dtype: str = "float64") -> None:
+        self.path = path
+        self.sync = sync
+        self.vector_dtype = vector_dtype
+        self.index: Optional[EventArticleIndex] = None
+        self.logged_ops = 0
+        self._log = None
+        os.makedirs(path, exist_ok=True)
+
+    def load(self) -> EventArticleIndex:
+        """Restores the snapshot, replays the log and starts logging new changes."""
+        index = EventArticleIndex()
+        directory = _snapshot_dir(self.path)
+        if directory is not None:
+            _restore(index, directory, os.path.join(directory, _SNAPSHOT))
+        self.logged_ops = self._replay(index)
+        self._attach(index)
+        return index
+
+    def attach(self, index: EventArticleIndex) -> None:
+        """Starts logging changes to an index built in memory."""
+        self._attach(index)
+
+    def _attach(self, index: EventArticleIndex) -> None:
+        if self.index is not None:
+            self.index.remove_listener(self)
+        self.index = index
+        index.add_listener(self)
+        if self._log is None:
+            self._log = open(os.path.join(self.path, _LOG), "ab")
+
+    def on_event_added(self, event: EventRecord) -> None:
+        self._append(("add_event", event))
+
+    def on_article_added(self, article: ArticleRecord) -> None:
+        self._append(("add_article", article))
+
+    def on_linked(self, article_id: str, event_id: str) -> None:
+        self._append(("link", (article_id, event_id)))
+
+    def on_unlinked(self, article_id: str, event_id: str) -> None:
+        self._append(("unlink", (article_id, event_id)))
+
+    def on_vector_changed(self, article: ArticleRecord, old_vector) -> None:
+        self._append(("set_vector", (article.article_id, article.feature_vector)))
+
+    def on_metadata_changed(self, article: ArticleRecord, updates: Dict) -> None:
+        self._append(("set_metadata", (article.article_id, updates)))
+
+    def _append(self, op: Tuple[str, object]) -> None:
+        payload = pickle.dumps(op, protocol=pickle.HIGHEST_PROTOCOL)
+        self._log.write(_HEADER.pack(len(payload)) + payload)
+        self._log.flush()
+        if self.sync:
+            os.fsync(self._log.fileno())
+        self.logged_ops += 1
+
+    def _replay(self, index: EventArticleIndex) -> int:
+        log_path = os.path.join(self.path, _LOG)
+        if not os.path.exists(log_path):
+            return 0
+        count = 0
+        good = 0
+        with open(log_path, "rb") as log:
+            while True:
+                header = log.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    break
+                payload = log.read(_HEADER.unpack(header)[0])
+                try:
+                    op, arg = pickle.loads(payload)
+                except Exception:
+                    break  # torn write at the tail
+                if op == "add_event":
+                    index.add_event(arg)
+                elif op == "add_article":
+                    index.add_article(arg)
+                elif op == "link":
+                    index.link_article_to_event(*arg)
+                elif op == "unlink":
+                    index.unlink_article_from_event(*arg)
+                elif op == "set_metadata":
+                    index.update_metadata(*arg)
+                else:
+                    index.update_feature_vector(*arg)
+                count += 1
+                good = log.tell()
+        if good < os.path.getsize(log_path):
+            with open(log_path, "r+b") as log:
+                log.truncate(good)
+        return count
+
+    def maybe_compact(self, max_ops: int = 100_000) -> bool:
+        """Compacts once the log holds more than max_ops operations."""
+        if self.logged_ops <= max_ops:
+            return False
+        self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Writes the attached index as a new snapshot and empties the log."""
+        if self.index is None:
+            raise RuntimeError("No index attached; call load() or attach() first.")
+        save_snapshot(self.index, self.path, self.vector_dtype)
+        self._log.close()
+        self._log = open(os.path.join(self.path, _LOG), "wb")
+        self.logged_ops = 0
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        if self.index is not None:
+            self.index.remove_listener(self)
+            self.index = None
+
+
+def save_snapshot(index: EventArticleIndex, path: str, vector_dtype: str = "float64") -> None:
+    """
+    Writes index to path atomically: the arrays and snapshot.pkl go into a new
+    snapshot-<n> directory, and renaming the CURRENT pointer onto it is the
+    single step that switches generations. Older generations are removed.
+    """
+    event_ids = list(index.event_articles)
+    event_row = {e_id: i for i, e_id in enumerate(event_ids)}
+    article_ids = list(index.article_events)
+    for a_id in index.articles:
+        if a_id not in index.article_events:
+            article_ids.append(a_id)
+    article_row = {a_id: i for i, a_id in enumerate(article_ids)}
+
+    sources: Dict[str, int] = {}
+    vocab: Dict[str, int] = {}
+    record_order = [article_row[a_id] for a_id in index.articles]
+    n = len(article_ids)
+    has_record = np.zeros(n, dtype=bool)
+    source_idx = np.full(n, -1, dtype=np.int32)
+    published_key = np.full(n, np.nan)
+    published: List = [None] * n
+    urls: List[Optional[str]] = [None] * n
+    metadata: List[Optional[Dict]] = [None] * n
+    record_events: List[List[int]] = [[] for _ in range(n)]
+    vector_kind = np.zeros(n, dtype=np.int8)
+    vector_row = np.full(n, -1, dtype=np.int64)
+    dense_values, dense_offsets = [], [0]
+    sparse_keys, sparse_values, sparse_offsets = [], [], [0]
+
+    for a_id, article in index.articles.items():
+        row = article_row[a_id]
+        has_record[row] = True
+        source_idx[row] = sources.setdefault(article.source, len(sources))
+        key = _timestamp_key(article.published_at)
+        if key is not None:
+            published_key[row] = key
+        published[row] = article.published_at
+        urls[row] = article.url
+        metadata[row] = article.metadata or None
+        record_events[row] = [event_row[e_id] for e_id in article.event_ids if e_id in event_row]
+        vector = article.feature_vector
+        if isinstance(vector, dict):
+            vector_kind[row] = _SPARSE
+            vector_row[row] = len(sparse_offsets) - 1
+            sparse_keys.extend(vocab.setdefault(k, len(vocab)) for k in vector)
+            sparse_values.extend(vector.values())
+            sparse_offsets.append(len(sparse_keys))
+        elif vector is not None:
+            vector_kind[row] = _DENSE
+            vector_row[row] = len(dense_offsets) - 1
+            dense_values.extend(vector)
+            dense_offsets.append(len(dense_values))
+
+    event_indptr, event_indices = _csr([[article_row[a] for a in index.event_articles[e]] for e in event_ids])
+    article_indptr, article_indices = _csr([[event_row[e] for e in index.article_events.get(a, ())] for a in article_ids])
+    record_indptr, record_indices = _csr(record_events)
+    by_source: List[List[int]] = [[] for _ in sources]
+    for source, ids in index.articles_by_source.items():
+        if source in sources:
+            by_source[sources[source]] = [article_row[a] for a in ids]
+    source_indptr, source_indices = _csr(by_source)
+
+    state = {
+        "version": _VERSION,
+        "events": [index.events[e_id] for e_id in event_ids],
+        "article_ids": article_ids,
+        "record_order": np.asarray(record_order, dtype=np.int64),
+        "has_record": has_record,
+        "sources": list(sources),
+        "source_idx": source_idx,
+        "published": published,
+        "published_key": published_key,
+        "urls": urls,
+        "metadata": metadata,
+        "vocab": list(vocab),
+        "vector_kind": vector_kind,
+        "vector_row": vector_row,
+        "event_articles": (event_indptr, event_indices),
+        "article_events": (article_indptr, article_indices),
+        "record_events": (record_indptr, record_indices),
+        "articles_by_source": (source_indptr, source_indices),
+    }
+    arrays = {
+        "dense_values": np.asarray(dense_values, dtype=vector_dtype),
+        "dense_offsets": np.asarray(dense_offsets, dtype=np.int64),
+        "sparse_keys": np.asarray(sparse_keys, dtype=np.int32),
+        "sparse_values": np.asarray(sparse_values, dtype=vector_dtype),
+        "sparse_offsets": np.asarray(sparse_offsets, dtype=np.int64),
+    }
+    os.makedirs(path, exist_ok=True)
+    generation = _GENERATION + str(_generation_number(path) + 1)
+    directory = os.path.join(path, generation)
+    # Left over from a save that crashed before switching CURRENT.
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    for name, array in arrays.items():
+        with open(os.path.join(directory, name + ".npy"), "wb") as f:
+            np.save(f, array)
+            f.flush()
+            os.fsync(f.fileno())
+    with open(os.path.join(directory, _SNAPSHOT), "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp = os.path.join(path, _CURRENT + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(generation)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, os.path.join(path, _CURRENT))
+    _remove_old_generations(path, generation)
+
+
+def _generation_number(path: str) -> int:
+    """Highest snapshot-<n> in path, current or abandoned; 0 if none."""
+    numbers = [0]
+    for name in os.listdir(path):
+        if name.startswith(_GENERATION) and name[len(_GENERATION):].isdigit():
+            numbers.append(int(name[len(_GENERATION):]))
+    return max(numbers)
+
+
+def _snapshot_dir(path: str) -> Optional[str]:
+    """Directory of the current snapshot, also accepting the older flat layout."""
+    pointer = os.path.join(path, _CURRENT)
+    if os.path.exists(pointer):
+        with open(pointer) as f:
+            return os.path.join(path, f.read().strip())
+    if os.path.exists(os.path.join(path, _SNAPSHOT)):
+        return path
+    return None
+
+
+def _remove_old_generations(path: str, current: str) -> None:
+    # A loaded index may still have the old arrays memory-mapped; on POSIX the
+    # mapping outlives the unlink, elsewhere the files are left for next time.
+    for name in os.listdir(path):
+        if name.startswith(_GENERATION) and name != current:
+            shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+    for name in (_SNAPSHOT,) + tuple(a + ".npy" for a in _ARRAYS):
+        try:
+            os.remove(os.path.join(path, name))
+        except OSError:
+            pass
+
+
+def _restore(index: EventArticleIndex, path: str, snapshot: str) -> None:
+    with open(snapshot, "rb") as f:
+        state = pickle.load(f)
+    if state["version"] != _VERSION:
+        raise ValueError(f"Unsupported snapshot version: {state['version']}")
+    arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode="r") for name in _ARRAYS}
+
+    events: List[EventRecord] = state["events"]
+    event_ids = [e.event_id for e in events]
+    article_ids: List[str] = state["article_ids"]
+    sources: List[str] = state["sources"]
+    vocab: List[str] = state["vocab"]
+    ev_ptr, ev_idx = state["event_articles"]
+    ar_ptr, ar_idx = state["article_events"]
+    rec_ptr, rec_idx = state["record_events"]
+    src_ptr, src_idx = state["articles_by_source"]
+
+    def vector(row: int):
+        kind = state["vector_kind"][row]
+        v_row = state["vector_row"][row]
+        if kind == _DENSE:
+            lo, hi = arrays["dense_offsets"][v_row], arrays["dense_offsets"][v_row + 1]
+            return arrays["dense_values"][lo:hi].tolist()
+        if kind == _SPARSE:
+            lo, hi = arrays["sparse_offsets"][v_row], arrays["sparse_offsets"][v_row + 1]
+            keys = arrays["sparse_keys"][lo:hi].tolist()
+            return dict(zip((vocab[k] for k in keys), arrays["sparse_values"][lo:hi].tolist()))
+        return None
+
+    def article(row: int) -> ArticleRecord:
+        return ArticleRecord(
+            article_id=article_ids[row],
+            source=sources[state["source_idx"][row]],
+            published_at=state["published"][row],
+            url=state["urls"][row],
+            event_ids=[event_ids[j] for j in rec_idx[rec_ptr[row] : rec_ptr[row + 1]]],
+            feature_vector=vector(row),
+            metadata=dict(state["metadata"][row] or {}),
+        )
+
+    record_rows = state["record_order"]
+    index.articles = _LazyMap([article_ids[r] for r in record_rows], lambda i: article(int(record_rows[i])))
+    index.event_articles = _LazyMap(
+        event_ids, lambda r: dict.fromkeys(article_ids[j] for j in ev_idx[ev_ptr[r] : ev_ptr[r + 1]])
+    )
+    index.article_events = _LazyMap(
+        article_ids, lambda r: dict.fromkeys(event_ids[j] for j in ar_idx[ar_ptr[r] : ar_ptr[r + 1]])
+    )
+    index.articles_by_source = _LazyMap(
+        sources, lambda r: dict.fromkeys(article_ids[j] for j in src_idx[src_ptr[r] : src_ptr[r + 1]])
+    )
+    for event in events:
+        index.events[event.event_id] = event
+        for entity in event.entities:
+            index.events_by_entity.setdefault(entity, {})[event.event_id] = None
+        for topic in event.topics:
+            index.events_by_topic.setdefault(topic, {})[event.event_id] = None
+
+    keys = state["published_key"]
+    timed = np.flatnonzero(~np.isnan(keys) & state["has_record"])
+    index._published_key = _LazyMap([article_ids[r] for r in timed], lambda i: float(keys[timed[i]]))
+
+    def published() -> List[Tuple[float, str]]:
+        rows = timed[np.argsort(keys[timed], kind="stable")]
+        return sorted(zip(keys[rows].tolist(), (article_ids[r] for r in rows)))
+
+    index._published_loader = published
+
+
+def _csr(rows: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(r) for r in rows], out=indptr[1:])
+    indices = np.fromiter((j for r in rows for j in r), dtype=np.int32, count=int(indptr[-1]))
+    return indptr, indices
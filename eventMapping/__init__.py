@@ -1,3 +1,21 @@
-from .EventArticleIndex import EventArticleIndex, EventRecord, ArticleRecord
+# Submodules are imported on first use; see packageUtils.LazyPackage.
+from typing import TYPE_CHECKING
 
-__all__ = ["EventArticleIndex", "EventRecord", "ArticleRecord"]
+from packageUtils.LazyPackage import lazy_package
+
+if TYPE_CHECKING:
+    from .EventArticleIndex import EventArticleIndex, EventRecord, ArticleRecord
+    from .Deduplicator import MinHashDeduplicator
+    from .IndexStore import IndexStore
+
+_LAZY = {
+    "EventArticleIndex": "EventArticleIndex",
+    "EventRecord": "EventArticleIndex",
+    "ArticleRecord": "EventArticleIndex",
+    "MinHashDeduplicator": "Deduplicator",
+    "IndexStore": "IndexStore",
+}
+
+__all__ = ["EventArticleIndex", "EventRecord", "ArticleRecord", "MinHashDeduplicator", "IndexStore"]
+
+lazy_package(__name__, _LAZY)
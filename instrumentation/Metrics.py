@@ -0,0 +1,307 @@
+import atexit
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, upper bounds (Prometheus-style, +Inf implied).
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    """Bucketed latency distribution plus count and sum."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf if past the last bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class _NoopTimer:
+    def __enter__(self) -> "_NoopTimer":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+class _Timer:
+    __slots__ = ("registry", "stage", "began")
+
+    def __init__(self, registry: "Registry", stage: str) -> None:
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self) -> "_Timer":
+        self.began = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.registry.observe_stage(self.stage, time.perf_counter() - self.began, exc_type is not None)
+        return False
+
+
+class Registry:
+    """
+    Counters and latency histograms keyed by name and labels.
+
+    Disabled by default; every hook then returns after one attribute check,
+    so instrumented code pays well under a microsecond per call. Enable with
+    enable(), export_every() or the ECHOLAS_METRICS environment variable.
+
+    Per stage (a decorated function or a timer() block) it records
+    stage_seconds (histogram), stage_calls_total and stage_errors_total;
+    add() / cache() record anything else, e.g. bytes fetched or cache hits.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._help: Dict[str, str] = {
+            "stage_seconds": "Wall time per call of an instrumented stage.",
+            "stage_calls_total": "Calls of an instrumented stage.",
+            "stage_errors_total": "Calls of an instrumented stage that raised or failed.",
+            "bytes_fetched_total": "Bytes downloaded, by source.",
+            "cache_requests_total": "Cache lookups by result (hit / miss).",
+        }
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    # Recording
+
+    def add(self, name: str, value: float = 1.0, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def observe_stage(self, stage: str, seconds: float, error: bool = False) -> None:
+        labels = (("stage", stage),)
+        with self._lock:
+            histogram = self._histograms.get(("stage_seconds", labels))
+            if histogram is None:
+                histogram = self._histograms[("stage_seconds", labels)] = Histogram()
+            histogram.observe(seconds)
+            calls = ("stage_calls_total", labels)
+            self._counters[calls] = self._counters.get(calls, 0.0) + 1
+            if error:
+                errors = ("stage_errors_total", labels)
+                self._counters[errors] = self._counters.get(errors, 0.0) + 1
+
+    def error(self, stage: str) -> None:
+        """Counts a failure the stage handled itself (logged and returned None) instead of raising."""
+        if self.enabled:
+            self.add("stage_errors_total", stage=stage)
+
+    def cache(self, cache: str, hit: bool) -> None:
+        if self.enabled:
+            self.add("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+    def timer(self, stage: str):
+        """Context manager timing a block as a stage; a shared no-op while disabled."""
+        if not self.enabled:
+            return _NOOP
+        return _Timer(self, stage)
+
+    def instrument(self, stage: Optional[str] = None) -> Callable:
+        """Decorator timing every call of a function as a stage (default name: its qualname)."""
+
+        def decorate(fn: Callable) -> Callable:
+            name = stage or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                began = time.perf_counter()
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException:
+                    self.observe_stage(name, time.perf_counter() - began, True)
+                    raise
+                self.observe_stage(name, time.perf_counter() - began)
+                return result
+
+            return wrapper
+
+        return decorate
+
+    # Export
+
+    def snapshot(self) -> Dict:
+        """JSON-serialisable view: counters, histograms with p50/p90/p99 and per-stage throughput."""
+        uptime = max(time.time() - self.started_at, 1e-9)
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": h.count,
+                    "sum": h.total,
+                    "mean": h.total / h.count if h.count else 0.0,
+                    "p50": h.quantile(0.5),
+                    "p90": h.quantile(0.9),
+                    "p99": h.quantile(0.99),
+                    "buckets": dict(zip([str(b) for b in h.buckets] + ["+Inf"], h.counts)),
+                }
+                for (name, labels), h in sorted(self._histograms.items())
+            ]
+        stages = {}
+        for h in histograms:
+            if h["name"] == "stage_seconds":
+                stages[h["labels"]["stage"]] = {"calls": h["count"], "per_second": h["count"] / uptime, "mean_s": h["mean"]}
+        for c in counters:
+            if c["name"] == "stage_errors_total" and c["labels"]["stage"] in stages:
+                stages[c["labels"]["stage"]]["errors"] = int(c["value"])
+        return {"uptime_s": uptime, "stages": stages, "counters": counters, "histograms": histograms}
+
+    def to_prometheus(self, prefix: str = "echolas_") -> str:
+        """Prometheus text exposition format."""
+        lines: List[str] = []
+        typed = set()
+
+        def header(name: str, kind: str) -> None:
+            if name not in typed:
+                typed.add(name)
+                base = name[len(prefix):]
+                if base in self._help:
+                    lines.append(f"# HELP {name} {self._help[base]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                full = prefix + name
+                header(full, "counter")
+                lines.append(f"{full}{_format_labels(labels)} {_format_value(value)}")
+            for (name, labels), h in sorted(self._histograms.items()):
+                full = prefix + name
+                header(full, "histogram")
+                cumulative = 0
+                for bound, n in zip(h.buckets + (float("inf"),), h.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{full}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{full}_sum{_format_labels(labels)} {_format_value(h.total)}")
+                lines.append(f"{full}_count{_format_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "echolas_") -> None:
+        """Atomically replaces path, e.g. a node_exporter textfile-collector .prom file."""
+        _write_atomic(path, self.to_prometheus(prefix))
+
+    def write_json(self, path: str) -> None:
+        _write_atomic(path, json.dumps(self.snapshot(), indent=2))
+
+    def write(self, path: str) -> None:
+        """Prometheus text for a .prom path, a JSON snapshot otherwise."""
+        if path.endswith(".prom"):
+            self.write_prometheus(path)
+        else:
+            self.write_json(path)
+
+    def export_every(self, path: str, interval: float = 15.0) -> threading.Thread:
+        """Enables the registry and rewrites path every interval seconds and once more at exit."""
+        self.enable()
+        atexit.register(self.write, path)
+
+        def loop() -> None:
+            while True:
+                time.sleep(interval)
+                try:
+                    self.write(path)
+                except OSError:
+                    logging.exception("Error-metrics-export: %s", path)
+
+        thread = threading.Thread(target=loop, name="metrics-export", daemon=True)
+        thread.start()
+        return thread
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')) for k, v in labels
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _write_atomic(path: str, text: str) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# Process-wide registry used by the instrumented modules. ECHOLAS_METRICS=1
+# enables it; a .prom or .json path also exports it there periodically.
+_ENV = os.environ.get("ECHOLAS_METRICS", "")
+METRICS = Registry(enabled=_ENV not in ("", "0"))
+if _ENV.endswith((".prom", ".json")):
+    METRICS.export_every(_ENV)
+
+instrument = METRICS.instrument
+timer = METRICS.timer
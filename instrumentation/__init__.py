@@ -0,0 +1,4 @@
+from instrumentation.Metrics import METRICS, Histogram, Registry, instrument, timer
+from instrumentation.Profiler import SamplingProfiler
+
+__all__ = ["METRICS", "Histogram", "Registry", "instrument", "timer", "SamplingProfiler"]
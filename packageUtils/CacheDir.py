@@ -0,0 +1,15 @@
+import os
+
+
+def cache_dir() -> str:
+    """$ECHOLAS_CACHE_DIR, else $XDG_CACHE_HOME/echolas or ~/.cache/echolas, created on demand."""
+    directory = os.environ.get("ECHOLAS_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "echolas"
+    )
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def cache_file(name: str) -> str:
+    """Path of a cache file in cache_dir()."""
+    return os.path.join(cache_dir(), name)
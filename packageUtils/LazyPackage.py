@@ -0,0 +1,39 @@
+import sys
+from importlib import import_module
+from types import ModuleType
+from typing import Dict
+
+
+class _LazyPackage(ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a submodule binds it on the package; keep the class of the same name instead.
+        lazy = self.__dict__.get("_LAZY", {})
+        if isinstance(value, ModuleType) and lazy.get(name) == value.__name__.rpartition(".")[2]:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+def lazy_package(name: str, lazy: Dict[str, str]) -> None:
+    """
+    Makes package `name` import its submodules on first attribute access
+    (PEP 562), so importing the package stays cheap until one of its classes
+    is actually used. lazy maps each exported name to the submodule that
+    defines it; call this at the end of the package's __init__.
+    """
+    package = sys.modules[name]
+
+    def __getattr__(attr):
+        module = lazy.get(attr)
+        if module is None:
+            raise AttributeError(f"module {name!r} has no attribute {attr!r}")
+        value = getattr(import_module(f".{module}", name), attr)
+        package.__dict__[attr] = value
+        return value
+
+    def __dir__():
+        return sorted(set(package.__dict__) | set(lazy))
+
+    package._LAZY = lazy
+    package.__getattr__ = __getattr__
+    package.__dir__ = __dir__
+    package.__class__ = _LazyPackage
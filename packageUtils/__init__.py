@@ -0,0 +1 @@
+"""Helpers shared by the top-level packages' __init__ modules."""
@@ -0,0 +1,54 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+# dataRetreival modules import each other flat, as when run from that directory.
+DATA_RETRIEVAL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dataRetreival")
+if DATA_RETRIEVAL not in sys.path:
+    sys.path.append(DATA_RETRIEVAL)
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    """
+    Starts local HTTP servers for the test. Call it with
+    handler(path, query) -> (status, content_type, body); it returns the
+    server's base url. Every request is recorded as (path, query) in
+    the returned function's requests list.
+    """
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    servers = []
+
+    def start(handler):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = dict(parse_qsl(parts.query))
+                with lock:
+                    start.requests.append((parts.path, query))
+                status, content_type, body = handler(parts.path, query)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    lock = threading.Lock()
+    start.requests = []
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
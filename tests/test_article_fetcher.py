@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+from ArticleFetcher import ArticleFetcher
+
+PARAGRAPHS = [
+    "The city council approved the new transit plan on Tuesday after a long public hearing that ran late into the night.",
+    "Supporters said the plan would cut commute times for tens of thousands of residents living on the east side.",
+    "Opponents argued that the projected costs were underestimated and that construction would disrupt local businesses.",
+    "The first phase of the project is expected to begin next spring, pending a final review by the state transport agency.",
+]
+
+ARTICLE = (
+    "<html><head><title>Council approves transit plan</title></head><body>"
+    "<nav><a href='/'>Home</a> <a href='/news'>News</a></nav>"
+    "<article><h1>Council approves transit plan</h1>"
+    + "".join(f"<p>{p}</p>" for p in PARAGRAPHS)
+    + "</article><footer>Copyright Example News</footer></body></html>"
+)
+
+
+@pytest.fixture
+def site(stub_server):
+    failures = {"/flaky": 1}
+    lock = threading.Lock()
+
+    def handler(path, query):
+        with lock:
+            if failures.get(path, 0) > 0:
+                failures[path] -= 1
+                return 503, "text/plain", "busy"
+        if path in ("/story", "/flaky"):
+            return 200, "text/html", ARTICLE
+        return 404, "text/plain", "not found"
+
+    base = stub_server(handler)
+    return base, stub_server.requests
+
+
+def test_iter_texts_against_stub_server(site):
+    base, requests = site
+    urls = [f"{base}/story", f"{base}/flaky", f"{base}/missing", f"{base}/story"]
+    with ArticleFetcher(max_workers=4, retries=2, backoff=0.01, extract_workers=1) as fetcher:
+        results = list(fetcher.iter_texts(urls))
+
+    texts = dict(results)
+    paths = [path for path, _ in requests]
+    # Duplicate urls are downloaded and yielded once.
+    assert len(results) == 3
+    assert paths.count("/story") == 1
+    for path in ("/story", "/flaky"):
+        text = texts[f"{base}{path}"]
+        assert PARAGRAPHS[0] in text and PARAGRAPHS[-1] in text
+        assert "Copyright Example News" not in text
+    # A 503 is retried, a 404 is not.
+    assert paths.count("/flaky") == 2
+    assert texts[f"{base}/missing"] is None
+    assert paths.count("/missing") == 1
+
+
+def test_fetch_gives_up_after_retries(stub_server):
+    base = stub_server(lambda path, query: (503, "text/plain", "busy"))
+    with ArticleFetcher(max_workers=1, retries=2, backoff=0.01, extract_workers=1) as fetcher:
+        assert fetcher.fetch(f"{base}/story") is None
+    assert len(stub_server.requests) == 3
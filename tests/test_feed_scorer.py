@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from userModeling.ArticleStanceMatrix import ArticleStanceMatrix
+from userModeling.FeedScorer import FeedScorer
+from userModeling.UserVector import UserVector
+
+# Few discrete stance values, so many articles sit at exactly the same distance.
+STANCES = [-1.0, -0.5, 0.0, 0.5, 1.0]
+
+
+def _corpus(seed: int):
+    rng = random.Random(seed)
+    entities = [f"E{i}" for i in range(6)]
+    articles = {
+        f"a{i}": {e: rng.choice(STANCES) for e in rng.sample(entities, rng.randint(1, 3))}
+        for i in range(120)
+    }
+    users = []
+    for j in range(20):
+        user = UserVector(f"u{j}")
+        for e in rng.sample(entities, rng.randint(1, 4)):
+            user.set_stance(e, rng.choice(STANCES))
+        users.append(user)
+    return articles, users
+
+
+@pytest.mark.parametrize("dense", [False, True])
+@pytest.mark.parametrize("k", [1, 5, 17])
+def test_tied_scores_match_top_k_order(dense, k):
+    articles, users = _corpus(seed=k)
+    matrix = ArticleStanceMatrix.from_articles(articles, dense=dense)
+    # Small blocks exercise both the filling and the full merge paths.
+    scored = FeedScorer(matrix, user_block=7, article_block=13, max_workers=2).score(users, k)
+    for user in users:
+        expected = user.top_k(articles, k)
+        for side in ("closest", "farthest"):
+            assert [a for a, _ in scored[user.user_id][side]] == [a for a, _ in expected[side]]
+            assert [d for _, d in scored[user.user_id][side]] == pytest.approx([d for _, d in expected[side]])
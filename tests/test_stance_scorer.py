@@ -0,0 +1,44 @@
+import numpy as np
+
+from SentimentAnalysis.StanceScorer import LABELS, StanceCache, StanceScorer, format_prompt
+
+
+class _FakeModel:
+    """Records its inputs and answers "For" for every prompt."""
+
+    labels = list(LABELS)
+
+    def __init__(self) -> None:
+        self.prompts = []
+
+    def predict_proba(self, prompts, batch_size=None, as_numpy=True):
+        self.prompts.extend(prompts)
+        return np.tile([0.1, 0.2, 0.7], (len(prompts), 1))
+
+
+def test_prompt_matches_training_template():
+    # Template of the models/setfit_stance_v1 training set in stance_detection.ipynb.
+    assert format_prompt("Unions", "Unions ensure workers get a fair slice of the profits.") == (
+        "Text: Unions ensure workers get a fair slice of the profits. \n"
+        " Question: Is this text expressing support for Unions?"
+    )
+
+
+def test_scorer_feeds_training_template_to_model():
+    model = _FakeModel()
+    scorer = StanceScorer(model=model)
+    scorer.score_pairs([("Tariffs", "Tariffs protect local jobs.")])
+    assert model.prompts == [format_prompt("Tariffs", "Tariffs protect local jobs.")]
+
+
+def test_cache_is_not_shared_across_backends(tmp_path):
+    path = str(tmp_path / "stance_cache.sqlite")
+    pair = [("Tariffs", "Tariffs protect local jobs.")]
+    torch_model, int8_model = _FakeModel(), _FakeModel()
+    StanceScorer(model=torch_model, backend="torch", cache=StanceCache(path=path)).score_pairs(pair)
+    StanceScorer(model=int8_model, backend="int8", cache=StanceCache(path=path)).score_pairs(pair)
+    assert len(torch_model.prompts) == len(int8_model.prompts) == 1
+
+    again = _FakeModel()
+    StanceScorer(model=again, backend="torch", cache=StanceCache(path=path)).score_pairs(pair)
+    assert again.prompts == []
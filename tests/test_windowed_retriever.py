@@ -0,0 +1,81 @@
+import json
+import threading
+from datetime import datetime, timedelta
+
+from WindowedRetriever import WindowedRetriever
+
+START = datetime(2026, 1, 1)
+END = START + timedelta(hours=12)
+TIME_FORMAT = "%Y%m%d%H%M%S"
+
+
+def _article(url, minutes, language="English"):
+    return {"url": url, "seendate": START + timedelta(minutes=minutes), "language": language}
+
+
+# 0h-4h: nine articles spread out, so the 4h window saturates and settles after halving.
+# 5:00-5:15: a burst that is still saturated at the 15 minute minimum window.
+# 8h-12h: the first request is throttled; one Spanish article; a copy of a url seen earlier.
+CORPUS = (
+    [_article(f"https://spread.example/{i}", 10 + 30 * i) for i in range(8)]
+    + [_article("https://wire.example/shared", 80)]
+    + [_article(f"https://burst.example/{i}", 301 + i) for i in range(6)]
+    + [_article("https://late.example/1", 510), _article("https://late.example/2", 660)]
+    + [_article("https://es.example/1", 540, language="Spanish")]
+    + [_article("https://wire.example/shared", 570)]
+)
+
+
+def _gdelt(throttle_window):
+    throttled = set()
+    lock = threading.Lock()
+
+    def handler(path, query):
+        start = datetime.strptime(query["startdatetime"], TIME_FORMAT)
+        end = datetime.strptime(query["enddatetime"], TIME_FORMAT)
+        with lock:
+            if (start, end) == throttle_window and (start, end) not in throttled:
+                throttled.add((start, end))
+                return 429, "text/plain", "slow down"
+        articles = [
+            dict(a, seendate=a["seendate"].strftime("%Y%m%dT%H%M%SZ"))
+            for a in CORPUS
+            if start <= a["seendate"] < end
+        ][: int(query["maxrecords"])]
+        # GDELT answers an empty window with an empty object.
+        return 200, "application/json", json.dumps({"articles": articles} if articles else {})
+
+    return handler
+
+
+def test_iter_batches_against_stub_gdelt(stub_server):
+    late = (START + timedelta(hours=8), END)
+    base = stub_server(_gdelt(throttle_window=late))
+    retriever = WindowedRetriever(
+        base_url=base,
+        maxrecords=5,
+        initial_window=timedelta(hours=4),
+        min_window=timedelta(minutes=15),
+        backoff=0.01,
+    )
+    batches = list(retriever.iter_batches({"query": "transit"}, START, END))
+    urls = [a["url"] for batch in batches for a in batch]
+
+    # Deduplicated across windows, Spanish filtered out.
+    assert len(urls) == len(set(urls))
+    assert urls.count("https://wire.example/shared") == 1
+    assert "https://es.example/1" not in urls
+    # Saturated windows were split until every spread article came back.
+    assert {f"https://spread.example/{i}" for i in range(8)} <= set(urls)
+    assert {"https://late.example/1", "https://late.example/2"} <= set(urls)
+    # The burst stays saturated down to min_window and is returned truncated.
+    assert sum(url.startswith("https://burst.example/") for url in urls) == 5
+
+    windows = [
+        (datetime.strptime(q["startdatetime"], TIME_FORMAT), datetime.strptime(q["enddatetime"], TIME_FORMAT))
+        for _, q in stub_server.requests
+    ]
+    assert min(end - start for start, end in windows) == retriever.min_window
+    assert (START + timedelta(hours=5), START + timedelta(hours=5, minutes=15)) in windows
+    # The throttled window was retried once.
+    assert windows.count(late) == 2
@@ -0,0 +1,85 @@
+from collections import deque
+from typing import Callable, Deque, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from timeSeries.RollingStats import Span, span_micros, to_micros
+
+
+def burst_window_bounds(
+    timestamps: Sequence[int],
+    values: Sequence[float],
+    threshold: float,
+    window: Span,
+    min_bursts: int = 2,
+    merge: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds burst windows in O(n) over time-sorted arrays (epoch microseconds).
+    Returns (bursts, starts, ends): bursts holds the positions of the points
+    above threshold; each window is bursts[starts[k]:ends[k]].
+
+    Without merge, there is one window per burst that opens at least
+    min_bursts bursts within `window` of it, as repetitive_burst_windows
+    always returned. With merge, overlapping windows are joined into maximal ones.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    bursts = np.flatnonzero(np.asarray(values, dtype=np.float64) > threshold)
+    times = timestamps[bursts]
+    # Two pointers, vectorized: each window runs to the last burst within reach.
+    ends = np.searchsorted(times, times + span_micros(window), side="right")
+    starts = np.arange(bursts.size)
+    keep = ends - starts >= max(min_bursts, 1)
+    starts, ends = starts[keep], ends[keep]
+    if merge and starts.size:
+        reach = np.maximum.accumulate(ends)
+        opens = np.empty(starts.size, dtype=bool)
+        opens[0] = True
+        opens[1:] = starts[1:] >= reach[:-1]
+        closes = np.append(np.flatnonzero(opens)[1:] - 1, starts.size - 1)
+        starts, ends = starts[opens], reach[closes]
+    return bursts, starts, ends
+
+
+class BurstWindowDetector:
+    """
+    Streaming burst windows. Feed points in time order with add(); once
+    min_bursts bursts fall within `window` a window is emitted immediately
+    (returned and passed to callback). Further bursts in the same run extend
+    `active` without re-emitting; the detector re-arms when a burst arrives
+    with fewer than min_bursts bursts in its trailing window.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        window: Span,
+        min_bursts: int = 2,
+        callback: Optional[Callable[[List], None]] = None,
+    ) -> None:
+        self.threshold = threshold
+        self.window = span_micros(window)
+        self.min_bursts = min_bursts
+        self.callback = callback
+        self.active: Optional[List] = None
+        self._recent: Deque[Tuple[int, object]] = deque()
+
+    def add(self, point) -> Optional[List]:
+        if point.value <= self.threshold:
+            return None
+        ts = to_micros(point.timestamp)
+        recent = self._recent
+        recent.append((ts, point))
+        while ts - recent[0][0] > self.window:
+            recent.popleft()
+        if len(recent) < self.min_bursts:
+            self.active = None
+            return None
+        if self.active is not None:
+            self.active.append(point)
+            return None
+        self.active = [p for _, p in recent]
+        window = list(self.active)
+        if self.callback is not None:
+            self.callback(window)
+        return window
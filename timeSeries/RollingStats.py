@@ -0,0 +1,189 @@
+import math
+import re
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+Span = Union[timedelta, int, float, str]
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_SPAN_UNITS = {"s": "seconds", "min": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def to_micros(ts: datetime) -> int:
+    """Epoch microseconds; naive datetimes are read as UTC."""
+    return (ts - (_EPOCH if ts.tzinfo is None else _EPOCH_UTC)) // _MICROSECOND
+
+
+def from_micros(us: int, tz=None) -> datetime:
+    """Inverse of to_micros; naive unless tz is given."""
+    if tz is None:
+        return _EPOCH + timedelta(microseconds=int(us))
+    return (_EPOCH_UTC + timedelta(microseconds=int(us))).astimezone(tz)
+
+
+def span_micros(span: Span) -> int:
+    """Accepts a timedelta, seconds, or a string such as '90s', '15min', '6h', '7d', '2w'."""
+    if isinstance(span, str):
+        match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*(s|min|h|d|w)\s*", span.lower())
+        if match is None:
+            raise ValueError(f"Unsupported span: {span}")
+        span = timedelta(**{_SPAN_UNITS[match.group(2)]: float(match.group(1))})
+    elif not isinstance(span, timedelta):
+        span = timedelta(seconds=float(span))
+    return span // _MICROSECOND
+
+
+class RollingStats:
+    """
+    Rolling statistics over a time-ordered series held as NumPy arrays
+    (int64 epoch microseconds, float64 values). Windows are either the last
+    `window` points or every point within `span` of the current one (inclusive).
+    All statistics run in O(n) and return arrays aligned with timestamps.
+    """
+
+    def __init__(self, timestamps: Sequence[int], values: Sequence[float], assume_sorted: bool = False) -> None:
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        if timestamps.shape != values.shape:
+            raise ValueError("timestamps and values must have the same length.")
+        self.order: Optional[np.ndarray] = None
+        if not assume_sorted and timestamps.size > 1 and np.any(timestamps[1:] < timestamps[:-1]):
+            self.order = np.argsort(timestamps, kind="stable")
+            timestamps = timestamps[self.order]
+            values = values[self.order]
+        self.timestamps = timestamps
+        self.values = values
+
+    @classmethod
+    def from_points(cls, points: Iterable) -> "RollingStats":
+        """Builds from TimePoint-like objects; self.order maps back to input order."""
+        points = list(points)
+        return cls([to_micros(p.timestamp) for p in points], [p.value for p in points])
+
+    def __len__(self) -> int:
+        return int(self.values.size)
+
+    def starts(self, window: Optional[int] = None, span: Optional[Span] = None) -> np.ndarray:
+        """Index of the first point in each point's window."""
+        if (window is None) == (span is None):
+            raise ValueError("Pass exactly one of window or span.")
+        if window is not None:
+            if window <= 0:
+                raise ValueError("window must be positive.")
+            return np.maximum(np.arange(len(self)) - (window - 1), 0)
+        return np.searchsorted(self.timestamps, self.timestamps - span_micros(span), side="left")
+
+    def counts(self, window: Optional[int] = None, span: Optional[Span] = None) -> np.ndarray:
+        return np.arange(1, len(self) + 1) - self.starts(window, span)
+
+    def mean(self, window: Optional[int] = None, span: Optional[Span] = None) -> np.ndarray:
+        starts = self.starts(window, span)
+        shift = self._shift()
+        sums = _window_sums(self.values - shift, starts)
+        return sums / (np.arange(1, len(self) + 1) - starts) + shift
+
+    def std(self, window: Optional[int] = None, span: Optional[Span] = None, ddof: int = 0) -> np.ndarray:
+        """Rolling standard deviation; NaN where a window has <= ddof points."""
+        starts = self.starts(window, span)
+        # Centring first keeps the prefix-sum variance numerically stable.
+        centred = self.values - self._shift()
+        n = (np.arange(1, len(self) + 1) - starts).astype(np.float64)
+        sums = _window_sums(centred, starts)
+        squares = _window_sums(centred * centred, starts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = (squares - sums * sums / n) / (n - ddof)
+        var[n <= ddof] = np.nan
+        return np.sqrt(np.maximum(var, 0.0))
+
+    def min(self, window: Optional[int] = None, span: Optional[Span] = None) -> np.ndarray:
+        return self._extreme(np.minimum, window, span)
+
+    def max(self, window: Optional[int] = None, span: Optional[Span] = None) -> np.ndarray:
+        return self._extreme(np.maximum, window, span)
+
+    def ewma(self, alpha: Optional[float] = None, halflife: Optional[Span] = None) -> np.ndarray:
+        """
+        Exponentially weighted mean. alpha weights per point; halflife decays by
+        elapsed time instead, which suits irregularly spaced articles.
+        """
+        if (alpha is None) == (halflife is None):
+            raise ValueError("Pass exactly one of alpha or halflife.")
+        values = self.values.tolist()
+        out = np.empty(len(values))
+        if not values:
+            return out
+        if alpha is not None:
+            keep = [1.0 - alpha] * len(values)
+        else:
+            rate = math.log(2.0) / span_micros(halflife)
+            keep = np.exp(-rate * np.diff(self.timestamps, prepend=self.timestamps[0])).tolist()
+        level = values[0]
+        for i, (x, k) in enumerate(zip(values, keep)):
+            level = k * level + (1.0 - k) * x
+            out[i] = level
+        return out
+
+    def drift(self) -> np.ndarray:
+        """Absolute change between consecutive values (length n - 1)."""
+        return np.abs(np.diff(self.values))
+
+    def _shift(self) -> float:
+        return float(self.values[0]) if len(self) else 0.0
+
+    def _extreme(self, op, window: Optional[int], span: Optional[Span]) -> np.ndarray:
+        if window is not None and span is None:
+            if window <= 0:
+                raise ValueError("window must be positive.")
+            return _block_extreme(self.values, window, op)
+        return _deque_extreme(self.values, self.starts(window, span), op is np.minimum)
+
+
+def _window_sums(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    prefix = np.concatenate(([0.0], np.cumsum(values)))
+    return prefix[1:] - prefix[starts]
+
+
+def _block_extreme(values: np.ndarray, window: int, op) -> np.ndarray:
+    """
+    Van Herk / Gil-Werman: running extremes from the left and right within
+    blocks of `window`; every full window spans at most two blocks.
+    """
+    n = values.size
+    if n == 0:
+        return values.copy()
+    fill = np.inf if op is np.minimum else -np.inf
+    blocks = -(-n // window)
+    padded = np.full(blocks * window, fill)
+    padded[:n] = values
+    grid = padded.reshape(blocks, window)
+    left = op.accumulate(grid, axis=1).ravel()
+    right = op.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+    out = op.accumulate(values)  # windows truncated at the start of the series
+    if n >= window:
+        ends = np.arange(window - 1, n)
+        out[window - 1 :] = op(right[ends - window + 1], left[ends])
+    return out
+
+
+def _deque_extreme(values: np.ndarray, starts: np.ndarray, is_min: bool) -> np.ndarray:
+    """Monotonic deque for variable-width windows with non-decreasing starts."""
+    vals = values.tolist()
+    out = np.empty(len(vals))
+    candidates: deque = deque()
+    for i, (x, start) in enumerate(zip(vals, starts.tolist())):
+        if is_min:
+            while candidates and vals[candidates[-1]] >= x:
+                candidates.pop()
+        else:
+            while candidates and vals[candidates[-1]] <= x:
+                candidates.pop()
+        candidates.append(i)
+        while candidates[0] < start:
+            candidates.popleft()
+        out[i] = vals[candidates[0]]
+    return out
@@ -0,0 +1,208 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from timeSeries.RollingStats import Span, span_micros, to_micros
+
+_MINUTE = 60 * 1_000_000
+# Bucket width and phase in epoch microseconds. 1970-01-01 was a Thursday, so
+# week buckets are shifted by four days to start on Mondays.
+RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    "minute": (_MINUTE, 0),
+    "hour": (60 * _MINUTE, 0),
+    "day": (24 * 60 * _MINUTE, 0),
+    "week": (7 * 24 * 60 * _MINUTE, 4 * 24 * 60 * _MINUTE),
+}
+
+Key = Tuple[str, str]
+
+
+@dataclass
+class RollupSeries:
+    """Columnar rollup buckets; starts are epoch microseconds."""
+
+    resolution: str
+    starts: np.ndarray
+    count: np.ndarray
+    total: np.ndarray
+    total_sq: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.starts.size)
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.total / self.count
+
+    @property
+    def std(self) -> np.ndarray:
+        mean = self.mean
+        return np.sqrt(np.maximum(self.total_sq / self.count - mean * mean, 0.0))
+
+
+class _Buckets:
+    """Sorted bucket columns for one key at one resolution."""
+
+    _COLUMNS = ("keys", "count", "total", "total_sq", "low", "high")
+
+    def __init__(self) -> None:
+        self.size = 0
+        self.keys = np.empty(0, dtype=np.int64)
+        self.count = np.empty(0, dtype=np.int64)
+        self.total = np.empty(0)
+        self.total_sq = np.empty(0)
+        self.low = np.empty(0)
+        self.high = np.empty(0)
+
+    def add_many(self, buckets: np.ndarray, values: np.ndarray) -> None:
+        keys, inverse = np.unique(buckets, return_inverse=True)
+        count = np.bincount(inverse, minlength=keys.size)
+        total = np.bincount(inverse, weights=values, minlength=keys.size)
+        total_sq = np.bincount(inverse, weights=values * values, minlength=keys.size)
+        low = np.full(keys.size, np.inf)
+        high = np.full(keys.size, -np.inf)
+        np.minimum.at(low, inverse, values)
+        np.maximum.at(high, inverse, values)
+
+        n = self.size
+        at = np.searchsorted(self.keys[:n], keys)
+        found = at < n
+        found[found] = self.keys[:n][at[found]] == keys[found]
+        hit = at[found]
+        self.count[hit] += count[found]
+        self.total[hit] += total[found]
+        self.total_sq[hit] += total_sq[found]
+        self.low[hit] = np.minimum(self.low[hit], low[found])
+        self.high[hit] = np.maximum(self.high[hit], high[found])
+        new = ~found
+        if not new.any():
+            return
+        fresh = (keys[new], count[new], total[new], total_sq[new], low[new], high[new])
+        for name, values_new in zip(self._COLUMNS, fresh):
+            setattr(self, name, np.insert(getattr(self, name)[:n], at[new], values_new))
+        self.size = n + int(new.sum())
+
+    def select(self, lo: int, hi: int) -> Tuple[np.ndarray, ...]:
+        keys = self.keys[: self.size]
+        a, b = np.searchsorted(keys, lo, side="left"), np.searchsorted(keys, hi, side="right")
+        return tuple(getattr(self, name)[a:b].copy() for name in self._COLUMNS)
+
+
+class RollupStore:
+    """
+    Pre-aggregated count / sum / sum-of-squares / min / max per source and per
+    event at minute, hour, day and week resolution, updated as points arrive.
+    Queries read the coarsest resolution that still meets the requested step,
+    so long ranges touch hundreds of buckets instead of every point.
+
+    Single points are buffered per key and folded in with one vectorized
+    update per flush_size points, or before that key is next queried.
+    """
+
+    def __init__(self, resolutions: Iterable[str] = tuple(RESOLUTIONS), flush_size: int = 4096) -> None:
+        self.resolutions = sorted(resolutions, key=lambda r: RESOLUTIONS[r][0])
+        self.flush_size = flush_size
+        self._rollups: Dict[Key, Dict[str, _Buckets]] = {}
+        self._pending: Dict[Key, Tuple[List[int], List[float]]] = {}
+
+    def keys(self) -> List[Key]:
+        return list(self._rollups.keys() | self._pending.keys())
+
+    def add(self, source: str, event_id: str, timestamp: datetime, value: float) -> None:
+        ts = to_micros(timestamp)
+        for key in (("source", source), ("event", event_id)):
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = ([], [])
+            pending[0].append(ts)
+            pending[1].append(value)
+            if len(pending[0]) >= self.flush_size:
+                self._flush(key)
+
+    def add_point(self, point) -> None:
+        self.add(point.source, point.event_id, point.timestamp, point.value)
+
+    def add_series(self, series) -> None:
+        """Bulk-loads a SourceTimeSeries (or any iterable of TimePoints)."""
+        if hasattr(series, "timestamps"):
+            timestamps = series.timestamps
+            values = series.values.astype(np.float64)
+            names = series.interner.names
+            events = np.array([names[i] for i in series.event_codes.tolist()], dtype=object)
+            sources = np.full(len(series), series.source, dtype=object)
+        else:
+            points = list(series)
+            timestamps = np.array([to_micros(p.timestamp) for p in points], dtype=np.int64)
+            values = np.array([p.value for p in points], dtype=np.float64)
+            events = np.array([p.event_id for p in points], dtype=object)
+            sources = np.array([p.source for p in points], dtype=object)
+        for kind, labels in (("source", sources), ("event", events)):
+            if not labels.size:
+                continue
+            names, groups = np.unique(labels, return_inverse=True)
+            order = np.argsort(groups, kind="stable")
+            bounds = np.searchsorted(groups[order], np.arange(names.size + 1))
+            for g, name in enumerate(names.tolist()):
+                rows = order[bounds[g] : bounds[g + 1]]
+                self._apply((kind, name), timestamps[rows], values[rows])
+
+    def query(
+        self,
+        kind: str,
+        name: str,
+        since: datetime,
+        until: datetime,
+        step: Optional[Span] = None,
+        min_buckets: int = 60,
+    ) -> RollupSeries:
+        """
+        Buckets of ("source" | "event", name) that start between since and until.
+        Uses the coarsest resolution no wider than step; without a step, the
+        coarsest one that still gives min_buckets buckets over the range.
+        Edge buckets may include points just outside the range.
+        """
+        lo, hi = to_micros(since), to_micros(until)
+        resolution = self.pick_resolution(hi - lo, step, min_buckets)
+        width, phase = RESOLUTIONS[resolution]
+        self._flush((kind, name))
+        levels = self._rollups.get((kind, name))
+        if levels is None:
+            empty = np.empty(0)
+            return RollupSeries(resolution, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), empty, empty, empty, empty)
+        keys, count, total, total_sq, low, high = levels[resolution].select((lo - phase) // width, (hi - phase) // width)
+        return RollupSeries(resolution, keys * width + phase, count, total, total_sq, low, high)
+
+    def query_source(self, source: str, since: datetime, until: datetime, **kwargs) -> RollupSeries:
+        return self.query("source", source, since, until, **kwargs)
+
+    def query_event(self, event_id: str, since: datetime, until: datetime, **kwargs) -> RollupSeries:
+        return self.query("event", event_id, since, until, **kwargs)
+
+    def pick_resolution(self, span_us: int, step: Optional[Span] = None, min_buckets: int = 60) -> str:
+        limit = span_micros(step) if step is not None else span_us / max(min_buckets, 1)
+        chosen = self.resolutions[0]
+        for name in self.resolutions:
+            if RESOLUTIONS[name][0] <= limit:
+                chosen = name
+        return chosen
+
+    def flush(self) -> None:
+        for key in list(self._pending):
+            self._flush(key)
+
+    def _flush(self, key: Key) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            self._apply(key, np.array(pending[0], dtype=np.int64), np.array(pending[1], dtype=np.float64))
+
+    def _apply(self, key: Key, timestamps: np.ndarray, values: np.ndarray) -> None:
+        levels = self._rollups.get(key)
+        if levels is None:
+            levels = self._rollups[key] = {name: _Buckets() for name in self.resolutions}
+        for name in self.resolutions:
+            width, phase = RESOLUTIONS[name]
+            levels[name].add_many((timestamps - phase) // width, values)
@@ -1,9 +1,16 @@
-from dataclasses import dataclass, field
+from collections.abc import Sequence
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, Iterable, List, Optional, Union
 
+import numpy as np
+
 from biasAnalysis.BiasAnalyzer import BiasAnalyzer
 from eventMapping.EventArticleIndex import EventArticleIndex, ArticleRecord
+from instrumentation.Metrics import instrument
+from timeSeries.BurstWindows import burst_window_bounds
+from timeSeries.RollingStats import RollingStats, from_micros, to_micros
+from timeSeries.RollupStore import RollupStore
 
 
 @dataclass
@@ -15,13 +22,165 @@ class TimePoint:
     article_id: str
 
 
-@dataclass
+class Interner:
+    """
+    Maps strings to dense integer ids and back. Not locked: share one only
+    between series used from the same thread.
+    """
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: str) -> int:
+        idx = self.ids.get(name)
+        if idx is None:
+            idx = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return idx
+
+
 class SourceTimeSeries:
-    source: str
-    points: List[TimePoint] = field(default_factory=list)
+    """
+    One source's points as parallel arrays, kept sorted by time: int64 epoch
+    microseconds, float32 values and interned event / article ids. append() is
+    O(1) for in-order points and a bisect insert otherwise; extend() sorts a
+    bulk load once. TimePoint objects are only built when read.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        points: Optional[Iterable[TimePoint]] = None,
+        interner: Optional[Interner] = None,
+    ) -> None:
+        self.source = source
+        self.interner = interner if interner is not None else Interner()
+        self.tz = None
+        self._size = 0
+        self._timestamps = np.empty(16, dtype=np.int64)
+        self._values = np.empty(16, dtype=np.float32)
+        self._events = np.empty(16, dtype=np.int32)
+        self._articles = np.empty(16, dtype=np.int32)
+        if points is not None:
+            self.extend(points)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"SourceTimeSeries(source={self.source!r}, points={self._size})"
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[: self._size]
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values[: self._size]
+
+    @property
+    def event_codes(self) -> np.ndarray:
+        """Interned event ids; interner.names maps them back."""
+        return self._events[: self._size]
+
+    @property
+    def points(self) -> "_PointsView":
+        return _PointsView(self)
 
     def sorted_points(self) -> List[TimePoint]:
-        return sorted(self.points, key=lambda p: p.timestamp)
+        return list(self.points)
+
+    def point(self, i: int) -> TimePoint:
+        names = self.interner.names
+        return TimePoint(
+            timestamp=from_micros(self._timestamps[i], self.tz),
+            value=float(self._values[i]),
+            source=self.source,
+            event_id=names[self._events[i]],
+            article_id=names[self._articles[i]],
+        )
+
+    def rolling(self) -> RollingStats:
+        return RollingStats(self.timestamps, self.values, assume_sorted=True)
+
+    def append(self, point: TimePoint) -> None:
+        ts = self._encode_time(point.timestamp)
+        self._reserve(self._size + 1)
+        n = self._size
+        if n and ts < self._timestamps[n - 1]:
+            # Stays stable for equal timestamps, like sorting by timestamp did.
+            at = int(np.searchsorted(self._timestamps[:n], ts, side="right"))
+            for column in (self._timestamps, self._values, self._events, self._articles):
+                column[at + 1 : n + 1] = column[at:n]
+        else:
+            at = n
+        self._timestamps[at] = ts
+        self._values[at] = point.value
+        self._events[at] = self.interner.intern(point.event_id)
+        self._articles[at] = self.interner.intern(point.article_id)
+        self._size = n + 1
+
+    def extend(self, points: Iterable[TimePoint]) -> None:
+        points = list(points)
+        if not points:
+            return
+        n, m = self._size, len(points)
+        self._reserve(n + m)
+        intern = self.interner.intern
+        self._timestamps[n : n + m] = [self._encode_time(p.timestamp) for p in points]
+        self._values[n : n + m] = [p.value for p in points]
+        self._events[n : n + m] = [intern(p.event_id) for p in points]
+        self._articles[n : n + m] = [intern(p.article_id) for p in points]
+        self._size = n + m
+        ts = self._timestamps[: n + m]
+        if np.any(ts[max(n, 1) :] < ts[max(n, 1) - 1 : -1]):
+            order = np.argsort(ts, kind="stable")
+            for column in (self._timestamps, self._values, self._events, self._articles):
+                column[: n + m] = column[: n + m][order]
+
+    def _encode_time(self, timestamp: datetime) -> int:
+        if self._size == 0:
+            self.tz = timestamp.tzinfo
+        return to_micros(timestamp)
+
+    def _reserve(self, size: int) -> None:
+        capacity = self._timestamps.size
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        self._timestamps = np.resize(self._timestamps, capacity)
+        self._values = np.resize(self._values, capacity)
+        self._events = np.resize(self._events, capacity)
+        self._articles = np.resize(self._articles, capacity)
+
+
+class _PointsView(Sequence):
+    """Read-only TimePoint view over a SourceTimeSeries; append() inserts in order."""
+
+    def __init__(self, series: SourceTimeSeries) -> None:
+        self._series = series
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._series.point(j) for j in range(*i.indices(len(self._series)))]
+        if i < 0:
+            i += len(self._series)
+        if not 0 <= i < len(self._series):
+            raise IndexError(i)
+        return self._series.point(i)
+
+    def append(self, point: TimePoint) -> None:
+        self._series.append(point)
+
+    def extend(self, points: Iterable[TimePoint]) -> None:
+        self._series.extend(points)
 
 
 class TemporalAnalyzer:
@@ -29,12 +188,19 @@ class TemporalAnalyzer:
     Builds time series for source/article deviation and derives drift/burst signals.
     """
 
+    @instrument()
     def build_source_series(
         self,
         index: EventArticleIndex,
         bias: BiasAnalyzer,
+        interner: Optional[Interner] = None,
     ) -> Dict[str, SourceTimeSeries]:
-        series: Dict[str, SourceTimeSeries] = {}
+        """
+        The returned series share one Interner (a new one unless given), so
+        each event / article id is stored once per set and freed with it.
+        """
+        interner = interner if interner is not None else Interner()
+        collected: Dict[str, List[TimePoint]] = {}
         for event_id, article_ids in index.event_articles.items():
             centroid = bias.compute_event_centroid(index, event_id)
             if centroid is None:
@@ -56,53 +222,68 @@ class TemporalAnalyzer:
                     event_id=event_id,
                     article_id=article_id,
                 )
-                series.setdefault(article.source, SourceTimeSeries(article.source))
-                series[article.source].points.append(point)
-        return series
+                collected.setdefault(article.source, []).append(point)
+        # One bulk load per source sorts once instead of inserting point by point.
+        return {source: SourceTimeSeries(source, points, interner) for source, points in collected.items()}
+
+    @instrument()
+    def build_rollups(
+        self,
+        index: EventArticleIndex,
+        bias: BiasAnalyzer,
+        store: Optional[RollupStore] = None,
+    ) -> RollupStore:
+        """Loads deviation points into a RollupStore for long-range queries."""
+        store = store or RollupStore()
+        for series in self.build_source_series(index, bias).values():
+            store.add_series(series)
+        return store
 
+    @instrument()
     def narrative_drift(self, source_series: SourceTimeSeries) -> List[TimePoint]:
-        points = source_series.sorted_points()
-        if len(points) < 2:
+        if len(source_series) < 2:
             return []
-        drift_points: List[TimePoint] = []
-        for prev, curr in zip(points, points[1:]):
-            drift = abs(curr.value - prev.value)
-            drift_points.append(
-                TimePoint(
-                    timestamp=curr.timestamp,
-                    value=drift,
-                    source=curr.source,
-                    event_id=curr.event_id,
-                    article_id=curr.article_id,
-                )
+        drifts = source_series.rolling().drift().tolist()
+        return [
+            TimePoint(
+                timestamp=curr.timestamp,
+                value=drift,
+                source=curr.source,
+                event_id=curr.event_id,
+                article_id=curr.article_id,
             )
-        return drift_points
+            for curr, drift in zip(source_series.points[1:], drifts)
+        ]
 
+    @instrument()
+    def rolling_stats(self, points: Iterable[TimePoint]) -> RollingStats:
+        """Array-backed rolling mean / std / min / max / EWMA over count or time windows."""
+        return RollingStats.from_points(points)
+
+    @instrument()
     def rolling_average(
         self,
         points: Iterable[TimePoint],
         window_size: int,
     ) -> List[TimePoint]:
-        points_list = sorted(points, key=lambda p: p.timestamp)
-        if window_size <= 0:
+        points_list = list(points)
+        if window_size <= 0 or not points_list:
             return []
-        result: List[TimePoint] = []
-        for i in range(len(points_list)):
-            start = max(0, i - window_size + 1)
-            window = points_list[start : i + 1]
-            avg = sum(p.value for p in window) / len(window)
-            p = points_list[i]
-            result.append(
-                TimePoint(
-                    timestamp=p.timestamp,
-                    value=avg,
-                    source=p.source,
-                    event_id=p.event_id,
-                    article_id=p.article_id,
-                )
+        stats = RollingStats.from_points(points_list)
+        if stats.order is not None:
+            points_list = [points_list[i] for i in stats.order.tolist()]
+        return [
+            TimePoint(
+                timestamp=p.timestamp,
+                value=avg,
+                source=p.source,
+                event_id=p.event_id,
+                article_id=p.article_id,
             )
-        return result
+            for p, avg in zip(points_list, stats.mean(window=window_size).tolist())
+        ]
 
+    @instrument()
     def detect_bursts(
         self,
         points: Iterable[TimePoint],
@@ -110,32 +291,29 @@ class TemporalAnalyzer:
     ) -> List[TimePoint]:
         return [p for p in points if p.value > threshold]
 
+    @instrument()
     def repetitive_burst_windows(
         self,
         points: Iterable[TimePoint],
         threshold: float,
         window: Union[timedelta, int, float],
         min_bursts: int = 2,
+        merge: bool = False,
     ) -> List[List[TimePoint]]:
         """
         Detects windows with repeated high-deviation bursts.
-        window can be timedelta or seconds.
+        window can be timedelta or seconds. merge=True joins overlapping
+        windows into maximal ones; see BurstWindowDetector for streaming input.
         """
-        points_list = sorted(points, key=lambda p: p.timestamp)
-        if isinstance(window, (int, float)):
-            window = timedelta(seconds=float(window))
-        bursts = [p for p in points_list if p.value > threshold]
-        windows: List[List[TimePoint]] = []
-        for i, start in enumerate(bursts):
-            current: List[TimePoint] = [start]
-            for candidate in bursts[i + 1 :]:
-                if candidate.timestamp - start.timestamp <= window:
-                    current.append(candidate)
-                else:
-                    break
-            if len(current) >= min_bursts:
-                windows.append(current)
-        return windows
+        points_list = list(points)
+        stats = RollingStats.from_points(points_list)
+        if stats.order is not None:
+            points_list = [points_list[i] for i in stats.order.tolist()]
+        bursts, starts, ends = burst_window_bounds(
+            stats.timestamps, stats.values, threshold, window, min_bursts, merge
+        )
+        burst_points = [points_list[i] for i in bursts.tolist()]
+        return [burst_points[s:e] for s, e in zip(starts.tolist(), ends.tolist())]
 
 
 def _coerce_datetime(value: Optional[Union[str, datetime]]) -> Optional[datetime]:
@@ -1,3 +1,25 @@
-from .TemporalAnalyzer import TemporalAnalyzer, TimePoint, SourceTimeSeries
+# Submodules are imported on first use; see packageUtils.LazyPackage.
+from typing import TYPE_CHECKING
 
-__all__ = ["TemporalAnalyzer", "TimePoint", "SourceTimeSeries"]
+from packageUtils.LazyPackage import lazy_package
+
+if TYPE_CHECKING:
+    from .TemporalAnalyzer import TemporalAnalyzer, TimePoint, SourceTimeSeries, Interner
+    from .RollingStats import RollingStats
+    from .BurstWindows import BurstWindowDetector
+    from .RollupStore import RollupStore, RollupSeries
+
+_LAZY = {
+    "TemporalAnalyzer": "TemporalAnalyzer",
+    "TimePoint": "TemporalAnalyzer",
+    "SourceTimeSeries": "TemporalAnalyzer",
+    "Interner": "TemporalAnalyzer",
+    "RollingStats": "RollingStats",
+    "BurstWindowDetector": "BurstWindows",
+    "RollupStore": "RollupStore",
+    "RollupSeries": "RollupStore",
+}
+
+__all__ = ["TemporalAnalyzer", "TimePoint", "SourceTimeSeries", "Interner", "RollingStats", "BurstWindowDetector", "RollupStore", "RollupSeries"]
+
+lazy_package(__name__, _LAZY)
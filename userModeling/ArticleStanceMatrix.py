@@ -0,0 +1,180 @@
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+import numpy as np
+
+Stances = Dict[str, float]
+
+
+class ArticleStanceMatrix:
+    """
+    Article stance dicts packed once for ranking many candidates per user.
+    Entity names map to column indexes; stances are stored either as CSR
+    (indptr / indices / data, the default) or as a dense matrix plus a boolean
+    mask of which entities each article has a stance on.
+    """
+
+    def __init__(
+        self,
+        article_ids: List[Hashable],
+        entities: List[str],
+        indptr: Optional[np.ndarray] = None,
+        indices: Optional[np.ndarray] = None,
+        data: Optional[np.ndarray] = None,
+        dense: Optional[np.ndarray] = None,
+        mask: Optional[np.ndarray] = None,
+    ) -> None:
+        self.article_ids = article_ids
+        self.entities = entities
+        self.columns: Dict[str, int] = {e: i for i, e in enumerate(entities)}
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.dense = dense
+        self.mask = mask
+        self._rows: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_articles(
+        cls,
+        articles: Union[Dict[Hashable, Stances], List[Stances]],
+        dense: bool = False,
+    ) -> "ArticleStanceMatrix":
+        """
+        Args:
+            articles: Same input as UserVector.top_k, a dict mapping
+                      article_id -> stance_dict or a list (article_id = index).
+            dense: Store a dense matrix + mask instead of CSR.
+        """
+        items = list(articles.items()) if isinstance(articles, dict) else list(enumerate(articles))
+        columns: Dict[str, int] = {}
+        indptr = np.zeros(len(items) + 1, dtype=np.int64)
+        indices: List[int] = []
+        data: List[float] = []
+        for row, (_, stances) in enumerate(items):
+            for entity, value in stances.items():
+                indices.append(columns.setdefault(entity, len(columns)))
+                data.append(value)
+            indptr[row + 1] = len(indices)
+        matrix = cls(
+            [aid for aid, _ in items],
+            list(columns),
+            indptr=indptr,
+            indices=np.asarray(indices, dtype=np.int64),
+            data=np.asarray(data, dtype=np.float64),
+        )
+        return matrix.to_dense() if dense else matrix
+
+    def __len__(self) -> int:
+        return len(self.article_ids)
+
+    @property
+    def is_sparse(self) -> bool:
+        return self.dense is None
+
+    def to_dense(self) -> "ArticleStanceMatrix":
+        if not self.is_sparse:
+            return self
+        values = np.zeros((len(self), len(self.entities)))
+        mask = np.zeros(values.shape, dtype=bool)
+        rows = self._row_ids()
+        values[rows, self.indices] = self.data
+        mask[rows, self.indices] = True
+        return ArticleStanceMatrix(self.article_ids, self.entities, dense=values, mask=mask)
+
+    def align(self, user) -> Tuple[np.ndarray, np.ndarray]:
+        """User stances (UserVector or dict) as (values, has_stance) over the columns."""
+        stances = _stance_values(user)
+        values = np.zeros(len(self.entities))
+        has = np.zeros(len(self.entities), dtype=bool)
+        for entity, value in stances.items():
+            col = self.columns.get(entity)
+            if col is not None:
+                values[col] = value
+                has[col] = True
+        return values, has
+
+    def distances(self, user) -> np.ndarray:
+        """
+        UserVector.distance_to for every article at once: Euclidean distance
+        over the entities both sides have a stance on, inf where none overlap.
+        """
+        values, has = self.align(user)
+        if self.is_sparse:
+            shared = has[self.indices]
+            diff = values[self.indices] - self.data
+            rows = self._row_ids()
+            squared = np.bincount(rows, weights=np.where(shared, diff * diff, 0.0), minlength=len(self))
+            overlap = np.bincount(rows, weights=shared, minlength=len(self)) > 0
+        else:
+            cols = np.flatnonzero(has)
+            shared = self.mask[:, cols]
+            diff = self.dense[:, cols] - values[cols]
+            squared = np.where(shared, diff * diff, 0.0).sum(axis=1)
+            overlap = shared.any(axis=1)
+        return np.where(overlap, np.sqrt(squared), np.inf)
+
+    def top_k(
+        self,
+        user,
+        k: int,
+        *,
+        closest: bool = True,
+        farthest: bool = True,
+    ) -> Dict[str, List[tuple]]:
+        """
+        Same result as UserVector.top_k, including tie order, but selects with
+        np.partition in O(n) instead of sorting every candidate.
+        """
+        return rank_top_k(self.article_ids, self.distances(user), k, closest=closest, farthest=farthest)
+
+    def _row_ids(self) -> np.ndarray:
+        if self._rows is None:
+            self._rows = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+        return self._rows
+
+
+def rank_top_k(
+    article_ids: List[Hashable],
+    distances: np.ndarray,
+    k: int,
+    *,
+    closest: bool = True,
+    farthest: bool = True,
+) -> Dict[str, List[tuple]]:
+    """Closest / farthest k of finite distances; ties keep input order as a stable sort would."""
+    finite = np.flatnonzero(np.isfinite(distances))
+    d = distances[finite]
+    result = {}
+    if closest:
+        picked = _select(d, k, largest=False)
+        result["closest"] = [(article_ids[i], float(d[j])) for i, j in zip(finite[picked].tolist(), picked.tolist())]
+    if farthest:
+        picked = _select(d, k, largest=True)
+        result["farthest"] = [(article_ids[i], float(d[j])) for i, j in zip(finite[picked].tolist(), picked.tolist())]
+    return result
+
+
+def _select(d: np.ndarray, k: int, largest: bool) -> np.ndarray:
+    n = d.size
+    k = min(max(k, 0), n)
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        # Keep everything tied with the k-th value so the tie-break below is exact.
+        if largest:
+            candidates = np.flatnonzero(d >= np.partition(d, n - k)[n - k])
+        else:
+            candidates = np.flatnonzero(d <= np.partition(d, k - 1)[k - 1])
+    else:
+        candidates = np.arange(n)
+    if largest:
+        # The old path reversed the tail of a stable ascending sort.
+        order = np.lexsort((-candidates, -d[candidates]))
+    else:
+        order = np.lexsort((candidates, d[candidates]))
+    return candidates[order[:k]]
+
+
+def _stance_values(user) -> Stances:
+    stances = getattr(user, "stances", user)
+    return {e: getattr(s, "value", s) for e, s in stances.items()}
@@ -0,0 +1,298 @@
+import math
+import os
+import struct
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .UserVector import _DECAY_CONSTANT, _DISLIKE_STRENGTH_FACTOR, StanceEntry, UserVector
+
+LIKE = 1
+DISLIKE = 0
+
+_LENGTH = struct.Struct("<I")
+# timestamp, action, strength (NaN = derive from stances), user_id bytes, stance count
+_EVENT = struct.Struct("<dBdHH")
+_STANCE = struct.Struct("<dH")
+
+
+@dataclass
+class FeedbackEvent:
+    user_id: str
+    article_stances: Dict[str, float]
+    action: int  # LIKE or DISLIKE
+    strength: Optional[float] = None
+    timestamp: float = 0.0
+
+
+def encode_event(event: FeedbackEvent) -> bytes:
+    user = event.user_id.encode("utf-8")
+    strength = math.nan if event.strength is None else event.strength
+    parts = [_EVENT.pack(event.timestamp, event.action, strength, len(user), len(event.article_stances)), user]
+    for entity, value in event.article_stances.items():
+        name = entity.encode("utf-8")
+        parts.append(_STANCE.pack(value, len(name)))
+        parts.append(name)
+    payload = b"".join(parts)
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def decode_event(payload: bytes) -> FeedbackEvent:
+    timestamp, action, strength, user_len, n = _EVENT.unpack_from(payload)
+    offset = _EVENT.size
+    user_id = payload[offset : offset + user_len].decode("utf-8")
+    offset += user_len
+    stances: Dict[str, float] = {}
+    for _ in range(n):
+        value, name_len = _STANCE.unpack_from(payload, offset)
+        offset += _STANCE.size
+        stances[payload[offset : offset + name_len].decode("utf-8")] = value
+        offset += name_len
+    return FeedbackEvent(user_id, stances, action, None if math.isnan(strength) else strength, timestamp)
+
+
+class FeedbackLog:
+    """
+    Append-only binary log of like / dislike feedback. Each record is a
+    length-prefixed (timestamp, action, strength, user_id, stances) tuple;
+    a torn record at the tail is dropped when the log is opened.
+
+    apply_pending() folds events logged since the last call into user vectors
+    (tracked by a sidecar offset file); rebuild() re-derives every vector
+    from the whole log, e.g. after tuning the decay or dislike constants.
+    """
+
+    def __init__(self, path: str, sync: bool = False) -> None:
+        self.path = path
+        self.sync = sync
+        self._offset_path = path + ".applied"
+        self._truncate_torn_tail()
+        self._log = open(path, "ab")
+
+    def append(
+        self,
+        user_id: str,
+        article_stances: Dict[str, float],
+        action: int,
+        strength: Optional[float] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        event = FeedbackEvent(user_id, dict(article_stances), action, strength, time.time() if timestamp is None else timestamp)
+        self._log.write(encode_event(event))
+        self._log.flush()
+        if self.sync:
+            os.fsync(self._log.fileno())
+
+    def like(self, user_id: str, article_stances: Dict[str, float], strength: Optional[float] = None) -> None:
+        self.append(user_id, article_stances, LIKE, strength)
+
+    def dislike(self, user_id: str, article_stances: Dict[str, float], strength: Optional[float] = None) -> None:
+        self.append(user_id, article_stances, DISLIKE, strength)
+
+    def events(self, start: int = 0) -> Iterator[Tuple[int, FeedbackEvent]]:
+        """Yields (end offset, event) for every complete record from start."""
+        self._log.flush()
+        return _read_events(self.path, start)
+
+    @property
+    def applied_offset(self) -> int:
+        try:
+            with open(self._offset_path, "r") as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _set_applied_offset(self, offset: int) -> None:
+        tmp = self._offset_path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(str(offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._offset_path)
+
+    def apply_pending(self, users, **constants) -> int:
+        """
+        Applies events logged since the last call to users, either a dict of
+        user_id -> UserVector (missing users are created) or a UserVectorStore.
+        Returns the number of events applied. A store is flushed before the
+        applied offset moves, so a crash can at worst re-apply the last batch,
+        never lose it; a dict is only in memory and is the caller's to persist.
+        """
+        start = self.applied_offset
+        end = start
+        pending: List[FeedbackEvent] = []
+        for end, event in self.events(start):
+            pending.append(event)
+        if not pending:
+            return 0
+        by_user: Dict[str, List[FeedbackEvent]] = {}
+        for event in pending:
+            by_user.setdefault(event.user_id, []).append(event)
+        if isinstance(users, dict):
+            targets = [users.setdefault(uid, UserVector(uid)) for uid in by_user]
+            apply_feedback(targets, pending, **constants)
+        else:
+            for user_id, events in by_user.items():
+                users.update(user_id, lambda u, ev=events: apply_feedback([u], ev, **constants))
+            users.flush()
+        self._set_applied_offset(end)
+        return len(pending)
+
+    def rebuild(self, **constants) -> Dict[str, UserVector]:
+        """Every user's vector derived from scratch by replaying the whole log."""
+        events = [event for _, event in self.events()]
+        users = {uid: UserVector(uid) for uid in dict.fromkeys(e.user_id for e in events)}
+        apply_feedback(list(users.values()), events, **constants)
+        return users
+
+    def close(self) -> None:
+        self._log.close()
+
+    def _truncate_torn_tail(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        good = 0
+        for good, _ in _read_events(self.path, 0):
+            pass
+        if good < os.path.getsize(self.path):
+            with open(self.path, "r+b") as log:
+                log.truncate(good)
+
+    def __enter__(self) -> "FeedbackLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _read_events(path: str, start: int) -> Iterator[Tuple[int, FeedbackEvent]]:
+    with open(path, "rb") as log:
+        log.seek(start)
+        while True:
+            header = log.read(_LENGTH.size)
+            if len(header) < _LENGTH.size:
+                return
+            size = _LENGTH.unpack(header)[0]
+            payload = log.read(size)
+            if len(payload) < size:
+                return
+            yield log.tell(), decode_event(payload)
+
+def apply_feedback(
+    users: List[UserVector],
+    events: Iterable[FeedbackEvent],
+    decay_constant: float = _DECAY_CONSTANT,
+    dislike_factor: float = _DISLIKE_STRENGTH_FACTOR,
+) -> None:
+    """
+    Applies events (in order) to users in one vectorized sweep, with the
+    same result as calling UserVector.like / dislike one event at a time.
+
+    Every touch of an entity is u <- (1 - w) u + w t with w = alpha * strength
+    in [0, 1], so a run of touches collapses to
+        u_m = u_0 * prod(1 - w_j) + sum_j w_j t_j * prod_{l > j}(1 - w_l),
+    evaluated with segmented suffix products over all (user, entity) pairs.
+    The clamp to [-1, 1] is a no-op while |t| <= 1; pairs with a larger
+    target fall back to the sequential loop.
+    """
+    by_id = {u.user_id: u for u in users}
+    user_codes: Dict[str, int] = {uid: i for i, uid in enumerate(by_id)}
+    entity_codes: Dict[str, int] = {}
+    entities: List[str] = []
+
+    ev_user: List[int] = []
+    ev_weight_scale: List[float] = []
+    row_event: List[int] = []
+    row_entity: List[int] = []
+    row_target: List[float] = []
+    for event in events:
+        stances = event.article_stances
+        if not stances or event.user_id not in user_codes:
+            continue
+        strength = event.strength
+        if strength is None:
+            strength = sum(abs(v) for v in stances.values()) / len(stances)
+        strength = max(0.0, min(1.0, strength))
+        sign = 1.0
+        if event.action == DISLIKE:
+            strength *= dislike_factor
+            sign = -1.0
+        e = len(ev_user)
+        ev_user.append(user_codes[event.user_id])
+        ev_weight_scale.append(strength)
+        for entity, value in stances.items():
+            code = entity_codes.get(entity)
+            if code is None:
+                code = entity_codes[entity] = len(entities)
+                entities.append(entity)
+            row_event.append(e)
+            row_entity.append(code)
+            row_target.append(sign * value)
+    if not ev_user:
+        return
+
+    # Learning rate of each event: decay / (decay + engagements before it).
+    ev_user_arr = np.asarray(ev_user, dtype=np.int64)
+    n_users = len(user_codes)
+    order = np.argsort(ev_user_arr, kind="stable")
+    counts = np.bincount(ev_user_arr, minlength=n_users)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.empty(ev_user_arr.size, dtype=np.int64)
+    rank[order] = np.arange(ev_user_arr.size) - starts[ev_user_arr[order]]
+    engaged = np.array([u.n_articles_engaged for u in by_id.values()], dtype=np.float64)
+    alpha = decay_constant / (decay_constant + engaged[ev_user_arr] + rank)
+    weight_per_event = alpha * np.asarray(ev_weight_scale)
+
+    row_event_arr = np.asarray(row_event, dtype=np.int64)
+    row_user = ev_user_arr[row_event_arr]
+    row_entity_arr = np.asarray(row_entity, dtype=np.int64)
+    weights = weight_per_event[row_event_arr]
+    targets = np.asarray(row_target)
+
+    # Group rows by (user, entity), keeping event order inside each group.
+    group_key = row_user * len(entities) + row_entity_arr
+    rows = np.lexsort((row_event_arr, group_key))
+    keys = group_key[rows]
+    w, t = weights[rows], targets[rows]
+    first = np.concatenate(([True], keys[1:] != keys[:-1]))
+    group = np.cumsum(first) - 1
+    group_start = np.flatnonzero(first)
+    n_groups = group_start.size
+    touches = np.bincount(group, minlength=n_groups)
+
+    # Suffix products of (1 - w) within each group, in log space; w == 1 zeroes them.
+    keep = 1.0 - w
+    zero = keep <= 0.0
+    logs = np.where(zero, 0.0, np.log(np.where(zero, 1.0, keep)))
+    log_total = np.bincount(group, weights=logs, minlength=n_groups)
+    zero_total = np.bincount(group, weights=zero, minlength=n_groups)
+    log_incl = np.cumsum(logs) - np.concatenate(([0.0], np.cumsum(logs)))[group_start][group]
+    zero_incl = np.cumsum(zero) - np.concatenate(([0], np.cumsum(zero)))[group_start][group]
+    log_after = log_total[group] - log_incl
+    zero_after = zero_total[group] - zero_incl
+    after = np.where(zero_after > 0, 0.0, np.exp(log_after))
+    carried = np.bincount(group, weights=w * t * after, minlength=n_groups)
+    all_keep = np.where(zero_total > 0, 0.0, np.exp(log_total))
+    needs_loop = np.bincount(group, weights=np.abs(t) > 1.0, minlength=n_groups) > 0
+
+    user_list = list(by_id.values())
+    group_users = keys[group_start] // len(entities)
+    group_entities = keys[group_start] % len(entities)
+    for g, (uc, ec) in enumerate(zip(group_users.tolist(), group_entities.tolist())):
+        user = user_list[uc]
+        entity = entities[ec]
+        entry = user.stances.get(entity)
+        u0 = entry.value if entry else 0.0
+        conf = entry.confidence if entry else 0.5
+        if needs_loop[g]:
+            value = u0
+            lo = group_start[g]
+            for wj, tj in zip(w[lo : lo + touches[g]].tolist(), t[lo : lo + touches[g]].tolist()):
+                value = max(-1.0, min(1.0, value + wj * (tj - value)))
+        else:
+            value = max(-1.0, min(1.0, u0 * all_keep[g] + carried[g]))
+        user.stances[entity] = StanceEntry(value=value, confidence=min(1.0, conf + 0.05 * touches[g]))
+    for user, extra in zip(user_list, counts.tolist()):
+        user.n_articles_engaged += extra
@@ -73,8 +73,9 @@ class UserVector:
         Find the top k closest and/or farthest articles to this user's vector.
 
         Args:
-            articles: Either a dict mapping article_id -> stance_dict, or a list
-                      of stance dicts (article_id = index).
+            articles: Either a dict mapping article_id -> stance_dict, a list
+                      of stance dicts (article_id = index), or an
+                      ArticleStanceMatrix (vectorized; build it once and reuse).
             k: Number of articles to return for each side.
             closest: If True, include top k closest (most agreeable).
             farthest: If True, include top k farthest (most disagreeable).
@@ -82,6 +83,10 @@ class UserVector:
         Returns:
             Dict with "closest" and/or "farthest", each a list of (article_id, distance).
         """
+        # ArticleStanceMatrix: one vectorized pass plus partial selection
+        if hasattr(articles, "distances"):
+            return articles.top_k(self, k, closest=closest, farthest=farthest)
+
         # Normalize to list of (id, stance_dict)
         if isinstance(articles, dict):
             items = list(articles.items())
@@ -0,0 +1,251 @@
+import json
+import os
+import sqlite3
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+import numpy as np
+
+from .UserVector import StanceEntry, UserVector
+
+# Record layout: n_articles_engaged, n_stances, then entity ids (uint32),
+# values (float64) and confidences (float64) as little-endian arrays.
+_HEADER = struct.Struct("<II")
+
+
+class _Shard:
+    """One SQLite file plus the LRU of users that hash to it."""
+
+    def __init__(self, path: str, capacity: int) -> None:
+        self.capacity = capacity
+        self.lock = threading.RLock()
+        self.cache: "OrderedDict[str, UserVector]" = OrderedDict()
+        self.dirty: Set[str] = set()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS users (user_id TEXT PRIMARY KEY, record BLOB NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS entities (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL)")
+        self.conn.commit()
+        self.entity_ids: Dict[str, int] = {}
+        self.entity_names: Dict[int, str] = {}
+        for eid, name in self.conn.execute("SELECT id, name FROM entities"):
+            self.entity_ids[name] = eid
+            self.entity_names[eid] = name
+
+    def encode(self, user: UserVector) -> bytes:
+        ids = np.empty(len(user.stances), dtype="<u4")
+        values = np.empty(len(user.stances), dtype="<f8")
+        confidences = np.empty(len(user.stances), dtype="<f8")
+        for i, (entity, entry) in enumerate(user.stances.items()):
+            ids[i] = self._entity_id(entity)
+            values[i] = entry.value
+            confidences[i] = entry.confidence
+        header = _HEADER.pack(user.n_articles_engaged, ids.size)
+        return zlib.compress(header + ids.tobytes() + values.tobytes() + confidences.tobytes(), 1)
+
+    def decode(self, user_id: str, record: bytes) -> UserVector:
+        raw = zlib.decompress(record)
+        engaged, n = _HEADER.unpack_from(raw)
+        offset = _HEADER.size
+        ids = np.frombuffer(raw, dtype="<u4", count=n, offset=offset)
+        values = np.frombuffer(raw, dtype="<f8", count=n, offset=offset + 4 * n)
+        confidences = np.frombuffer(raw, dtype="<f8", count=n, offset=offset + 12 * n)
+        user = UserVector(user_id)
+        user.n_articles_engaged = engaged
+        names = self.entity_names
+        user.stances = {
+            names[e]: StanceEntry(value=v, confidence=c)
+            for e, v, c in zip(ids.tolist(), values.tolist(), confidences.tolist())
+        }
+        return user
+
+    def _entity_id(self, name: str) -> int:
+        eid = self.entity_ids.get(name)
+        if eid is None:
+            eid = self.conn.execute("INSERT INTO entities (name) VALUES (?)", (name,)).lastrowid
+            self.entity_ids[name] = eid
+            self.entity_names[eid] = name
+        return eid
+
+    def write(self, users: Iterable[UserVector]) -> None:
+        rows = [(u.user_id, self.encode(u)) for u in users]
+        self.conn.executemany("INSERT OR REPLACE INTO users (user_id, record) VALUES (?, ?)", rows)
+        self.conn.commit()
+
+    def read(self, user_id: str) -> Optional[UserVector]:
+        row = self.conn.execute("SELECT record FROM users WHERE user_id = ?", (user_id,)).fetchone()
+        return None if row is None else self.decode(user_id, row[0])
+
+    def remember(self, user: UserVector) -> None:
+        self.cache[user.user_id] = user
+        self.cache.move_to_end(user.user_id)
+        if len(self.cache) <= self.capacity:
+            return
+        # Evict a slice at a time so dirty write-backs share one commit.
+        target = self.capacity - self.capacity // 16
+        evicted = []
+        while len(self.cache) > target:
+            user_id, old = self.cache.popitem(last=False)
+            if user_id in self.dirty:
+                self.dirty.discard(user_id)
+                evicted.append(old)
+        if evicted:
+            self.write(evicted)
+
+    def flush(self) -> None:
+        if self.dirty:
+            self.write([self.cache[u] for u in self.dirty])
+            self.dirty.clear()
+
+
+class UserVectorStore:
+    """
+    UserVectors kept in hash-sharded SQLite files under one directory instead
+    of one JSON file per user. Users load lazily on first access and stay in a
+    bounded per-shard LRU; changes made through like / dislike / update / put
+    are written back when the entry is evicted or on flush(). Each shard has
+    its own lock, so concurrent requests for different shards do not contend.
+    """
+
+    def __init__(self, directory: str, shards: int = 16, capacity: int = 100_000) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        per_shard = max(1, capacity // shards)
+        self._shards = [
+            _Shard(os.path.join(directory, f"users-{i:03d}.sqlite"), per_shard) for i in range(shards)
+        ]
+
+    def _shard(self, user_id: str) -> _Shard:
+        return self._shards[zlib.crc32(user_id.encode("utf-8")) % len(self._shards)]
+
+    def get(self, user_id: str, create: bool = True) -> Optional[UserVector]:
+        """
+        Cached vector for user_id, loading it on a miss. Treat the result as
+        read-only; mutate through update() so the change is written back.
+        """
+        shard = self._shard(user_id)
+        with shard.lock:
+            user = shard.cache.get(user_id)
+            if user is not None:
+                shard.cache.move_to_end(user_id)
+                return user
+            user = shard.read(user_id)
+            if user is None:
+                if not create:
+                    return None
+                user = UserVector(user_id)
+            shard.remember(user)
+            return user
+
+    def update(self, user_id: str, fn: Callable[[UserVector], None]) -> UserVector:
+        """Applies fn to the user under its shard lock and marks it dirty."""
+        shard = self._shard(user_id)
+        with shard.lock:
+            user = self.get(user_id)
+            fn(user)
+            shard.dirty.add(user_id)
+            return user
+
+    def like(self, user_id: str, article_stances: Dict[str, float], strength: Optional[float] = None) -> UserVector:
+        return self.update(user_id, lambda u: u.like(article_stances, strength))
+
+    def dislike(self, user_id: str, article_stances: Dict[str, float], strength: Optional[float] = None) -> UserVector:
+        return self.update(user_id, lambda u: u.dislike(article_stances, strength))
+
+    def put(self, user: UserVector) -> None:
+        shard = self._shard(user.user_id)
+        with shard.lock:
+            shard.remember(user)
+            shard.dirty.add(user.user_id)
+
+    def __contains__(self, user_id: str) -> bool:
+        shard = self._shard(user_id)
+        with shard.lock:
+            if user_id in shard.cache:
+                return True
+            return shard.conn.execute("SELECT 1 FROM users WHERE user_id = ?", (user_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        self.flush()
+        total = 0
+        for shard in self._shards:
+            with shard.lock:
+                total += shard.conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+        return total
+
+    def user_ids(self) -> Iterator[str]:
+        self.flush()
+        for shard in self._shards:
+            with shard.lock:
+                ids = [row[0] for row in shard.conn.execute("SELECT user_id FROM users")]
+            yield from ids
+
+    def flush(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.flush()
+
+    def close(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.flush()
+                shard.conn.close()
+
+    def __enter__(self) -> "UserVectorStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def import_users(self, users: Iterable[UserVector], batch_size: int = 10_000) -> int:
+        """Bulk write, bypassing the LRU; cached copies of these users are replaced."""
+        pending: Dict[int, List[UserVector]] = {}
+        count = 0
+        for user in users:
+            index = zlib.crc32(user.user_id.encode("utf-8")) % len(self._shards)
+            batch = pending.setdefault(index, [])
+            batch.append(user)
+            count += 1
+            if len(batch) >= batch_size:
+                self._import_batch(index, pending.pop(index))
+        for index, batch in pending.items():
+            self._import_batch(index, batch)
+        return count
+
+    def _import_batch(self, index: int, users: List[UserVector]) -> None:
+        shard = self._shards[index]
+        with shard.lock:
+            for user in users:
+                shard.cache.pop(user.user_id, None)
+                shard.dirty.discard(user.user_id)
+            shard.write(users)
+
+    def export_users(self) -> Iterator[UserVector]:
+        """Every stored user, shard by shard, decoded without touching the LRU."""
+        self.flush()
+        for shard in self._shards:
+            with shard.lock:
+                rows = shard.conn.execute("SELECT user_id, record FROM users").fetchall()
+                users = [shard.decode(user_id, record) for user_id, record in rows]
+            yield from users
+
+    def export_jsonl(self, path: str) -> int:
+        count = 0
+        with open(path, "w") as f:
+            for user in self.export_users():
+                f.write(json.dumps(user.to_dict()) + "\n")
+                count += 1
+        return count
+
+    def import_jsonl(self, path: str) -> int:
+        """Loads UserVector.to_dict() lines, e.g. migrated from per-user JSON files."""
+        with open(path, "r") as f:
+            return self.import_users(UserVector.from_dict(json.loads(line)) for line in f if line.strip())
+
+    def import_json_files(self, paths: Iterable[str]) -> int:
+        """Migrates files written by UserVector.save."""
+        return self.import_users(UserVector.load(p) for p in paths)
@@ -1,3 +1,25 @@
-from .UserVector import UserVector, StanceEntry
+# Submodules are imported on first use; see packageUtils.LazyPackage.
+from typing import TYPE_CHECKING
 
-__all__ = ["UserVector", "StanceEntry"]
+from packageUtils.LazyPackage import lazy_package
+
+if TYPE_CHECKING:
+    from .UserVector import UserVector, StanceEntry
+    from .ArticleStanceMatrix import ArticleStanceMatrix
+    from .FeedScorer import FeedScorer
+    from .UserVectorStore import UserVectorStore
+    from .FeedbackLog import FeedbackLog, FeedbackEvent
+
+_LAZY = {
+    "UserVector": "UserVector",
+    "StanceEntry": "UserVector",
+    "ArticleStanceMatrix": "ArticleStanceMatrix",
+    "FeedScorer": "FeedScorer",
+    "UserVectorStore": "UserVectorStore",
+    "FeedbackLog": "FeedbackLog",
+    "FeedbackEvent": "FeedbackLog",
+}
+
+__all__ = ["UserVector", "StanceEntry", "ArticleStanceMatrix", "FeedScorer", "UserVectorStore", "FeedbackLog", "FeedbackEvent"]
+
+lazy_package(__name__, _LAZY)